@@ -1,8 +1,14 @@
 import argparse
 import sys
-from typing import Dict
+from typing import Dict, List, Tuple, cast
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
 
 from ..main import run
+from ..WorkflowEngine import WorkflowCache, WorkflowManager
+from ..WorkflowEngine.Controller import OCRController
 
 
 def default_choice_map(default: bool) -> Dict[str, bool]:
@@ -41,6 +47,8 @@ def input_args() -> argparse.Namespace:
     args.verbose = switch_choice(
         "Enable verbose output? (Y/n): ", default_choice_map(True)
     )
+    args.no_cache = False
+    args.cache_dir = WorkflowCache.DEFAULT_DIR
     return args
 
 
@@ -65,14 +73,128 @@ def args_parse() -> argparse.Namespace:
         default=True,
         help="Enable verbose output (default: True)",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=WorkflowCache.DEFAULT_DIR,
+        help=f"Compiled workflow cache directory (default: {WorkflowCache.DEFAULT_DIR})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Always load and validate the workflow from JSON (default: False)",
+    )
 
     args = parser.parse_args(sys.argv[1:])
     return args
 
 
+def cache_args_parse(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="cache", description="Manage the compiled workflow cache"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=WorkflowCache.DEFAULT_DIR,
+        help=f"Compiled workflow cache directory (default: {WorkflowCache.DEFAULT_DIR})",
+    )
+    actions = parser.add_subparsers(dest="action", required=True)
+    prewarm = actions.add_parser(
+        "prewarm", help="Compile workflows and store them in the cache"
+    )
+    prewarm.add_argument("paths", nargs="+", help="Workflow JSON files to compile")
+    actions.add_parser("clean", help="Remove every cached workflow")
+    return parser.parse_args(argv)
+
+
+def cache_cli(argv: List[str]) -> None:
+    args = cache_args_parse(argv)
+    cache = WorkflowCache(args.cache_dir)
+    if args.action == "clean":
+        print(f"Removed {cache.clean()} cached workflow(s) from '{cache.directory}'")
+        return
+
+    for path in args.paths:
+        compiled = WorkflowManager(path).compiled
+        print(f"Cached '{path}' -> '{cache.store(path, compiled)}'")
+
+
+def glyphs_args_parse(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="glyphs",
+        description="Build an OCR glyph set from sample images of known text",
+    )
+    parser.add_argument("output", help="Directory the glyph set is written to")
+    parser.add_argument(
+        "-s",
+        "--sample",
+        nargs=2,
+        action="append",
+        required=True,
+        metavar=("IMAGE", "TEXT"),
+        help="Sample image and the text it shows (whitespace ignored), repeatable",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        nargs=2,
+        default=(12, 16),
+        metavar=("WIDTH", "HEIGHT"),
+        help="Glyph size in pixels (default: 12 16)",
+    )
+    parser.add_argument(
+        "--polarity",
+        choices=["auto", "dark", "light"],
+        default="auto",
+        help="Text polarity of the samples (default: auto)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=int,
+        default=None,
+        help="Binarization threshold (default: Otsu)",
+    )
+    return parser.parse_args(argv)
+
+
+def glyphs_cli(argv: List[str]) -> None:
+    args = glyphs_args_parse(argv)
+    samples: List[Tuple[NDArray[np.uint8], str]] = []
+    for path, text in args.sample:
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            raise FileNotFoundError(f"Cannot read sample image '{path}'")
+        samples.append((cast(NDArray[np.uint8], image), text))
+    glyphs = OCRController.build_glyphs(
+        samples,
+        args.output,
+        size=(args.size[0], args.size[1]),
+        polarity=args.polarity,
+        threshold=args.threshold,
+    )
+    print(
+        f"Built {len(glyphs.chars)} glyph(s) for "
+        f"{len(set(glyphs.chars.values()))} character(s) in '{glyphs.directory}'"
+    )
+
+
 def cli():
+    if len(sys.argv) > 1 and sys.argv[1] == "cache":
+        cache_cli(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "glyphs":
+        glyphs_cli(sys.argv[2:])
+        return
+
     if len(sys.argv) > 1:
         args = args_parse()
     else:
         args = input_args()
-    run(args.path, await_all=args.await_all, verbose=args.verbose)
+    run(
+        args.path,
+        await_all=args.await_all,
+        verbose=args.verbose,
+        cache_dir=None if args.no_cache else args.cache_dir,
+    )
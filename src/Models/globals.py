@@ -1,3 +1,5 @@
+from typing import List, Literal
+
 from pydantic import BaseModel, Field
 
 from .system import LogLevelLiteral as _LogLevelLiteral
@@ -19,17 +21,103 @@ class LogConfig(BaseModel):
     clear: bool = Field(default=False, description="是否清空日志")
 
 
+class TemplateCacheConfig(BaseModel):
+    budget: int = Field(
+        default=64,
+        ge=0,
+        description="模板缓存内存预算(MB), 超出后淘汰最近最少使用的模板",
+    )
+
+
+class CapturePlant(BaseModel):
+    path: str = Field(..., description="绘制到合成画面上的图像路径")
+    x: int = Field(..., description="图像左上角X坐标")
+    y: int = Field(..., description="图像左上角Y坐标")
+
+
+class CaptureConfig(BaseModel):
+    backend: Literal["desktop", "directory", "synthetic", "recorded"] = Field(
+        default="desktop",
+        description=(
+            "截图来源, 可选: desktop(桌面截图), directory(目录中的PNG帧), "
+            "synthetic(合成画面), recorded(回放录制的会话)"
+        ),
+    )
+    path: str = Field(default="", description="directory的帧目录或recorded的会话目录")
+    loop: bool = Field(
+        default=True,
+        description="directory/recorded帧用完后是否从头循环, 否则重复最后一帧",
+    )
+    realtime: bool = Field(
+        default=False, description="recorded是否按录制时间回放, 否则每次截图取下一帧"
+    )
+    width: int = Field(default=1920, gt=0, description="synthetic画面宽度")
+    height: int = Field(default=1080, gt=0, description="synthetic画面高度")
+    seed: int = Field(default=0, description="synthetic画面随机种子")
+    plant: List[CapturePlant] = Field(
+        default_factory=list, description="synthetic画面上绘制的图像列表"
+    )
+    record: str = Field(
+        default="", description="录制目录, 非空时将每次截图保存为可回放的会话"
+    )
+    reuse: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "截图复用时间(ms), 在此时间内的ROI任务共用同一张全屏截图, "
+            "执行Input/System任务后立即失效, 0为不复用"
+        ),
+    )
+
+
+class MatchConfig(BaseModel):
+    workers: int = Field(
+        default=0,
+        ge=0,
+        description="模板匹配线程池大小, 用于多模板并行与分块匹配, 0为CPU核心数",
+    )
+
+
+class InputConfig(BaseModel):
+    backend: Literal["direct", "sendinput", "recording"] = Field(
+        default="direct",
+        description=(
+            "输入方式, 可选: direct(逐个事件调用输入库), "
+            "sendinput(编译为事件数组, 同一时刻的事件一次SendInput发送), "
+            "recording(只记录事件, 用于测试与基准)"
+        ),
+    )
+    move_interval: float = Field(
+        default=10,
+        gt=0,
+        description="带duration的移动/拖拽中相邻两个中间位置的间隔(ms)",
+    )
+
+
 class Globals(BaseModel):
     debug: bool = Field(default=False, description="调试模式, 开启后输出详细日志")
     colorful: bool = Field(default=True, description="彩色日志输出")
     ignore: bool = Field(default=False, description="忽略错误")
     logConfig: LogConfig = Field(default_factory=LogConfig, description="日志配置")
+    templateCache: TemplateCacheConfig = Field(
+        default_factory=TemplateCacheConfig, description="模板图像缓存配置"
+    )
+    capture: CaptureConfig = Field(
+        default_factory=CaptureConfig, description="截图来源配置"
+    )
+    match: MatchConfig = Field(default_factory=MatchConfig, description="模板匹配配置")
+    input: InputConfig = Field(default_factory=InputConfig, description="输入发送配置")
 
     class Config:
         extra = "allow"  # 允许未知字段
 
 
 __all__ = [
+    "CaptureConfig",
+    "CapturePlant",
     "Globals",
+    "InputConfig",
+    "MatchConfig",
     "LogConfig",
+    "TemplateCacheConfig",
 ]
@@ -111,6 +111,13 @@ class Input(BaseModel):
             "如果为True, 则不改变当前焦点窗口"
         ),
     )
+    detach: bool = Field(
+        default=False,
+        description=(
+            "是否在输入线程中发送, 不等待输入完成即结束本任务; "
+            "needs中包含本任务的任务会先等待输入完成"
+        ),
+    )
     title: str = Field(default="", description="窗口标题, 仅在后台操作时有效")
     class_name: str = Field(default="", description="窗口类名, 仅在后台操作时有效")
     process: str = Field(default="", description="进程名称, 仅在后台操作时有效")
@@ -6,6 +6,7 @@ from ..Util.util import to_indent_str
 from .calculate import Calculate
 from .globals import Globals
 from .input import Input
+from .ocr import OCR
 from .roi import ROI
 from .system import System
 
@@ -66,7 +67,10 @@ class Job(BaseModel):
     roi: Optional[ROI] = Field(
         default=None, description="ROI任务定义, 仅在type为ROI时有效, 包含图像和区域信息"
     )
-    # ocr: TODO
+    ocr: Optional[OCR] = Field(
+        default=None,
+        description="OCR任务定义, 仅在type为OCR时有效, 使用本地字形集识别区域内的文字",
+    )
     input: Optional[Input] = Field(
         default=None,
         description="输入操作定义, 仅在type为Input时有效, 包含鼠标/键盘/文本输入",
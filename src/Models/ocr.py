@@ -0,0 +1,92 @@
+from typing import Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from .roi import ROI_Debug, ROI_Region, ROI_Window
+
+OCR_ReturnField = Literal[
+    "text",
+    "number",
+    "confidence",
+    "count",
+    "left",
+    "top",
+    "width",
+    "height",
+    "center_x",
+    "center_y",
+]
+
+
+class OCR_Cache(BaseModel):
+    ttl: int = Field(
+        default=60000,
+        ge=0,
+        description="缓存有效期(毫秒), 区域像素与参数均未变化时直接返回上次结果; 为0时不缓存",
+    )
+    size: int = Field(
+        default=8,
+        ge=0,
+        description="每个任务最多缓存的结果数, 超出时淘汰最久未使用的; 为0时不缓存",
+    )
+
+
+class OCR(BaseModel):
+    glyphs: str = Field(
+        default=...,
+        description="字形集目录, 由 `python main.py glyphs` 从样本图片生成",
+    )
+    region: Optional[ROI_Region] = Field(
+        default=None,
+        description="识别区域定义, 包含x, y, width, height",
+    )
+    window: Optional[ROI_Window] = Field(
+        default=None,
+        description="窗口定义, 设置后region相对窗口左上角",
+    )
+    confidence: float = Field(
+        default=0.8, description="单个字符的最低置信度, 低于该值的字符识别为unknown"
+    )
+    polarity: Literal["auto", "dark", "light"] = Field(
+        default="auto",
+        description="文字极性, 可选: dark(浅色背景上的深色文字), light(深色背景上的浅色文字), auto(像素较少的一侧为文字)",
+    )
+    threshold: Optional[int] = Field(
+        default=None, ge=0, le=255, description="二值化阈值, 为空时自动计算(Otsu)"
+    )
+    whitelist: Optional[str] = Field(
+        default=None, description="仅识别其中的字符, 为空时使用字形集中的全部字符"
+    )
+    space: Optional[float] = Field(
+        default=None,
+        ge=0,
+        description="字符间距超过行高的该倍数时识别为空格, 为空时使用字形集训练得到的值",
+    )
+    unknown: str = Field(default="?", description="无法识别的字符的替代文本")
+    pattern: Optional[str] = Field(
+        default=None,
+        description="识别结果须完整匹配的正则表达式, 不匹配时任务失败; 为空时仅在未识别到文字时失败",
+    )
+    cache: OCR_Cache = Field(
+        default_factory=OCR_Cache,
+        description="识别结果缓存, 以截取区域的像素指纹为键",
+    )
+    debug: ROI_Debug = Field(
+        default_factory=ROI_Debug,
+        description="调试参数",
+    )
+    returns: Dict[str, OCR_ReturnField] = Field(
+        default_factory=dict,
+        description=(
+            "返回值变量字典, 包含['text', 'number', 'confidence', 'count', 'left', 'top', 'width', 'height', 'center_x', 'center_y'], "
+            "以键为变量, 值指定返回参数; number为文字解析出的数值(无法解析时为null), "
+            "confidence为最不确定字符的置信度, count为字符数, 位置参数为文字的屏幕坐标"
+        ),
+    )
+
+
+__all__ = [
+    "OCR",
+    "OCR_Cache",
+    "OCR_ReturnField",
+]
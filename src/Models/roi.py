@@ -1,11 +1,152 @@
-from typing import Dict, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PositiveFloat
+
+ROI_MatchField = Literal[
+    "center_x",
+    "center_y",
+    "confidence",
+    "left",
+    "top",
+    "right",
+    "bottom",
+    "width",
+    "height",
+    "template_height",
+    "template_width",
+    "scale",
+]
+ROI_ReturnField = Literal[
+    ROI_MatchField,
+    "matched",
+    "matched_count",
+    "count",
+    "lefts",
+    "tops",
+    "centers_x",
+    "centers_y",
+    "confidences",
+    "waited",
+]
+ROI_ColorSpace = Literal["gray", "bgr", "hsv", "lab"]
+
+
+class ROI_Pyramid(BaseModel):
+    levels: int = Field(
+        default=2, ge=1, le=5, description="金字塔层数, 每层缩小一半, 可选"
+    )
+    candidates: int = Field(
+        default=3, ge=1, description="粗匹配后在原分辨率下精确匹配的候选数量, 可选"
+    )
 
 
 class ROI_Image(BaseModel):
     path: str = Field(..., description="图像文件路径")
     confidence: float = Field(..., description="图像识别置信度")
+    strategy: Literal["exact", "pyramid"] = Field(
+        default="exact",
+        description=(
+            "匹配策略, 可选: exact(全分辨率穷举匹配), "
+            "pyramid(先在缩小的图像金字塔上粗匹配, 再在原分辨率的小窗口内精确匹配, 未命中时回退到exact)"
+        ),
+    )
+    pyramid: ROI_Pyramid = Field(
+        default_factory=ROI_Pyramid,
+        description="pyramid匹配策略参数",
+    )
+    color: ROI_ColorSpace = Field(
+        default="gray",
+        description=(
+            "匹配色彩空间, gray(灰度), bgr/hsv/lab(在该色彩空间下三通道联合匹配, "
+            "可区分形状相同但颜色不同的图标, 耗时约为灰度的3倍, 不使用pyramid策略)"
+        ),
+    )
+    color_tolerance: Optional[float] = Field(
+        default=None,
+        ge=0,
+        description="命中后校验匹配区域与模板的BGR平均颜色, 任一通道相差超过该值视为未匹配, 为空不校验",
+    )
+    tiles: int = Field(
+        default=1,
+        ge=1,
+        description="将搜索区域按行切分为相互重叠(重叠模板高度)的条带数, 在匹配线程池中并行匹配, 1为不切分; 结果只取决于条带数, 与线程数无关, 与不切分的分数存在FFT舍入误差(约2e-5, 平坦区域可达约1e-2), 并非逐位一致",
+    )
+    alpha: bool = Field(
+        default=False,
+        description="是否使用PNG图像的透明通道作为匹配掩码, 仅不透明度不低于50%的像素参与匹配",
+    )
+    mask: Optional[str] = Field(
+        default=None,
+        description="掩码图像路径, 与模板同尺寸, 仅亮度不低于128的像素参与匹配, 优先于alpha",
+    )
+    scales: List[PositiveFloat] = Field(
+        default_factory=list,
+        description=(
+            "多尺度匹配的缩放比例列表, 如[1.0, 1.25, 1.5], 按顺序尝试, 首个达到置信度的比例即停止; "
+            "上次命中的比例优先尝试, 为空时仅按原尺寸匹配"
+        ),
+    )
+    track: bool = Field(
+        default=False,
+        description="是否跟踪上次命中位置, 开启后先在其附近的小窗口内匹配, 未命中再搜索整个区域",
+    )
+    track_padding: int = Field(
+        default=16, ge=0, description="跟踪窗口相对上次命中位置的外扩像素"
+    )
+    gate: bool = Field(
+        default=False,
+        description="是否在区域画面与上次匹配失败时完全相同时跳过匹配, 直接返回上次的失败结果",
+    )
+
+
+class ROI_Template(ROI_Image):
+    name: str = Field(..., description="模板名称, 用于返回值和变量前缀")
+    returns: Dict[str, Literal[ROI_MatchField, "matched"]] = Field(
+        default_factory=dict,
+        description=(
+            "该模板的返回值变量字典, 以键为变量, 值指定返回参数, "
+            "matched为是否匹配, 未匹配时除confidence外的参数为null"
+        ),
+    )
+
+
+class ROI_FindAll(BaseModel):
+    max_results: int = Field(
+        default=0, ge=0, description="最多返回的匹配数量, 0为不限制, 可选"
+    )
+    overlap: float = Field(
+        default=0.3,
+        ge=0,
+        le=1,
+        description="非极大值抑制的重叠阈值(IoU), 与更优匹配重叠超过该值的结果被丢弃, 可选",
+    )
+
+
+class ROI_Wait(BaseModel):
+    until: Literal["appear", "disappear"] = Field(
+        default="appear",
+        description="等待条件, 可选: appear(等待出现), disappear(等待消失)",
+    )
+    timeout: int = Field(
+        default=10000, ge=0, description="等待超时时间, 单位为毫秒, 超时视为匹配失败"
+    )
+    interval: int = Field(
+        default=20,
+        ge=1,
+        description="最短轮询间隔, 单位为毫秒, 输入操作后或画面变化时使用",
+    )
+    max_interval: int = Field(
+        default=500,
+        ge=1,
+        description="最长轮询间隔, 单位为毫秒, 画面静止时轮询间隔逐步增长到该值",
+    )
+    backoff: float = Field(
+        default=1.5, ge=1, description="画面静止时每次轮询间隔的增长倍数"
+    )
+    gate: bool = Field(
+        default=True,
+        description="是否仅在截图区域发生变化时重新匹配",
+    )
 
 
 class ROI_Region(BaseModel):
@@ -33,13 +174,23 @@ class ROI_Debug(BaseModel):
 
 
 class ROI(BaseModel):
-    type: Literal["MoveMouse", "DetectOnly"] = Field(
+    type: Literal["MoveMouse", "DetectOnly", "DetectAll"] = Field(
         default=...,
-        description="ROI检测后操作类型, 可选: MoveMouse(移动鼠标), DetectOnly(仅检测)",
+        description="ROI检测后操作类型, 可选: MoveMouse(移动鼠标), DetectOnly(仅检测), DetectAll(检测所有匹配位置)",
     )
-    image: ROI_Image = Field(
-        default=...,
-        description="ROI图像定义, 包含路径和置信度",
+    image: Optional[ROI_Image] = Field(
+        default=None,
+        description="ROI图像定义, 包含路径和置信度, 与templates二选一",
+    )
+    templates: List[ROI_Template] = Field(
+        default_factory=list,
+        description=(
+            "多模板定义, 截图一次后逐个匹配所有模板, 与image二选一; "
+            "任一模板匹配即成功, 按定义顺序首个匹配的模板决定鼠标移动位置"
+        ),
+    )
+    parallel: bool = Field(
+        default=False, description="多模板时是否在线程池中并行匹配, 可选"
     )
     window: Optional[ROI_Window] = Field(
         default=None,
@@ -53,30 +204,33 @@ class ROI(BaseModel):
         default=0,
         description="鼠标移动时间, 单位为毫秒",
     )
+    detach: bool = Field(
+        default=False,
+        description=(
+            "MoveMouse是否在输入线程中移动鼠标, 不等待移动完成即结束本任务; "
+            "needs中包含本任务的任务会先等待移动完成"
+        ),
+    )
+    find_all: ROI_FindAll = Field(
+        default_factory=ROI_FindAll,
+        description="DetectAll参数, 包含最大数量和重叠阈值",
+    )
+    wait: Optional[ROI_Wait] = Field(
+        default=None,
+        description="等待模式参数, 设置后在一次任务执行内轮询截图, 直到模板出现或消失, 或超时",
+    )
     debug: ROI_Debug = Field(
         default_factory=ROI_Debug,
         description="调试参数",
     )
-    returns: Dict[
-        str,
-        Literal[
-            "center_x",
-            "center_y",
-            "confidence",
-            "left",
-            "top",
-            "right",
-            "bottom",
-            "width",
-            "height",
-            "template_height",
-            "template_width",
-        ],
-    ] = Field(
+    returns: Dict[str, ROI_ReturnField] = Field(
         default_factory=dict,
         description=(
-            "返回值变量字典, 包含['center_x', 'center_y', 'confidence', 'left', 'top', 'right', 'bottom', 'width', 'height', 'template_height', 'template_width'], "
-            "以键为变量, 值指定返回参数, 可在其他Job中使用use指定该job返回的参数"
+            "返回值变量字典, 包含['center_x', 'center_y', 'confidence', 'left', 'top', 'right', 'bottom', 'width', 'height', 'template_height', 'template_width', 'scale', 'matched', 'matched_count'], "
+            "以键为变量, 值指定返回参数, 可在其他Job中使用use指定该job返回的参数; "
+            "matched(首个匹配的模板名)与matched_count(匹配的模板数)仅在templates模式下可用; "
+            "count, lefts, tops, centers_x, centers_y, confidences(按置信度降序的列表)仅在DetectAll下可用; "
+            "waited(等待的毫秒数)仅在wait模式下可用, 等待消失时仅返回waited"
         ),
     )
 
@@ -84,7 +238,11 @@ class ROI(BaseModel):
 __all__ = [
     "ROI",
     "ROI_Image",
+    "ROI_Pyramid",
     "ROI_Region",
+    "ROI_Template",
     "ROI_Window",
     "ROI_Debug",
+    "ROI_FindAll",
+    "ROI_Wait",
 ]
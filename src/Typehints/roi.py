@@ -1,10 +1,11 @@
 from typing import TypedDict
 
-from PIL.Image import Image as PILImage
+import numpy as np
+from numpy.typing import NDArray
 
 
 ## ROIExecutor Type Hints
 class WindowLocationDict(TypedDict):
     left: int
     top: int
-    mat: PILImage
+    mat: NDArray[np.uint8]  # BGR
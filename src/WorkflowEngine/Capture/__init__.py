@@ -0,0 +1,22 @@
+from .base import CaptureBackend, Frame, Region, crop, to_gray
+from .desktop import DesktopCapture
+from .directory import DirectoryCapture
+from .frame_cache import FrameCache
+from .recorded import RecordedCapture, SessionRecorder
+from .synthetic import SyntheticCapture, synthetic_screen
+
+__all__ = [
+    "CaptureBackend",
+    "Frame",
+    "Region",
+    "crop",
+    "to_gray",
+    # backends
+    "DesktopCapture",
+    "DirectoryCapture",
+    "FrameCache",
+    "RecordedCapture",
+    "SyntheticCapture",
+    "SessionRecorder",
+    "synthetic_screen",
+]
@@ -0,0 +1,151 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple, Type, TypeVar, cast
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from ...Models.globals import CaptureConfig
+
+Frame = NDArray[np.uint8]  # BGR H x W x 3, or H x W when grayscale
+Region = Tuple[int, int, int, int]  # x, y, width, height in screen coordinates
+
+_BACKEND_T = TypeVar("_BACKEND_T", bound=Type["CaptureBackend"])
+
+
+def crop(
+    frame: Frame, region: Optional[Region], origin: Tuple[int, int] = (0, 0)
+) -> Frame:
+    """View of `region` inside `frame` whose top-left is at screen `origin`.
+
+    The region is clipped to the frame, an empty array is returned if they
+    do not intersect.
+    """
+    if region is None:
+        return frame
+    x, y, width, height = region
+    left: int = min(max(x - origin[0], 0), frame.shape[1])
+    top: int = min(max(y - origin[1], 0), frame.shape[0])
+    right: int = min(max(x - origin[0] + width, left), frame.shape[1])
+    bottom: int = min(max(y - origin[1] + height, top), frame.shape[0])
+    return frame[top:bottom, left:right]
+
+
+def to_gray(frame: Frame) -> Frame:
+    return cast(Frame, cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+
+
+class CaptureBackend(ABC):
+    """Source of screen frames used by ROI jobs.
+
+    Backends are registered by name with `CaptureBackend.register` and
+    selected through `globals.capture.backend`.
+    """
+
+    backends: Dict[str, Type["CaptureBackend"]] = {}
+
+    _shared: Optional["CaptureBackend"] = None
+    _shared_key: str = ""
+    _shared_lock: threading.Lock = threading.Lock()
+
+    # perf_counter() of the last job that may have changed the screen
+    changed_at: float = 0.0
+
+    @abstractmethod
+    def __init__(self, config: CaptureConfig) -> None:
+        pass
+
+    @abstractmethod
+    def screen_size(self) -> Tuple[int, int]:
+        """(width, height) of the captured screen."""
+
+    @abstractmethod
+    def grab(self, region: Optional[Region] = None, gray: bool = False) -> Frame:
+        """Capture `region` of the screen, or the whole screen if None.
+
+        Returned frames may be read-only views shared with later captures.
+        """
+
+    def grab_window(
+        self,
+        hWnd: int,
+        region: Region,
+        offset: Tuple[int, int],
+        allow_overlay: bool = True,
+        gray: bool = False,
+    ) -> Frame:
+        """Capture `region` of window `hWnd`, `offset` is the region's origin
+        relative to the window. Backends without window access capture the
+        screen region instead."""
+        return self.grab(region, gray)
+
+    def invalidate(self) -> None:
+        """Forget reused frames, the screen may have changed."""
+
+    def close(self) -> None:
+        pass
+
+    @classmethod
+    def register(cls, name: str) -> Callable[[_BACKEND_T], _BACKEND_T]:
+        def decorator(backend: _BACKEND_T) -> _BACKEND_T:
+            if not issubclass(backend, CaptureBackend):
+                raise TypeError(f"{name} must be a subclass of CaptureBackend")
+
+            cls.backends[name] = backend
+            return backend
+
+        return decorator
+
+    @classmethod
+    def create(cls, config: CaptureConfig) -> "CaptureBackend":
+        if config.backend not in cls.backends:
+            raise ValueError(f"Unknown capture backend: {config.backend}")
+        backend: CaptureBackend = cls.backends[config.backend](config)
+        if config.record:
+            from .recorded import SessionRecorder
+
+            backend = SessionRecorder(backend, config.record)
+        if config.reuse:
+            from .frame_cache import FrameCache
+
+            backend = FrameCache(backend, config.reuse)
+        return backend
+
+    @classmethod
+    def shared(cls, config: CaptureConfig) -> "CaptureBackend":
+        """Process-wide backend for `config`, recreated when it changes."""
+        key: str = config.model_dump_json()
+        with cls._shared_lock:
+            if cls._shared is None or cls._shared_key != key:
+                if cls._shared is not None:
+                    cls._shared.close()
+                CaptureBackend._shared = cls.create(config)
+                CaptureBackend._shared_key = key
+            return cls._shared  # type: ignore[return-value]
+
+    @classmethod
+    def close_shared(cls) -> None:
+        """Close the process-wide backend, `shared` creates a new one."""
+        with cls._shared_lock:
+            shared, CaptureBackend._shared = CaptureBackend._shared, None
+            CaptureBackend._shared_key = ""
+        if shared is not None:
+            shared.close()
+
+    @classmethod
+    def invalidate_shared(cls) -> None:
+        CaptureBackend.changed_at = time.perf_counter()
+        shared: Optional[CaptureBackend] = cls._shared
+        if shared is not None:
+            shared.invalidate()
+
+
+__all__ = [
+    "CaptureBackend",
+    "Frame",
+    "Region",
+    "crop",
+    "to_gray",
+]
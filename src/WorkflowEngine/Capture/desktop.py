@@ -0,0 +1,92 @@
+from typing import Any, Optional, Tuple, cast
+
+import cv2
+import numpy as np
+
+from ...Models.globals import CaptureConfig
+from .base import CaptureBackend, Frame, Region
+
+
+@CaptureBackend.register("desktop")
+class DesktopCapture(CaptureBackend):
+    """Live screen capture through GDI.
+
+    Pixels are copied once from the bitmap into a bytes buffer, viewed as a
+    BGRA array without copying and converted in one step to the requested
+    grayscale or BGR frame. Platform modules are imported on first use so
+    the other backends stay usable where they are not installed.
+    """
+
+    _dpi_aware: bool = False
+
+    def __init__(self, config: CaptureConfig) -> None:
+        self.config: CaptureConfig = config
+
+    def screen_size(self) -> Tuple[int, int]:
+        import pyautogui
+
+        size = pyautogui.size()
+        return int(size.width), int(size.height)
+
+    def grab(self, region: Optional[Region] = None, gray: bool = False) -> Frame:
+        if region is None:
+            region = (0, 0, *self.screen_size())
+        x, y, width, height = region
+        # 窗口句柄为0时从整个屏幕的DC复制
+        return self._blit(0, width, height, (x, y), gray)
+
+    def grab_window(
+        self,
+        hWnd: int,
+        region: Region,
+        offset: Tuple[int, int],
+        allow_overlay: bool = True,
+        gray: bool = False,
+    ) -> Frame:
+        if allow_overlay:
+            return self.grab(region, gray)
+        # 直接从窗口DC复制, 不受其他窗口覆盖影响
+        _, _, width, height = region
+        return self._blit(hWnd, width, height, offset, gray)
+
+    @staticmethod
+    def _blit(
+        hWnd: int, width: int, height: int, source: Tuple[int, int], gray: bool
+    ) -> Frame:
+        import win32con
+        import win32gui
+        import win32ui
+
+        if not DesktopCapture._dpi_aware:
+            import ctypes
+
+            # 与pyautogui一致, 使GDI坐标为物理像素
+            ctypes.windll.user32.SetProcessDPIAware()  # type: ignore[attr-defined]
+            DesktopCapture._dpi_aware = True
+
+        hWndDC = win32gui.GetWindowDC(hWnd)
+        mfcDC = win32ui.CreateDCFromHandle(hWndDC)
+        saveDC = mfcDC.CreateCompatibleDC()
+        saveBitMap: Any = win32ui.CreateBitmap()
+        try:
+            saveBitMap.CreateCompatibleBitmap(mfcDC, width, height)
+            saveDC.SelectObject(saveBitMap)
+            saveDC.BitBlt((0, 0), (width, height), mfcDC, source, win32con.SRCCOPY)
+
+            bmpinfo = saveBitMap.GetInfo()
+            bits = np.frombuffer(saveBitMap.GetBitmapBits(True), dtype=np.uint8)
+            bgrx = bits.reshape(bmpinfo["bmHeight"], bmpinfo["bmWidth"], 4)
+            return cast(
+                Frame,
+                cv2.cvtColor(bgrx, cv2.COLOR_BGRA2GRAY if gray else cv2.COLOR_BGRA2BGR),
+            )
+        finally:
+            win32gui.DeleteObject(saveBitMap.GetHandle())
+            saveDC.DeleteDC()
+            mfcDC.DeleteDC()
+            win32gui.ReleaseDC(hWnd, hWndDC)
+
+
+__all__ = [
+    "DesktopCapture",
+]
@@ -0,0 +1,54 @@
+import glob
+import os
+from typing import List, Optional, Tuple, cast
+
+import cv2
+
+from ...Models.globals import CaptureConfig
+from .base import CaptureBackend, Frame, Region, crop
+
+
+def read_frame(path: str, gray: bool = False) -> Frame:
+    frame = cv2.imread(path, cv2.IMREAD_GRAYSCALE if gray else cv2.IMREAD_COLOR)
+    if frame is None:  # type: ignore[comparison-overlap]
+        raise FileNotFoundError(f"Cannot read frame: {path}")
+    return cast(Frame, frame)
+
+
+@CaptureBackend.register("directory")
+class DirectoryCapture(CaptureBackend):
+    """Full-screen PNG frames from `config.path`, in file name order.
+
+    Every grab consumes the next frame; after the last one the sequence
+    restarts if `config.loop`, otherwise the last frame is repeated.
+    """
+
+    def __init__(self, config: CaptureConfig) -> None:
+        self.config: CaptureConfig = config
+        self.files: List[str] = sorted(glob.glob(os.path.join(config.path, "*.png")))
+        if not self.files:
+            raise FileNotFoundError(f"No PNG frames found in: {config.path}")
+        self.position: int = 0
+        self._size: Optional[Tuple[int, int]] = None
+
+    def screen_size(self) -> Tuple[int, int]:
+        if self._size is None:
+            frame = read_frame(self.files[0])
+            self._size = (frame.shape[1], frame.shape[0])
+        return self._size
+
+    def next_file(self) -> str:
+        if self.position >= len(self.files):
+            self.position = 0 if self.config.loop else len(self.files) - 1
+        path: str = self.files[self.position]
+        self.position += 1
+        return path
+
+    def grab(self, region: Optional[Region] = None, gray: bool = False) -> Frame:
+        return crop(read_frame(self.next_file(), gray), region)
+
+
+__all__ = [
+    "DirectoryCapture",
+    "read_frame",
+]
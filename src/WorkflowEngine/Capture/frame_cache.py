@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Optional, Tuple
+
+from ..Controller.StatsController import StatsManager, global_stats_manager
+from .base import CaptureBackend, Frame, Region, crop, to_gray
+
+
+class FrameCache(CaptureBackend):
+    """Reuses one full-screen capture for `reuse` milliseconds.
+
+    Every screen region requested while the frame is fresh is served as a
+    read-only view of it. Grayscale requests grab a grayscale frame from
+    the backend, or convert the colour frame once if one was grabbed. A
+    colour request that finds only a grayscale frame grabs again (both
+    frames always come from the same grab), and from then on grayscale
+    requests grab in colour too, so jobs mixing both share one frame. The
+    frames are dropped early by `invalidate`, which runs after any job
+    that sends input. Covered-window (GDI) captures are never reused.
+    """
+
+    STATS_PREFIX: str = "capture."
+
+    def __init__(
+        self,
+        backend: CaptureBackend,
+        reuse: int,
+        stats: StatsManager = global_stats_manager,
+    ) -> None:
+        self.backend: CaptureBackend = backend
+        self.reuse: float = reuse / 1000
+        self.frame: Optional[Frame] = None
+        self.gray: Optional[Frame] = None
+        self.stamp: float = 0.0
+        # set once colour is asked for after a grayscale grab
+        self.mixed: bool = False
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: StatsManager = stats
+
+    def screen_size(self) -> Tuple[int, int]:
+        return self.backend.screen_size()
+
+    def grab(self, region: Optional[Region] = None, gray: bool = False) -> Frame:
+        with self._lock:
+            now: float = time.perf_counter()
+            if now - self.stamp > self.reuse:
+                self.frame = self.gray = None
+
+            # 只需灰度图时直接从后端取灰度帧, 不生成彩色中间帧
+            cached: Optional[Frame] = self.gray if gray else self.frame
+            if cached is None:
+                if gray and self.frame is not None:
+                    cached = to_gray(self.frame)
+                    self._stats.incr(self.STATS_PREFIX + "reused")
+                else:
+                    if not gray and self.gray is not None:
+                        # 灰度帧无法转为彩色, 此后灰度请求也截取彩色帧以共用一次截图
+                        self.mixed = True
+                    color: bool = not gray or self.mixed
+                    cached = self.backend.grab(gray=not color)
+                    self._stats.incr(self.STATS_PREFIX + "grabs")
+                    # 新截图时丢弃另一种帧, 灰度与彩色帧始终来自同一次截图
+                    self.frame = self.gray = None
+                    self.stamp = now
+                    if gray and color:
+                        cached.flags.writeable = False
+                        self.frame = cached
+                        cached = to_gray(cached)
+                cached.flags.writeable = False
+                if gray:
+                    self.gray = cached
+                else:
+                    self.frame = cached
+            else:
+                self._stats.incr(self.STATS_PREFIX + "reused")
+            return crop(cached, region)
+
+    def grab_window(
+        self,
+        hWnd: int,
+        region: Region,
+        offset: Tuple[int, int],
+        allow_overlay: bool = True,
+        gray: bool = False,
+    ) -> Frame:
+        if allow_overlay:
+            return self.grab(region, gray)
+        return self.backend.grab_window(hWnd, region, offset, allow_overlay, gray)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.frame = self.gray = None
+            self.stamp = 0.0
+        self.backend.invalidate()
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+global_stats_manager.define_ratio(
+    FrameCache.STATS_PREFIX + "reuse_ratio",
+    FrameCache.STATS_PREFIX + "reused",
+    FrameCache.STATS_PREFIX + "grabs",
+)
+
+
+__all__ = [
+    "FrameCache",
+]
@@ -0,0 +1,131 @@
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+
+from ...Models.globals import CaptureConfig
+from .base import CaptureBackend, Frame, Region, crop
+from .directory import read_frame
+
+MANIFEST: str = "session.json"
+
+
+class SessionRecorder(CaptureBackend):
+    """Wraps a backend and saves every captured frame to a session directory
+    that `RecordedCapture` can replay."""
+
+    def __init__(self, backend: CaptureBackend, path: str) -> None:
+        self.backend: CaptureBackend = backend
+        self.path: str = path
+        self.frames: List[Dict[str, Any]] = []
+        self.start: float = time.perf_counter()
+        self._lock: threading.Lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def screen_size(self) -> Tuple[int, int]:
+        return self.backend.screen_size()
+
+    def grab(self, region: Optional[Region] = None, gray: bool = False) -> Frame:
+        return self._record(self.backend.grab(region, gray), region)
+
+    def grab_window(
+        self,
+        hWnd: int,
+        region: Region,
+        offset: Tuple[int, int],
+        allow_overlay: bool = True,
+        gray: bool = False,
+    ) -> Frame:
+        frame = self.backend.grab_window(hWnd, region, offset, allow_overlay, gray)
+        return self._record(frame, region)
+
+    def _record(self, frame: Frame, region: Optional[Region]) -> Frame:
+        with self._lock:
+            name: str = f"{len(self.frames):06d}.png"
+            cv2.imwrite(os.path.join(self.path, name), frame)
+            self.frames.append(
+                {
+                    "file": name,
+                    "time": round(time.perf_counter() - self.start, 6),
+                    "region": list(region) if region else None,
+                }
+            )
+            self._write_manifest()
+        return frame
+
+    def _write_manifest(self) -> None:
+        manifest: Dict[str, Any] = {
+            "version": 1,
+            "screen": list(self.backend.screen_size()),
+            "frames": self.frames,
+        }
+        tmp: str = os.path.join(self.path, MANIFEST + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, MANIFEST))
+
+    def invalidate(self) -> None:
+        self.backend.invalidate()
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+@CaptureBackend.register("recorded")
+class RecordedCapture(CaptureBackend):
+    """Replays a session saved by `SessionRecorder` (`globals.capture.record`).
+
+    Frames are served in recorded order, one per grab, or by elapsed time
+    since the first grab if `config.realtime`. A request for another region
+    is cropped from the recorded frame where they overlap.
+    """
+
+    def __init__(self, config: CaptureConfig) -> None:
+        self.config: CaptureConfig = config
+        with open(os.path.join(config.path, MANIFEST), "r", encoding="utf-8") as f:
+            manifest: Dict[str, Any] = json.load(f)
+        self.size: Tuple[int, int] = tuple(manifest["screen"])  # type: ignore[assignment]
+        self.frames: List[Dict[str, Any]] = manifest["frames"]
+        if not self.frames:
+            raise FileNotFoundError(f"Recorded session is empty: {config.path}")
+        self.times: List[float] = [record["time"] for record in self.frames]
+        self.position: int = 0
+        self.start: Optional[float] = None
+
+    def screen_size(self) -> Tuple[int, int]:
+        return self.size
+
+    def next_record(self) -> Dict[str, Any]:
+        if self.config.realtime:
+            now: float = time.perf_counter()
+            if self.start is None:
+                self.start = now - self.times[0]
+            elapsed: float = now - self.start
+            if self.config.loop and self.times[-1] > 0:
+                elapsed %= self.times[-1]
+            return self.frames[max(bisect.bisect_right(self.times, elapsed) - 1, 0)]
+
+        if self.position >= len(self.frames):
+            self.position = 0 if self.config.loop else len(self.frames) - 1
+        record: Dict[str, Any] = self.frames[self.position]
+        self.position += 1
+        return record
+
+    def grab(self, region: Optional[Region] = None, gray: bool = False) -> Frame:
+        record: Dict[str, Any] = self.next_record()
+        frame: Frame = read_frame(os.path.join(self.config.path, record["file"]), gray)
+        recorded: Optional[List[int]] = record["region"]
+        if region is None or recorded is None:
+            return crop(frame, region)
+        return crop(frame, region, origin=(recorded[0], recorded[1]))
+
+
+__all__ = [
+    "MANIFEST",
+    "RecordedCapture",
+    "SessionRecorder",
+]
@@ -0,0 +1,58 @@
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ...Models.globals import CaptureConfig
+from .base import CaptureBackend, Frame, Region, crop, to_gray
+from .directory import read_frame
+
+
+def synthetic_screen(width: int, height: int, seed: int = 0) -> Frame:
+    """A deterministic desktop-like frame: gradient background, panels, labels."""
+    rng = np.random.default_rng(seed)
+    ramp = np.linspace(40, 90, width, dtype=np.float32)
+    screen = np.repeat(np.tile(ramp, (height, 1)).astype(np.uint8)[..., None], 3, 2)
+    for _ in range(width * height // 40000):
+        x, y = int(rng.integers(0, width - 40)), int(rng.integers(0, height - 20))
+        w, h = int(rng.integers(30, 300)), int(rng.integers(16, 120))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        border = tuple(255 - c for c in color)
+        cv2.rectangle(screen, (x, y), (x + w, y + h), color, -1)
+        cv2.rectangle(screen, (x, y), (x + w, y + h), border, 1)
+        label = "".join(chr(c) for c in rng.integers(65, 91, 6))
+        cv2.putText(
+            screen, label, (x + 4, y + h - 4), cv2.FONT_HERSHEY_SIMPLEX, 0.5, border
+        )
+    return screen
+
+
+@CaptureBackend.register("synthetic")
+class SyntheticCapture(CaptureBackend):
+    """Generated `config.width` x `config.height` frame with the images of
+    `config.plant` drawn at fixed positions. The frame is built once."""
+
+    def __init__(self, config: CaptureConfig) -> None:
+        self.config: CaptureConfig = config
+        self.frame: Frame = synthetic_screen(config.width, config.height, config.seed)
+        for plant in config.plant:
+            image: Frame = read_frame(plant.path)
+            target = crop(
+                self.frame, (plant.x, plant.y, image.shape[1], image.shape[0])
+            )
+            target[...] = image[: target.shape[0], : target.shape[1]]
+        self.frame.flags.writeable = False
+        self.gray: Frame = to_gray(self.frame)
+        self.gray.flags.writeable = False
+
+    def screen_size(self) -> Tuple[int, int]:
+        return self.config.width, self.config.height
+
+    def grab(self, region: Optional[Region] = None, gray: bool = False) -> Frame:
+        return crop(self.gray if gray else self.frame, region)
+
+
+__all__ = [
+    "SyntheticCapture",
+    "synthetic_screen",
+]
@@ -7,6 +7,7 @@ import win32con
 import win32gui
 
 from ..Util import input_controller_util
+from .PacingController import global_pacer
 from .Runner import SafeRunner
 from .SystemController import SystemController
 
@@ -30,17 +31,16 @@ class InputController:
         if hWnd is not None:
             # 后台输入到指定窗口 - 使用 WM_CHAR 消息，不改变焦点
             try:
-                for char in text:
+                # 字符按起始时间均匀排布, 发送耗时不会累积
+                schedule = global_pacer.schedule()
+                for i, char in enumerate(text):
+                    if duration > 0 and i:
+                        schedule.at(duration * i / len(text))
                     char_code = ord(char)
                     # 发送 WM_CHAR 消息，这种方式不会改变窗口焦点
                     InputController._send_message_to_window(
                         hWnd, win32con.WM_CHAR, char_code, 0, debug, ignore
                     )
-                    # 添加字符间延迟
-                    if duration > 0 and len(text) > 1:
-                        SystemController.sleep(
-                            duration // len(text), debug=debug, ignore=ignore
-                        )
             except Exception as e:
                 if not ignore:
                     raise RuntimeError(
@@ -0,0 +1,716 @@
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from .StatsController import StatsManager, global_stats_manager
+from .TemplateController import (
+    Template,
+    TemplateAtlas,
+    TemplateStore,
+    global_template_store,
+)
+
+GrayImage = NDArray[np.uint8]
+
+_ITEM_T = TypeVar("_ITEM_T")
+_RESULT_T = TypeVar("_RESULT_T")
+
+
+class MatchResult(NamedTuple):
+    score: float
+    x: int  # left of the match inside the searched image
+    y: int  # top of the match inside the searched image
+
+
+class AtlasMatch(NamedTuple):
+    label: str
+    score: float
+    x: int
+    y: int
+
+
+class MatchTracker:
+    """Last hit location (screen coordinates) per job and template."""
+
+    STATS_PREFIX: str = "match.track."
+
+    def __init__(self, stats: StatsManager = global_stats_manager) -> None:
+        self._last: Dict[Hashable, Tuple[int, int]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: StatsManager = stats
+
+    def get(self, key: Hashable) -> Optional[Tuple[int, int]]:
+        return self._last.get(key)
+
+    def put(self, key: Hashable, x: int, y: int) -> None:
+        with self._lock:
+            self._last[key] = (x, y)
+
+    def forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._last.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._last.clear()
+
+    def count(self, event: str) -> None:
+        self._stats.incr(self.STATS_PREFIX + event)
+
+
+global_match_tracker = MatchTracker()
+global_stats_manager.define_ratio(
+    MatchTracker.STATS_PREFIX + "hit_ratio",
+    MatchTracker.STATS_PREFIX + "hits",
+    MatchTracker.STATS_PREFIX + "misses",
+    MatchTracker.STATS_PREFIX + "cold",
+)
+
+
+Fingerprint = Tuple[Tuple[int, ...], int]
+
+
+class MatchGate:
+    """Last failed match per job and template, with the fingerprint of the
+    region it failed on."""
+
+    STATS_PREFIX: str = "match.gate."
+
+    def __init__(self, stats: StatsManager = global_stats_manager) -> None:
+        self._failed: Dict[Hashable, Tuple[Fingerprint, MatchResult]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: StatsManager = stats
+
+    def get(self, key: Hashable) -> Optional[Tuple[Fingerprint, MatchResult]]:
+        return self._failed.get(key)
+
+    def put(self, key: Hashable, fingerprint: Fingerprint, found: MatchResult) -> None:
+        with self._lock:
+            self._failed[key] = (fingerprint, found)
+
+    def forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._failed.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._failed.clear()
+
+    def count(self, event: str) -> None:
+        self._stats.incr(self.STATS_PREFIX + event)
+
+
+global_match_gate = MatchGate()
+global_stats_manager.define_ratio(
+    MatchGate.STATS_PREFIX + "skip_ratio",
+    MatchGate.STATS_PREFIX + "skipped",
+    MatchGate.STATS_PREFIX + "searched",
+)
+
+
+class ScaleMemory:
+    """Scale each template last matched at."""
+
+    STATS_PREFIX: str = "match.scale."
+
+    def __init__(self, stats: StatsManager = global_stats_manager) -> None:
+        self._last: Dict[Hashable, float] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: StatsManager = stats
+
+    def get(self, key: Hashable) -> Optional[float]:
+        return self._last.get(key)
+
+    def put(self, key: Hashable, scale: float) -> None:
+        with self._lock:
+            self._last[key] = scale
+
+    def clear(self) -> None:
+        with self._lock:
+            self._last.clear()
+
+    def count(self, event: str, amount: int = 1) -> None:
+        self._stats.incr(self.STATS_PREFIX + event, amount)
+
+
+global_scale_memory = ScaleMemory()
+global_stats_manager.define_ratio(
+    ScaleMemory.STATS_PREFIX + "hit_ratio",
+    ScaleMemory.STATS_PREFIX + "hits",
+    ScaleMemory.STATS_PREFIX + "misses",
+    ScaleMemory.STATS_PREFIX + "cold",
+)
+
+
+class MatchController:
+    # the coarsest pyramid level keeps templates at least this large
+    PYRAMID_MIN_SIZE: int = 8
+    # float32 elements of the window matrix built per atlas band
+    ATLAS_BAND_SIZE: int = 1 << 20
+
+    # shared matching pool, OpenCV releases the GIL inside matchTemplate
+    _pool: Optional[ThreadPoolExecutor] = None
+    _pool_lock: threading.Lock = threading.Lock()
+    _workers: int = 0  # 0: one per CPU
+    _local: threading.local = threading.local()
+
+    @staticmethod
+    def set_workers(workers: int) -> None:
+        """Resize the matching pool, 0 for one worker per CPU."""
+        with MatchController._pool_lock:
+            if workers == MatchController._workers:
+                return
+            MatchController._workers = workers
+            if MatchController._pool is not None:
+                MatchController._pool.shutdown(wait=False)
+                MatchController._pool = None
+
+    @staticmethod
+    def _mark_worker() -> None:
+        MatchController._local.worker = True
+
+    @staticmethod
+    def pool() -> ThreadPoolExecutor:
+        with MatchController._pool_lock:
+            if MatchController._pool is None:
+                MatchController._pool = ThreadPoolExecutor(
+                    max_workers=MatchController._workers or os.cpu_count() or 1,
+                    thread_name_prefix="match",
+                    initializer=MatchController._mark_worker,
+                )
+            return MatchController._pool
+
+    @staticmethod
+    def map(
+        fnc: Callable[[_ITEM_T], _RESULT_T],
+        items: Iterable[_ITEM_T],
+        parallel: bool = False,
+    ) -> List[_RESULT_T]:
+        """`[fnc(item) for item in items]`, on the matching pool if `parallel`.
+
+        Calls made from a pool worker run serially, so nested parallel work
+        (tiles of parallel templates) cannot exhaust the pool and deadlock.
+        """
+        items = list(items)
+        if (
+            not parallel
+            or len(items) < 2
+            or getattr(MatchController._local, "worker", False)
+        ):
+            return [fnc(item) for item in items]
+        return list(MatchController.pool().map(fnc, items))
+
+    @staticmethod
+    def _response(
+        image: GrayImage, template: GrayImage, mask: Optional[GrayImage]
+    ) -> NDArray[np.float32]:
+        res = cast(
+            NDArray[np.float32],
+            cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED, mask=mask),
+        )
+        if mask is not None:
+            # flat image areas under the mask divide by zero
+            res[~np.isfinite(res)] = -1
+        return res
+
+    @staticmethod
+    def response(
+        image: GrayImage,
+        template: GrayImage,
+        mask: Optional[GrayImage] = None,
+        tiles: int = 1,
+    ) -> NDArray[np.float32]:
+        """TM_CCOEFF_NORMED map, only pixels where `mask` is non-zero count.
+
+        With `tiles` > 1 the image is cut into horizontal strips overlapping
+        by the template height, matched on the pool and stitched back. Every
+        result row comes from exactly one strip chosen by `tiles` alone, so
+        the map does not depend on the pool size or scheduling. It is not
+        bit-identical to the untiled map: OpenCV picks its FFT block sizes
+        from the strip size, so scores differ by rounding, about 2e-5 on
+        textured regions and up to about 1e-2 in flat ones, where the
+        normalisation divides by a tiny variance.
+        """
+        height: int = template.shape[0]
+        rows: int = image.shape[0] - height + 1
+        if tiles <= 1 or rows < 2:
+            return MatchController._response(image, template, mask)
+
+        step: int = -(-rows // min(tiles, rows))
+        parts: List[NDArray[np.float32]] = MatchController.map(
+            lambda top: MatchController._response(
+                image[top : min(top + step, rows) + height - 1], template, mask
+            ),
+            range(0, rows, step),
+            parallel=True,
+        )
+        return np.concatenate(parts)
+
+    @staticmethod
+    def resize_mask(
+        mask: Optional[GrayImage], template: GrayImage
+    ) -> Optional[GrayImage]:
+        """`mask` resized to `template`, kept binary."""
+        if mask is None or mask.shape == template.shape:
+            return mask
+        # template sized, cheaper to rebuild than to cache per mask source
+        resized = cv2.resize(
+            mask, (template.shape[1], template.shape[0]), interpolation=cv2.INTER_AREA
+        )
+        return np.where(resized >= 128, 255, 0).astype(np.uint8)
+
+    @staticmethod
+    def exact(
+        image: GrayImage,
+        template: GrayImage,
+        mask: Optional[GrayImage] = None,
+        tiles: int = 1,
+    ) -> MatchResult:
+        """Exhaustive TM_CCOEFF_NORMED search over the whole image."""
+        res = MatchController.response(image, template, mask, tiles)
+        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        return MatchResult(float(max_val), int(max_loc[0]), int(max_loc[1]))
+
+    @staticmethod
+    def pyramid_levels(template: GrayImage, levels: int) -> int:
+        """Clamp `levels` so the coarsest template is still matchable."""
+        size: int = min(template.shape[:2])
+        usable: int = 0
+        while (
+            usable < levels and size >> (usable + 1) >= MatchController.PYRAMID_MIN_SIZE
+        ):
+            usable += 1
+        return usable
+
+    @staticmethod
+    def template_pyramid(
+        template: Template,
+        levels: int,
+        store: TemplateStore = global_template_store,
+    ) -> Tuple[GrayImage, ...]:
+        """Downscaled forms of `template`, index `i` is level `i + 1`."""
+
+        def build(t: Template) -> Tuple[GrayImage, ...]:
+            out: List[GrayImage] = []
+            cur: GrayImage = t.gray
+            for _ in range(levels):
+                cur = cast(GrayImage, cv2.pyrDown(cur))
+                out.append(cur)
+            return tuple(out)
+
+        return store.derive(template, f"pyramid.{levels}", build)
+
+    @staticmethod
+    def _peaks(
+        res: NDArray[np.float32], count: int, gap: Tuple[int, int]
+    ) -> List[Tuple[int, int]]:
+        # best `count` local maxima, suppressing a template-sized area around each
+        peaks: List[Tuple[int, int]] = []
+        res = res.copy()
+        gap_w, gap_h = gap
+        for _ in range(count):
+            _, max_val, _, (px, py) = cv2.minMaxLoc(res)
+            if max_val <= -1:
+                break
+            peaks.append((px, py))
+            res[
+                max(py - gap_h, 0) : py + gap_h + 1,
+                max(px - gap_w, 0) : px + gap_w + 1,
+            ] = -1
+        return peaks
+
+    @staticmethod
+    def pyramid(
+        image: GrayImage,
+        template: Template,
+        confidence: float,
+        levels: int = 2,
+        candidates: int = 3,
+        store: TemplateStore = global_template_store,
+        mask: Optional[GrayImage] = None,
+        tiles: int = 1,
+    ) -> MatchResult:
+        """Coarse-to-fine search: match the downscaled pyramid top first, then
+        refine the best `candidates` in small full-resolution windows.
+
+        Falls back to `exact` if no refined candidate reaches `confidence`,
+        so the result is never worse than the exhaustive search.
+        """
+        levels = MatchController.pyramid_levels(template.gray, levels)
+        if levels == 0:
+            return MatchController.exact(image, template.gray, mask, tiles)
+
+        coarse_template: GrayImage = MatchController.template_pyramid(
+            template, levels, store
+        )[-1]
+        coarse: GrayImage = image
+        for _ in range(levels):
+            coarse = cast(GrayImage, cv2.pyrDown(coarse))
+        if (
+            coarse.shape[0] < coarse_template.shape[0]
+            or coarse.shape[1] < coarse_template.shape[1]
+        ):
+            return MatchController.exact(image, template.gray, mask, tiles)
+
+        coarse_mask: Optional[GrayImage] = MatchController.resize_mask(
+            mask, coarse_template
+        )
+        res = MatchController.response(coarse, coarse_template, coarse_mask)
+        gap = (coarse_template.shape[1] // 2, coarse_template.shape[0] // 2)
+        scale: int = 1 << levels
+        pad: int = scale * 2
+        height, width = template.gray.shape[:2]
+
+        best: Optional[MatchResult] = None
+        for cx, cy in MatchController._peaks(res, candidates, gap):
+            left: int = max(cx * scale - pad, 0)
+            top: int = max(cy * scale - pad, 0)
+            right: int = min(cx * scale + width + pad, image.shape[1])
+            bottom: int = min(cy * scale + height + pad, image.shape[0])
+            found = MatchController.exact(
+                image[top:bottom, left:right], template.gray, mask
+            )
+            if best is None or found.score > best.score:
+                best = MatchResult(found.score, found.x + left, found.y + top)
+
+        if best is not None and best.score >= confidence:
+            global_stats_manager.incr("match.pyramid.refined")
+            return best
+        global_stats_manager.incr("match.pyramid.fallbacks")
+        return MatchController.exact(image, template.gray, mask, tiles)
+
+    @staticmethod
+    def find_all(
+        image: GrayImage,
+        template: GrayImage,
+        confidence: float,
+        max_results: int = 0,
+        overlap: float = 0.3,
+        mask: Optional[GrayImage] = None,
+        tiles: int = 1,
+    ) -> List[MatchResult]:
+        """Every match scoring at least `confidence`, best first.
+
+        Peaks are taken from the thresholded response map with a max filter
+        half a template wide, then boxes overlapping a better one by more
+        than `overlap` (IoU) are suppressed. `max_results` <= 0 is unlimited.
+        """
+        res = MatchController.response(image, template, mask, tiles)
+        height, width = template.shape[:2]
+        return [
+            MatchResult(float(res[y, x]), x, y)
+            for x, y in MatchController._suppress(
+                res, width, height, confidence, overlap, max_results
+            )
+        ]
+
+    @staticmethod
+    def _suppress(
+        res: NDArray[np.float32],
+        width: int,
+        height: int,
+        confidence: float,
+        overlap: float,
+        max_results: int,
+    ) -> List[Tuple[int, int]]:
+        """Peaks of `res` kept by greedy NMS of `width` x `height` boxes, best first."""
+        kernel = np.ones(((height // 2) | 1, (width // 2) | 1), np.uint8)
+        peaks = (res >= confidence) & (res >= cv2.dilate(res, kernel))
+        ys, xs = np.nonzero(peaks)
+        scores = res[ys, xs]
+        order = np.argsort(-scores, kind="stable")
+
+        # greedy NMS, vectorized over the remaining candidates
+        keep: List[int] = []
+        area: int = width * height
+        while order.size and (max_results <= 0 or len(keep) < max_results):
+            i: int = int(order[0])
+            keep.append(i)
+            rest = order[1:]
+            inter = np.clip(width - np.abs(xs[rest] - xs[i]), 0, None) * np.clip(
+                height - np.abs(ys[rest] - ys[i]), 0, None
+            )
+            order = rest[inter <= overlap * (2 * area - inter)]
+        return [(int(xs[i]), int(ys[i])) for i in keep]
+
+    @staticmethod
+    def atlas_response(
+        image: GrayImage, atlas: TemplateAtlas
+    ) -> Tuple[NDArray[np.float32], NDArray[np.intp]]:
+        """TM_CCOEFF_NORMED of the best atlas template at every location, and
+        the index of that template in `atlas.labels`.
+
+        The image windows are flattened into the columns of a matrix that the
+        packed templates multiply, so every template is correlated in one pass;
+        the window norms, shared by all templates, come from integral images.
+        Flat windows score -1. Large images are split into row bands that
+        run on the matching pool.
+        """
+        height, width = atlas.height, atlas.width
+        rows: int = image.shape[0] - height + 1
+        cols: int = image.shape[1] - width + 1
+        if rows < 1 or cols < 1:
+            raise ValueError("Image is smaller than the atlas templates.")
+
+        size: int = height * width
+        sums, squares = cast(
+            Tuple[NDArray[np.float64], NDArray[np.float64]],
+            cv2.integral2(image, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F),
+        )
+
+        def window(table: NDArray[np.float64]) -> NDArray[np.float64]:
+            return (
+                table[height:, width:]
+                - table[:-height, width:]
+                - table[height:, :-width]
+                + table[:-height, :-width]
+            )
+
+        total = window(sums)
+        # sum of squared deviations; at least (size - 1) / size unless flat
+        spread = window(squares) - total * total / size
+        norms = np.sqrt(np.where(spread > 0.5, spread, np.inf))
+
+        step: int = max(MatchController.ATLAS_BAND_SIZE // (cols * size), 1)
+
+        def band(top: int) -> Tuple[NDArray[np.float32], NDArray[np.intp]]:
+            bottom: int = min(top + step, rows)
+            # one row per template pixel, filled with contiguous slice copies
+            windows = np.empty((size, bottom - top, cols), np.float32)
+            for dy in range(height):
+                for dx in range(width):
+                    windows[dy * width + dx] = image[
+                        top + dy : bottom + dy, dx : dx + cols
+                    ]
+            products = atlas.kernels @ windows.reshape(size, -1)
+            best = products.argmax(axis=0)
+            scores = np.take_along_axis(products, best[None], 0)
+            scores = (scores.reshape(bottom - top, cols) / norms[top:bottom]).astype(
+                np.float32
+            )
+            scores[np.isinf(norms[top:bottom])] = -1
+            return np.clip(scores, -1, 1), best.reshape(bottom - top, cols)
+
+        parts = MatchController.map(band, range(0, rows, step), parallel=True)
+        return (
+            np.concatenate([scores for scores, _ in parts]),
+            np.concatenate([labels for _, labels in parts]),
+        )
+
+    @staticmethod
+    def classify(
+        patches: NDArray[np.uint8], atlas: TemplateAtlas
+    ) -> Tuple[NDArray[np.float32], NDArray[np.intp]]:
+        """Best atlas template and its TM_CCOEFF_NORMED score for each of the
+        atlas-sized `patches` (already cut out, e.g. segmented characters),
+        all scored in one matrix product. Flat patches score -1."""
+        values = patches.reshape(len(patches), -1).astype(np.float32)
+        values -= values.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(values, axis=1)
+        products = values @ atlas.kernels.T
+        best = products.argmax(axis=1)
+        scores = products[np.arange(len(best)), best]
+        flat = norms == 0
+        scores = np.where(flat, -1, scores / np.where(flat, 1, norms))
+        return np.clip(scores, -1, 1).astype(np.float32), best
+
+    @staticmethod
+    def find_labels(
+        image: GrayImage,
+        atlas: TemplateAtlas,
+        confidence: float,
+        max_results: int = 0,
+        overlap: float = 0.3,
+    ) -> List[AtlasMatch]:
+        """Atlas templates found at least `confidence` in `image`, best first.
+
+        Like `find_all` over the best-label map: a location is claimed by the
+        best scoring template only, overlapping hits are suppressed whatever
+        their label.
+        """
+        scores, labels = MatchController.atlas_response(image, atlas)
+        return [
+            AtlasMatch(atlas.labels[labels[y, x]], float(scores[y, x]), x, y)
+            for x, y in MatchController._suppress(
+                scores, atlas.width, atlas.height, confidence, overlap, max_results
+            )
+        ]
+
+    @staticmethod
+    def tracked(
+        image: GrayImage,
+        template: GrayImage,
+        confidence: float,
+        search: Callable[[], MatchResult],
+        key: Hashable,
+        origin: Tuple[int, int] = (0, 0),
+        padding: int = 16,
+        tracker: MatchTracker = global_match_tracker,
+        mask: Optional[GrayImage] = None,
+        accept: Optional[Callable[[MatchResult], bool]] = None,
+    ) -> MatchResult:
+        """Search a `padding` wide window around the last hit of `key` first,
+        falling back to `search()` over the whole image on a miss.
+
+        `origin` is the screen position of the image, hits are remembered in
+        screen coordinates so they survive region and window moves. A window
+        hit must also pass `accept` (given image coordinates), if set.
+        """
+        last: Optional[Tuple[int, int]] = tracker.get(key)
+        height, width = template.shape[:2]
+        if last is None:
+            tracker.count("cold")
+        else:
+            left: int = max(last[0] - origin[0] - padding, 0)
+            top: int = max(last[1] - origin[1] - padding, 0)
+            right: int = min(last[0] - origin[0] + width + padding, image.shape[1])
+            bottom: int = min(last[1] - origin[1] + height + padding, image.shape[0])
+            if right - left >= width and bottom - top >= height:
+                found = MatchController.exact(
+                    image[top:bottom, left:right], template, mask
+                )
+                hit = MatchResult(found.score, found.x + left, found.y + top)
+                if hit.score >= confidence and (accept is None or accept(hit)):
+                    tracker.count("hits")
+                    tracker.put(key, hit.x + origin[0], hit.y + origin[1])
+                    return hit
+            tracker.count("misses")
+
+        found = search()
+        if found.score >= confidence:
+            tracker.put(key, found.x + origin[0], found.y + origin[1])
+        else:
+            tracker.forget(key)
+        return found
+
+    @staticmethod
+    def color_distance(
+        image: NDArray[np.uint8],
+        template: NDArray[np.uint8],
+        found: MatchResult,
+        mask: Optional[GrayImage] = None,
+    ) -> float:
+        """Largest per-channel difference between the mean colours of the
+        (masked) template and the patch it matched in the BGR `image`."""
+        height, width = template.shape[:2]
+        patch = image[found.y : found.y + height, found.x : found.x + width]
+        expected = cv2.mean(template, mask)[:3]
+        actual = cv2.mean(patch, mask)[:3]
+        return float(np.abs(np.subtract(actual, expected)).max())
+
+    @staticmethod
+    def multi_scale(
+        image: GrayImage,
+        template: Template,
+        confidence: float,
+        scales: Iterable[float],
+        search: Callable[[Template], MatchResult],
+        store: TemplateStore = global_template_store,
+        memory: ScaleMemory = global_scale_memory,
+    ) -> Tuple[MatchResult, Template]:
+        """`search` the resized forms of `template` in `scales` order, stopping
+        at the first one reaching `confidence`.
+
+        The scale a template last matched at is tried first. Returns the
+        best result with the (resized) template it was found with.
+        """
+        order: List[float] = list(dict.fromkeys(scales))
+        last: Optional[float] = memory.get(template.path)
+        if last in order:
+            order.remove(last)
+            order.insert(0, last)
+
+        best: Optional[Tuple[MatchResult, Template]] = None
+        tried: int = 0
+        for scale in order:
+            scaled: Template = store.scaled(template, scale)
+            if scaled.height > image.shape[0] or scaled.width > image.shape[1]:
+                continue
+            found: MatchResult = search(scaled)
+            tried += 1
+            if best is None or found.score > best[0].score:
+                best = (found, scaled)
+            if found.score >= confidence:
+                break
+
+        memory.count("searches", tried)
+        if last is None:
+            memory.count("cold")
+        elif (
+            best is not None
+            and tried == 1
+            and best[1].scale == last
+            and best[0].score >= confidence
+        ):
+            memory.count("hits")
+        else:
+            memory.count("misses")
+        if best is None:
+            return MatchResult(-1.0, 0, 0), template
+        if best[0].score >= confidence:
+            memory.put(template.path, best[1].scale)
+        return best
+
+    @staticmethod
+    def fingerprint(image: GrayImage) -> Fingerprint:
+        """Shape and CRC-32 of every pixel of `image`.
+
+        Exact rather than downsampled, so a one pixel change (a caret, a
+        progress bar tick) is never mistaken for an idle screen; it costs
+        about 1% of a full-screen `exact` match.
+        """
+        return image.shape, zlib.crc32(np.ascontiguousarray(image).data)
+
+    @staticmethod
+    def gated(
+        fingerprint: Fingerprint,
+        confidence: float,
+        search: Callable[[], MatchResult],
+        key: Hashable,
+        gate: MatchGate = global_match_gate,
+    ) -> MatchResult:
+        """`search()`, unless the last search of `key` failed on a region with
+        the same `fingerprint`: that failure is returned without matching.
+        """
+        last = gate.get(key)
+        if last is not None and last[0] == fingerprint and last[1].score < confidence:
+            gate.count("skipped")
+            return last[1]
+
+        gate.count("searched")
+        found = search()
+        if found.score < confidence:
+            gate.put(key, fingerprint, found)
+        else:
+            gate.forget(key)
+        return found
+
+
+__all__ = [
+    "Fingerprint",
+    "MatchController",
+    "MatchGate",
+    "MatchResult",
+    "MatchTracker",
+    "ScaleMemory",
+    "global_match_gate",
+    "global_match_tracker",
+    "global_scale_memory",
+]
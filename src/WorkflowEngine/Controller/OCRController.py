@@ -0,0 +1,448 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from .MatchController import MatchController
+from .StatsController import StatsManager, global_stats_manager
+from .TemplateController import TemplateAtlas, TemplateStore, global_template_store
+
+GrayImage = NDArray[np.uint8]
+Box = Tuple[int, int, int, int]  # left, top, right, bottom
+
+
+class Glyph(NamedTuple):
+    char: str
+    score: float
+    left: int  # box inside the read image
+    top: int
+    width: int
+    height: int
+
+
+@dataclass
+class OCRResult:
+    text: str
+    glyphs: List[Glyph]
+
+    @property
+    def confidence(self) -> float:
+        """Score of the least certain glyph, 0 without glyphs."""
+        return min((g.score for g in self.glyphs), default=0.0)
+
+    @property
+    def box(self) -> Tuple[int, int, int, int]:
+        """`(left, top, width, height)` around every glyph."""
+        if not self.glyphs:
+            return 0, 0, 0, 0
+        left = min(g.left for g in self.glyphs)
+        top = min(g.top for g in self.glyphs)
+        right = max(g.left + g.width for g in self.glyphs)
+        bottom = max(g.top + g.height for g in self.glyphs)
+        return left, top, right - left, bottom - top
+
+
+@dataclass
+class GlyphSet:
+    """A trained glyph set: same-sized glyph images with their characters.
+
+    Built by `OCRController.build_glyphs` into a directory holding the
+    images and a `glyphs.json` manifest.
+    """
+
+    directory: str
+    width: int
+    height: int
+    chars: Dict[str, str]  # image file -> character
+    # gap between characters, relative to the line height, read as a space
+    space: float = 0.4
+    # newest modification time of the manifest and the glyph images
+    mtime_ns: int = 0
+
+    def newest_mtime_ns(self, manifest: str) -> int:
+        """Newest modification time of `manifest` and the glyph images."""
+        return max(
+            os.stat(path).st_mtime_ns
+            for path in (
+                manifest,
+                *(os.path.join(self.directory, name) for name in self.chars),
+            )
+        )
+
+    def atlas(
+        self,
+        whitelist: Optional[str] = None,
+        store: TemplateStore = global_template_store,
+    ) -> TemplateAtlas:
+        """Atlas of the glyphs (labelled by file), restricted to `whitelist`."""
+        paths: Dict[str, str] = {
+            name: os.path.join(self.directory, name)
+            for name, char in self.chars.items()
+            if whitelist is None or char in whitelist
+        }
+        if not paths:
+            raise ValueError(f"No glyph in {self.directory} matches the whitelist.")
+        atlas: Optional[TemplateAtlas] = store.atlas(paths)
+        if atlas is None:
+            raise FileNotFoundError(f"Glyph images missing in {self.directory}")
+        return atlas
+
+
+_Entry = Tuple[float, OCRResult]
+
+
+class OCRCache:
+    """Recent results per job, keyed by what was read: the fingerprint of
+    the region plus the glyph set and read parameters.
+
+    Each job keeps at most `size` entries (least recently used dropped
+    first); an entry older than `ttl` seconds counts as a miss.
+    """
+
+    STATS_PREFIX: str = "ocr.cache."
+
+    def __init__(self, stats: StatsManager = global_stats_manager) -> None:
+        # job -> read key -> (time stored, result), least recently used first
+        self._jobs: Dict[Hashable, "OrderedDict[Hashable, _Entry]"] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: StatsManager = stats
+
+    def get(self, job: Hashable, key: Hashable, ttl: float) -> Optional[OCRResult]:
+        with self._lock:
+            entries: Optional["OrderedDict[Hashable, _Entry]"] = self._jobs.get(job)
+            entry: Optional[_Entry] = None if entries is None else entries.get(key)
+            if entries is None or entry is None:
+                self.count("misses")
+                return None
+            if time.perf_counter() - entry[0] > ttl:
+                del entries[key]
+                self.count("expired")
+                return None
+            entries.move_to_end(key)
+            self.count("hits")
+            return entry[1]
+
+    def put(self, job: Hashable, key: Hashable, result: OCRResult, size: int) -> None:
+        with self._lock:
+            entries = self._jobs.setdefault(job, OrderedDict())
+            entries[key] = (time.perf_counter(), result)
+            entries.move_to_end(key)
+            while len(entries) > size:
+                entries.popitem(last=False)
+                self.count("evicted")
+
+    def forget(self, job: Hashable) -> None:
+        with self._lock:
+            self._jobs.pop(job, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._jobs.clear()
+
+    def count(self, event: str) -> None:
+        self._stats.incr(self.STATS_PREFIX + event)
+
+
+global_ocr_cache = OCRCache()
+global_stats_manager.define_ratio(
+    OCRCache.STATS_PREFIX + "hit_ratio",
+    OCRCache.STATS_PREFIX + "hits",
+    OCRCache.STATS_PREFIX + "misses",
+    OCRCache.STATS_PREFIX + "expired",
+)
+
+
+class OCRController:
+    """Offline OCR against a trained glyph set.
+
+    A region is binarized, cut into lines by its row profile and into
+    characters by connected components. Each character is cropped to a
+    window set by its line's median character height and baseline, resized
+    to the glyph size, and all of them are classified at once against the
+    glyph atlas.
+    """
+
+    MANIFEST: str = "glyphs.json"
+    # components smaller than this many pixels are noise
+    MIN_AREA: int = 2
+
+    _glyph_sets: Dict[str, GlyphSet] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def binarize(
+        image: GrayImage, polarity: str = "auto", threshold: Optional[int] = None
+    ) -> GrayImage:
+        """Ink mask (255 = text) of `image`.
+
+        `polarity` is `dark` (dark text on a light background), `light`, or
+        `auto` (the text is whichever side covers fewer pixels). Without a
+        `threshold` Otsu's is used.
+        """
+        if threshold is None:
+            _, bright = cv2.threshold(
+                image, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU
+            )
+        else:
+            _, bright = cv2.threshold(image, threshold, 255, cv2.THRESH_BINARY)
+        if polarity == "auto":
+            polarity = (
+                "light" if cv2.countNonZero(bright) * 2 <= bright.size else "dark"
+            )
+        return cast(
+            GrayImage, bright if polarity == "light" else cv2.bitwise_not(bright)
+        )
+
+    @staticmethod
+    def segment(ink: GrayImage) -> List[List[Box]]:
+        """Character boxes `(left, top, right, bottom)` of the ink mask, line
+        by line, left to right; bounds are exclusive.
+
+        Lines are split on empty rows. Components overlapping horizontally
+        by at least half the narrower one (the dot of an `i`, the parts of
+        `%`) form one character.
+        """
+        lines: List[List[Box]] = []
+        rows = np.flatnonzero(ink.any(axis=1))
+        if not rows.size:
+            return lines
+        breaks = np.flatnonzero(np.diff(rows) > 1)
+        for start, end in zip(
+            np.concatenate(([rows[0]], rows[breaks + 1])),
+            np.concatenate((rows[breaks], [rows[-1]])),
+        ):
+            offset: int = int(start)
+            count, _, stats, _ = cv2.connectedComponentsWithStats(
+                ink[offset : int(end) + 1], connectivity=8
+            )
+            chars: List[Box] = []
+            for x, y, w, h, area in sorted(stats[1:count].tolist()):
+                if area < OCRController.MIN_AREA:
+                    continue
+                box: Box = (x, y + offset, x + w, y + h + offset)
+                if chars:
+                    last: Box = chars[-1]
+                    overlap: int = min(last[2], box[2]) - max(last[0], box[0])
+                    if overlap * 2 >= min(last[2] - last[0], w):
+                        chars[-1] = (
+                            min(last[0], box[0]),
+                            min(last[1], box[1]),
+                            max(last[2], box[2]),
+                            max(last[3], box[3]),
+                        )
+                        continue
+                chars.append(box)
+            if chars:
+                lines.append(chars)
+        return lines
+
+    @staticmethod
+    def line_window(chars: Sequence[Box]) -> Tuple[int, int]:
+        """Rows `(top, bottom)` every character of a line is cropped to.
+
+        Taken from the median character height and baseline, so one glyph
+        crops the same in any line whatever the other characters are; room
+        is left for descenders.
+        """
+        height: float = float(np.median([c[3] - c[1] for c in chars]))
+        baseline: float = float(np.median([c[3] for c in chars]))
+        return (
+            int(round(baseline - height * 1.15)),
+            int(round(baseline + height * 0.35)),
+        )
+
+    @staticmethod
+    def normalize(ink: GrayImage, box: Box, size: Tuple[int, int]) -> GrayImage:
+        """The `(left, top, right, bottom)` crop of `ink` resized to `size`.
+
+        Crops narrower than `size`'s aspect ratio are centred, not stretched,
+        so thin characters (`1`, `l`, `|`) keep their shape; rows outside
+        `ink` are blank. The result is slightly blurred: a binarisation that
+        gains or loses one anti-aliased column then barely moves the score.
+        """
+        left, top, right, bottom = box
+        width: int = max(round((bottom - top) * size[0] / size[1]), right - left)
+        pad: int = width - (right - left)
+        crop = cv2.copyMakeBorder(
+            ink[max(top, 0) : bottom, left:right],
+            max(-top, 0),
+            max(bottom - ink.shape[0], 0),
+            pad // 2,
+            pad - pad // 2,
+            cv2.BORDER_CONSTANT,
+            value=0,
+        )
+        patch = cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+        return cast(GrayImage, cv2.GaussianBlur(patch, (3, 3), 0))
+
+    @staticmethod
+    def patches(
+        ink: GrayImage, lines: List[List[Box]], size: Tuple[int, int]
+    ) -> List[GrayImage]:
+        """Glyph-sized crops of the characters of `lines`, in order."""
+        patches: List[GrayImage] = []
+        for chars in lines:
+            top, bottom = OCRController.line_window(chars)
+            patches += [
+                OCRController.normalize(ink, (box[0], top, box[2], bottom), size)
+                for box in chars
+            ]
+        return patches
+
+    @staticmethod
+    def glyph_set(directory: str) -> GlyphSet:
+        """The glyph set in `directory`, reloaded when its manifest or any
+        glyph image has a newer modification time than when it was loaded."""
+        key: str = os.path.abspath(directory)
+        path: str = os.path.join(key, OCRController.MANIFEST)
+        with OCRController._lock:
+            glyphs: Optional[GlyphSet] = OCRController._glyph_sets.get(key)
+        if glyphs is not None and glyphs.mtime_ns == glyphs.newest_mtime_ns(path):
+            return glyphs
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        glyphs = GlyphSet(
+            directory=key,
+            width=int(manifest["width"]),
+            height=int(manifest["height"]),
+            chars={g["file"]: g["char"] for g in manifest["glyphs"]},
+            space=float(manifest.get("space", GlyphSet.space)),
+        )
+        glyphs.mtime_ns = glyphs.newest_mtime_ns(path)
+        with OCRController._lock:
+            OCRController._glyph_sets[key] = glyphs
+        return glyphs
+
+    @staticmethod
+    def read(
+        image: GrayImage,
+        glyphs: GlyphSet,
+        confidence: float = 0.8,
+        polarity: str = "auto",
+        threshold: Optional[int] = None,
+        whitelist: Optional[str] = None,
+        space: Optional[float] = None,
+        unknown: str = "?",
+        store: TemplateStore = global_template_store,
+    ) -> OCRResult:
+        """Text in the grayscale `image`.
+
+        Characters scoring below `confidence` read as `unknown`; a gap wider
+        than `space` (default: the glyph set's) times the line height reads
+        as a space, lines are joined with newlines.
+        """
+        atlas: TemplateAtlas = glyphs.atlas(whitelist, store)
+        ink: GrayImage = OCRController.binarize(image, polarity, threshold)
+        lines: List[List[Box]] = OCRController.segment(ink)
+        if not lines:
+            return OCRResult(text="", glyphs=[])
+
+        patches: List[GrayImage] = OCRController.patches(
+            ink, lines, (glyphs.width, glyphs.height)
+        )
+        scores, labels = MatchController.classify(np.stack(patches), atlas)
+
+        if space is None:
+            space = glyphs.space
+        found: List[Glyph] = []
+        text: List[str] = []
+        for chars in lines:
+            if text:
+                text.append("\n")
+            height: float = float(np.median([c[3] - c[1] for c in chars]))
+            for i, (left, top, right, bottom) in enumerate(chars):
+                if i and left - chars[i - 1][2] > space * height:
+                    text.append(" ")
+                score: float = float(scores[len(found)])
+                char: str = (
+                    glyphs.chars[atlas.labels[labels[len(found)]]]
+                    if score >= confidence
+                    else unknown
+                )
+                text.append(char)
+                found.append(Glyph(char, score, left, top, right - left, bottom - top))
+        return OCRResult(text="".join(text), glyphs=found)
+
+    @staticmethod
+    def build_glyphs(
+        samples: Iterable[Tuple[GrayImage, str]],
+        directory: str,
+        size: Tuple[int, int] = (12, 16),
+        polarity: str = "auto",
+        threshold: Optional[int] = None,
+    ) -> GlyphSet:
+        """Train a glyph set from `(image, text)` samples into `directory`.
+
+        Each sample image shows `text`; it is segmented like `read` does and
+        the n-th character found becomes a glyph of the n-th non-space
+        character of `text`. Identical glyphs are stored once. The gaps at
+        the spaces of `text` set the glyph set's space threshold. Raises
+        ValueError when a sample does not segment into as many characters.
+        """
+        os.makedirs(directory, exist_ok=True)
+        entries: List[Dict[str, str]] = []
+        seen: Dict[str, List[GrayImage]] = {}
+        # relative gaps before characters, without and with a space
+        gaps: Tuple[List[float], List[float]] = ([], [])
+        for image, text in samples:
+            ink: GrayImage = OCRController.binarize(image, polarity, threshold)
+            lines: List[List[Box]] = OCRController.segment(ink)
+            patches: List[GrayImage] = OCRController.patches(ink, lines, size)
+            expected: Sequence[str] = [c for c in text if not c.isspace()]
+            if len(patches) != len(expected):
+                raise ValueError(
+                    f"Sample {text!r} segments into {len(patches)} characters, "
+                    f"expected {len(expected)}; check spacing and polarity."
+                )
+            spaced: List[bool] = [
+                i > 0 and text[i - 1].isspace()
+                for i, c in enumerate(text)
+                if not c.isspace()
+            ]
+            index: int = 0
+            for chars in lines:
+                height: float = float(np.median([c[3] - c[1] for c in chars]))
+                for i in range(1, len(chars)):
+                    gap: float = (chars[i][0] - chars[i - 1][2]) / height
+                    gaps[spaced[index + i]].append(gap)
+                index += len(chars)
+            for char, glyph in zip(expected, patches):
+                if any(np.array_equal(glyph, g) for g in seen.get(char, [])):
+                    continue
+                seen.setdefault(char, []).append(glyph)
+                name: str = f"glyph-{len(entries):04}.png"
+                cv2.imwrite(os.path.join(directory, name), glyph)
+                entries.append({"file": name, "char": char})
+
+        with open(
+            os.path.join(directory, OCRController.MANIFEST), "w", encoding="utf-8"
+        ) as f:
+            manifest: Dict[str, Any] = {"width": size[0], "height": size[1]}
+            if gaps[0] and gaps[1] and max(gaps[0]) < min(gaps[1]):
+                manifest["space"] = round((max(gaps[0]) + min(gaps[1])) / 2, 3)
+            manifest["glyphs"] = entries
+            json.dump(
+                manifest,
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        return OCRController.glyph_set(directory)
@@ -0,0 +1,102 @@
+import threading
+import time
+from typing import Optional
+
+from .StatsController import StatsManager, global_stats_manager
+
+
+class Pacer:
+    """Waits for absolute `perf_counter` deadlines, sleeping then spinning.
+
+    `time.sleep` wakes up late by the OS timer slack, so a wait sleeps
+    until `margin` before its deadline and spins on `perf_counter` for the
+    rest. The margin follows the recent oversleep, so hosts with a coarse
+    timer spin longer and fine-grained ones barely spin; `max_spin` bounds
+    the CPU a single wait can burn. One pacer is shared by the executor and
+    the input thread, the margin is updated under a lock.
+    """
+
+    STATS_PREFIX: str = "pacing."
+
+    # 超过该值(秒)的延迟计为迟到
+    LATE: float = 0.001
+
+    def __init__(
+        self,
+        min_spin: float = 0.0002,
+        max_spin: float = 0.005,
+        stats: StatsManager = global_stats_manager,
+    ) -> None:
+        self.min_spin: float = min_spin
+        self.max_spin: float = max_spin
+        self.margin: float = min_spin * 5
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: StatsManager = stats
+
+    def __learn(self, oversleep: float) -> None:
+        with self._lock:
+            # 抖动变大时较快跟上, 变小时缓慢回落; 偶发的调度延迟只小幅抬高余量
+            rate: float = 0.25 if oversleep > self.margin else 0.05
+            margin: float = self.margin + (oversleep - self.margin) * rate
+            self.margin = min(max(margin, self.min_spin), self.max_spin)
+
+    def wait_until(self, deadline: float) -> float:
+        """Return at `deadline`; how late it returned, in seconds."""
+        margin: float = self.margin
+        remaining: float = deadline - time.perf_counter()
+        if remaining > margin:
+            wake: float = deadline - margin
+            time.sleep(remaining - margin)
+            self.__learn(time.perf_counter() - wake)
+        now: float = time.perf_counter()
+        while now < deadline:
+            now = time.perf_counter()
+
+        late: float = now - deadline
+        self.count("waits")
+        self.count("late" if late > self.LATE else "on_time")
+        self._stats.incr(self.STATS_PREFIX + "lateness_us", int(late * 1e6))
+        return late
+
+    def sleep(self, ms: float) -> float:
+        """Wait `ms` milliseconds from now; how late it returned, in seconds."""
+        return self.wait_until(time.perf_counter() + ms / 1000)
+
+    def schedule(self, start: Optional[float] = None) -> "Schedule":
+        """Deadlines of a sequence, all measured from `start` (default now)."""
+        return Schedule(self, time.perf_counter() if start is None else start)
+
+    def count(self, event: str) -> None:
+        self._stats.incr(self.STATS_PREFIX + event)
+
+
+class Schedule:
+    """Offsets of a timed sequence waited on against one start time, so
+    the time spent between waits is absorbed instead of accumulating."""
+
+    def __init__(self, pacer: Pacer, start: float) -> None:
+        self.pacer: Pacer = pacer
+        self.start: float = start
+
+    def at(self, ms: float) -> float:
+        """Wait until `ms` after the start; how late it returned, in seconds."""
+        return self.pacer.wait_until(self.start + ms / 1000)
+
+    def elapsed(self) -> float:
+        """Milliseconds since the start."""
+        return (time.perf_counter() - self.start) * 1000
+
+
+global_pacer = Pacer()
+global_stats_manager.define_ratio(
+    Pacer.STATS_PREFIX + "on_time_ratio",
+    Pacer.STATS_PREFIX + "on_time",
+    Pacer.STATS_PREFIX + "late",
+)
+
+
+__all__ = [
+    "Pacer",
+    "Schedule",
+    "global_pacer",
+]
@@ -0,0 +1,69 @@
+import threading
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+
+class StatsManager:
+    """Process-wide named counters, reported with the run statistics."""
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, int] = {}
+        self._ratios: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def incr(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def get(self, key: str, default: int = 0) -> int:
+        return self._counters.get(key, default)
+
+    def ratio(self, part: str, *others: str) -> float:
+        """`part / (part + others...)`, 0.0 when nothing was counted."""
+        hits: int = self.get(part)
+        total: int = hits + sum(self.get(key) for key in others)
+        return hits / total if total else 0.0
+
+    def snapshot(self, prefix: str = "") -> Dict[str, int]:
+        with self._lock:
+            return {
+                key: value
+                for key, value in sorted(self._counters.items())
+                if key.startswith(prefix)
+            }
+
+    def define_ratio(self, name: str, part: str, *others: str) -> None:
+        """Report `ratio(part, *others)` as `name` once any of them is counted."""
+        self._ratios[name] = (part, others)
+
+    def report(
+        self, prefix: str = "", since: Optional[Mapping[str, int]] = None
+    ) -> Dict[str, Union[int, float]]:
+        """`snapshot` plus the defined ratios, rounded for logging.
+
+        With `since`, an earlier `snapshot()`, only what was counted after
+        it is reported, so the ratios describe that interval alone.
+        """
+        counters: Dict[str, int] = self.snapshot()
+        if since is not None:
+            counters = {
+                key: value - since.get(key, 0)
+                for key, value in counters.items()
+                if value != since.get(key, 0)
+            }
+        report: Dict[str, Union[int, float]] = {
+            key: value for key, value in counters.items() if key.startswith(prefix)
+        }
+        for name, (part, others) in sorted(self._ratios.items()):
+            if name.startswith(prefix) and any(k in counters for k in (part, *others)):
+                hits: int = counters.get(part, 0)
+                total: int = hits + sum(counters.get(key, 0) for key in others)
+                report[name] = round(hits / total if total else 0.0, 4)
+        return report
+
+    def reset(self, prefix: str = "") -> None:
+        with self._lock:
+            for key in [k for k in self._counters if k.startswith(prefix)]:
+                del self._counters[key]
+
+
+global_stats_manager = StatsManager()
@@ -1,11 +1,11 @@
 import subprocess
-import time
 from typing import Dict, List, Optional
 
 import pyautogui
 import pyperclip  # type: ignore[import-untyped]
 
 from .LogController import LogLevel
+from .PacingController import global_pacer
 from .Runner import SafeRunner
 
 
@@ -23,9 +23,10 @@ class SystemController:
                 return
             raise ValueError("Sleep duration must be non-negative")
 
+        # 按绝对截止时间等待, 不受系统定时器精度影响
         SafeRunner.run(
-            time.sleep,
-            (ms / 1000,),
+            global_pacer.sleep,
+            (ms,),
             debug=debug,
             ignore=ignore,
             # logger
@@ -0,0 +1,382 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from .StatsController import StatsManager, global_stats_manager
+
+_DERIVED_T = TypeVar("_DERIVED_T")
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, Template):
+        return value.nbytes
+    if isinstance(value, TemplateAtlas):
+        return int(value.kernels.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    return 0
+
+
+def _freeze(value: _DERIVED_T) -> _DERIVED_T:
+    # cached arrays are shared between jobs (and threads), never write to them
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            _freeze(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _freeze(v)
+    return value
+
+
+# colour spaces used by colour matching, converted from BGR
+COLOR_CODES: Dict[str, Optional[int]] = {
+    "bgr": None,
+    "hsv": cv2.COLOR_BGR2HSV,
+    "lab": cv2.COLOR_BGR2LAB,
+}
+
+
+def color_space(image: NDArray[np.uint8], space: str) -> NDArray[np.uint8]:
+    """BGR `image` converted to colour `space` (a key of `COLOR_CODES`)."""
+    code: Optional[int] = COLOR_CODES[space]
+    if code is None:
+        return image
+    return cast(NDArray[np.uint8], cv2.cvtColor(image, code))
+
+
+def _binary(image: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    return np.where(image >= 128, 255, 0).astype(np.uint8)
+
+
+@dataclass
+class Template:
+    """A decoded template with its preprocessed forms."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    gray: NDArray[np.uint8]
+    mean: float
+    std: float
+    derived: Dict[str, Any] = field(default_factory=dict)
+    nbytes: int = 0
+    scale: float = 1.0  # size relative to the template file
+    # stored entry a scaled template was derived from, its bytes are counted there
+    root: Optional["Template"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def width(self) -> int:
+        return int(self.gray.shape[1])
+
+    @property
+    def height(self) -> int:
+        return int(self.gray.shape[0])
+
+
+@dataclass
+class TemplateAtlas:
+    """Same-sized templates packed for matching in one pass.
+
+    Row `i` of `kernels` is template `labels[i]` flattened, zero-mean and
+    scaled to unit norm, so one matrix product of `kernels` with the image
+    windows correlates every template at once.
+    """
+
+    labels: List[str]
+    width: int
+    height: int
+    kernels: NDArray[np.float32]  # (len(labels), height * width)
+    key: Tuple[Tuple[str, str, int, int], ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+def _kernel(template: Template) -> NDArray[np.float32]:
+    values = template.gray.astype(np.float32).ravel()
+    values -= values.mean()
+    norm: float = float(np.linalg.norm(values))
+    # a flat template correlates with nothing
+    return values / norm if norm > 0 else values
+
+
+class TemplateStore:
+    """Process-wide LRU store of preprocessed templates.
+
+    A template is decoded once and kept with its grayscale form and any
+    derived forms (pyramids, statistics...) registered through `derive`.
+    Entries are invalidated when the file's mtime or size changes and the
+    least recently used ones are evicted once `budget` bytes are exceeded.
+    """
+
+    DEFAULT_BUDGET: int = 64 * 1024 * 1024
+    STATS_PREFIX: str = "template_cache."
+
+    def __init__(
+        self,
+        budget: int = DEFAULT_BUDGET,
+        stats: StatsManager = global_stats_manager,
+    ) -> None:
+        self.budget: int = budget
+        self.nbytes: int = 0
+        self._entries: "OrderedDict[str, Template]" = OrderedDict()
+        self._atlases: Dict[Tuple[Tuple[str, str], ...], TemplateAtlas] = {}
+        self._lock: threading.RLock = threading.RLock()
+        self._stats: StatsManager = stats
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, event: str) -> None:
+        self._stats.incr(self.STATS_PREFIX + event)
+
+    def set_budget(self, budget: int) -> None:
+        with self._lock:
+            self.budget = budget
+            self._evict()
+
+    def get(self, path: str) -> Optional[Template]:
+        """Return the template at `path`, or None if it cannot be read."""
+        key: str = os.path.abspath(path)
+        with self._lock:
+            try:
+                st = os.stat(key)
+            except OSError:
+                self._drop(key)
+                return None
+
+            entry: Optional[Template] = self._entries.get(key)
+            if entry is not None:
+                if entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                    self._entries.move_to_end(key)
+                    self._count("hits")
+                    return entry
+                self._drop(key)
+                self._count("invalidations")
+
+            self._count("misses")
+            image = cv2.imread(key)
+            if image is None:  # type: ignore[union-attr]
+                return None
+            gray = cast(NDArray[np.uint8], cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+            mean, std = cv2.meanStdDev(gray)
+            entry = Template(
+                path=key,
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                gray=_freeze(gray),
+                mean=float(mean[0][0]),
+                std=float(std[0][0]),
+                nbytes=int(gray.nbytes),
+            )
+            self._entries[key] = entry
+            self.nbytes += entry.nbytes
+            self._evict(keep=key)
+            return entry
+
+    def derive(
+        self,
+        template: Template,
+        name: str,
+        fnc: Callable[[Template], _DERIVED_T],
+    ) -> _DERIVED_T:
+        """Return the derived form `name` of `template`, computing it once."""
+        with self._lock:
+            if name in template.derived:
+                return template.derived[name]
+
+            value: _DERIVED_T = _freeze(fnc(template))
+            size: int = _nbytes(value)
+            template.derived[name] = value
+            template.nbytes += size
+            root: Template = template
+            if template.root is not None:
+                root = template.root
+                root.nbytes += size
+            if self._entries.get(root.path) is root:
+                self.nbytes += size
+                self._evict(keep=root.path)
+            return value
+
+    def mask(
+        self, template: Template, path: Optional[str] = None
+    ) -> Optional[NDArray[np.uint8]]:
+        """Binary matching mask (255 = matched pixel) of `template`.
+
+        Taken from the mask image at `path` if given, else from the alpha
+        channel of the template file; pixels at least half opaque/bright
+        are matched. None if the mask cannot be read or there is no alpha.
+        """
+        if path is not None:
+            source: Optional[Template] = self.get(path)
+            if source is None:
+                return None
+            # cached on the mask file's own entry, so edits to it are seen
+            return self.derive(source, "mask", lambda m: _binary(m.gray))
+
+        def alpha(t: Template) -> Optional[NDArray[np.uint8]]:
+            image = cv2.imread(t.path, cv2.IMREAD_UNCHANGED)
+            if image is None or image.ndim != 3 or image.shape[2] != 4:  # type: ignore[union-attr]
+                return None
+            return _binary(cast(NDArray[np.uint8], image[..., 3]))
+
+        return self.derive(template, "mask.alpha", alpha)
+
+    def color(self, template: Template, space: str) -> NDArray[np.uint8]:
+        """3-channel form of `template` in colour `space`, at its scale."""
+
+        def build(t: Template) -> NDArray[np.uint8]:
+            image = cv2.imread(t.path, cv2.IMREAD_COLOR)
+            if image is None:  # type: ignore[comparison-overlap]
+                raise FileNotFoundError(f"Cannot read template: {t.path}")
+            if image.shape[:2] != t.gray.shape:
+                image = cv2.resize(
+                    image,
+                    (t.width, t.height),
+                    interpolation=cv2.INTER_AREA if t.scale < 1 else cv2.INTER_LINEAR,
+                )
+            return color_space(cast(NDArray[np.uint8], image), space)
+
+        return self.derive(template, f"color.{space}", build)
+
+    def atlas(self, paths: Mapping[str, str]) -> Optional[TemplateAtlas]:
+        """Atlas of the templates in `paths` (label -> path), built once.
+
+        The atlas is rebuilt when any of the files changes. Returns None if
+        a template cannot be read, raises ValueError if their sizes differ.
+        """
+        templates: List[Tuple[str, Template]] = []
+        for label, path in paths.items():
+            template: Optional[Template] = self.get(path)
+            if template is None:
+                return None
+            templates.append((label, template))
+        if not templates:
+            raise ValueError("A template atlas needs at least one template.")
+
+        names = tuple((label, t.path) for label, t in templates)
+        key = tuple((label, t.path, t.mtime_ns, t.size) for label, t in templates)
+        with self._lock:
+            atlas: Optional[TemplateAtlas] = self._atlases.get(names)
+            if atlas is not None and atlas.key == key:
+                self._count("atlas_hits")
+                return atlas
+
+            height, width = templates[0][1].gray.shape
+            for label, t in templates:
+                if t.gray.shape != (height, width):
+                    raise ValueError(
+                        f"Atlas template {label!r} is {t.width}x{t.height}, "
+                        f"expected {width}x{height}: {t.path}"
+                    )
+            self._count("atlas_builds")
+            kernels = np.stack(
+                [self.derive(t, "kernel", _kernel) for _, t in templates]
+            )
+            atlas = TemplateAtlas(
+                labels=[label for label, _ in templates],
+                width=width,
+                height=height,
+                kernels=_freeze(kernels),
+                key=key,
+            )
+            self._atlases[names] = atlas
+            return atlas
+
+    def scaled(self, template: Template, scale: float) -> Template:
+        """`template` resized by `scale`, with its own derived forms.
+
+        The forms derived from it are counted in the budget of the stored
+        entry it was resized from, and evicted with that entry.
+        """
+        if scale == template.scale:
+            return template
+
+        def resize(t: Template) -> Template:
+            width: int = max(round(t.width * scale / t.scale), 1)
+            height: int = max(round(t.height * scale / t.scale), 1)
+            gray = cast(
+                NDArray[np.uint8],
+                cv2.resize(
+                    t.gray,
+                    (width, height),
+                    interpolation=(
+                        cv2.INTER_AREA if scale < t.scale else cv2.INTER_LINEAR
+                    ),
+                ),
+            )
+            mean, std = cv2.meanStdDev(gray)
+            return Template(
+                path=t.path,
+                mtime_ns=t.mtime_ns,
+                size=t.size,
+                gray=_freeze(gray),
+                mean=float(mean[0][0]),
+                std=float(std[0][0]),
+                nbytes=int(gray.nbytes),
+                scale=scale,
+                root=t.root if t.root is not None else t,
+            )
+
+        return self.derive(template, f"scale.{scale:g}", resize)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._atlases.clear()
+            self.nbytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        stats = {
+            key[len(self.STATS_PREFIX) :]: value
+            for key, value in self._stats.snapshot(self.STATS_PREFIX).items()
+        }
+        stats.update(entries=len(self._entries), bytes=self.nbytes, budget=self.budget)
+        return stats
+
+    def _drop(self, key: str) -> None:
+        entry: Optional[Template] = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry.nbytes
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        while self.nbytes > self.budget and self._entries:
+            key: str = next(iter(self._entries))
+            if key == keep:
+                # never evict the entry being handed out
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(key)
+                continue
+            self._drop(key)
+            self._count("evictions")
+
+
+global_template_store = TemplateStore()
+global_stats_manager.define_ratio(
+    TemplateStore.STATS_PREFIX + "hit_ratio",
+    TemplateStore.STATS_PREFIX + "hits",
+    TemplateStore.STATS_PREFIX + "misses",
+)
@@ -1,8 +1,37 @@
 from .CalculateController import CalculateController
 from .InputController import InputController
 from .LogController import Logger, LogLevel, LogManager, global_log_manager
+from .MatchController import (
+    AtlasMatch,
+    MatchController,
+    MatchGate,
+    MatchResult,
+    MatchTracker,
+    ScaleMemory,
+    global_match_gate,
+    global_match_tracker,
+    global_scale_memory,
+)
+from .OCRController import (
+    Glyph,
+    GlyphSet,
+    OCRCache,
+    OCRController,
+    OCRResult,
+    global_ocr_cache,
+)
+from .PacingController import Pacer, Schedule, global_pacer
 from .Runner import SafeRunner
+from .StatsController import StatsManager, global_stats_manager
 from .SystemController import SystemController
+from .TemplateController import (
+    COLOR_CODES,
+    Template,
+    TemplateAtlas,
+    TemplateStore,
+    color_space,
+    global_template_store,
+)
 
 __all__ = [
     "InputController",
@@ -12,6 +41,32 @@ __all__ = [
     "SystemController",
     "LogManager",
     "CalculateController",
+    "AtlasMatch",
+    "MatchController",
+    "Glyph",
+    "GlyphSet",
+    "OCRCache",
+    "OCRController",
+    "OCRResult",
+    "Pacer",
+    "Schedule",
+    "MatchGate",
+    "MatchResult",
+    "MatchTracker",
+    "ScaleMemory",
+    "StatsManager",
+    "Template",
+    "TemplateAtlas",
+    "TemplateStore",
+    "COLOR_CODES",
+    "color_space",
     # global instances
     "global_log_manager",
+    "global_match_gate",
+    "global_match_tracker",
+    "global_ocr_cache",
+    "global_pacer",
+    "global_scale_memory",
+    "global_stats_manager",
+    "global_template_store",
 ]
@@ -91,5 +91,6 @@ class DebugError(CrashException):
         self.message: str = message
 
 
+from .execs.input_crash import *
 from .execs.roi_crash import *
 from .execs.system_crash import *
@@ -0,0 +1,11 @@
+from typing import Optional
+
+from ....Models.main import Job
+from ..base import CrashException
+
+
+class DetachedInputCrash(CrashException):
+    def __init__(self, message: str, job: Optional[Job] = None):
+        super().__init__(message="Detached input error occurred: " + message, job=job)
+        self.job: Optional[Job] = job
+        self.message: str = message
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from ....Models.main import Job
+from ..base import IgnorableError
+
+
+class OCRError(IgnorableError):
+    def __init__(self, message: str, job: Optional[Job] = None):
+        super().__init__(message="OCR error occurred: " + message, job=job)
+        self.job: Optional[Job] = job
+
+
+class RecognitionError(OCRError):
+    def __init__(self, message: str, job: Optional[Job] = None):
+        super().__init__(message="Recognition error occurred: " + message, job=job)
+        self.job: Optional[Job] = job
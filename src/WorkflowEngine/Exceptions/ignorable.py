@@ -3,6 +3,7 @@ from typing import Optional
 from ...Models.main import Job
 from .base import IgnorableError
 from .execs.input import *
+from .execs.ocr import *
 from .execs.roi import *
 from .execs.system import *
 
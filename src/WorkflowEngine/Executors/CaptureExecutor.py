@@ -0,0 +1,147 @@
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.WorkflowEngine.Util.window_util import WindowUtil
+
+from ...Models.globals import Globals
+from ...Models.roi import ROI_Debug, ROI_Region, ROI_Window
+from ...Typehints.roi import WindowLocationDict
+from ..Capture import CaptureBackend, Region
+from ..Controller import LogLevel, global_log_manager
+from ..Exceptions.crash import (
+    DebugError,
+    IllegalWindowAreaError,
+    MultipleMatchedError,
+    WindowNotFoundError,
+)
+from ..executor import Executor, Job
+from ..Util.executor_works import get, update
+
+
+class CaptureExecutor(Executor):
+    """Base of the executors that read a screen region or window area
+    (ROI, OCR). Subclasses set `job`, `globals`, `use_vars` and `capture`."""
+
+    job: Job
+    globals: Globals
+    use_vars: Dict[str, Any]
+    capture: CaptureBackend
+
+    def _capture_screen(
+        self, region: Optional[ROI_Region], gray: bool
+    ) -> WindowLocationDict:
+        if region:
+            update(region, self.use_vars)
+        if not region:
+            return WindowLocationDict(left=0, top=0, mat=self.capture.grab(gray=gray))
+        cap: Region = (
+            int(region.x),
+            int(region.y),
+            int(region.width),
+            int(region.height),
+        )
+        return WindowLocationDict(
+            left=cap[0], top=cap[1], mat=self.capture.grab(cap, gray)
+        )
+
+    def _capture_window(
+        self, region: Optional[ROI_Region], window: ROI_Window, gray: bool
+    ) -> WindowLocationDict:
+        # 匹配条件
+        all_matched: List[int] = WindowUtil.find_window(
+            title=window.title,
+            class_name=window.class_name,
+            process=window.process,
+            bind=self.job.name,
+        )
+        if not all_matched:
+            raise WindowNotFoundError(
+                job=self.job,
+                message=f"Window not found with title: {window.title}, "
+                f"class_name: {window.class_name}, "
+                f"process: {window.process}",
+            )
+        if len(all_matched) > 1:
+            raise MultipleMatchedError(
+                job=self.job,
+                message=f"Multiple windows found with title: {window.title}, "
+                f"class_name: {window.class_name}, "
+                f"process: {window.process}",
+            )
+        matched: int = all_matched[0]
+        # 获取窗口坐标
+        rect = WindowUtil.get_window_rect(matched)
+        win_left, win_top, win_right, win_bottom = rect
+
+        # region
+        if region is None:
+            region = ROI_Region(
+                x=0,
+                y=0,
+                width=win_right - win_left,
+                height=win_bottom - win_top,
+            )
+        update(region, self.use_vars)
+        region_x: int = int(max(region.x, 0))
+        region_y: int = int(max(region.y, 0))
+        cap_x = win_left + region_x
+        cap_y = win_top + region_y
+        cap_width: int = int(min(region.width, win_right - cap_x))
+        cap_height: int = int(min(region.height, win_bottom - cap_y))
+        cap: Region = (cap_x, cap_y, cap_width, cap_height)
+
+        allow_out_of_screen: bool = get(window, "allow_out_of_screen", False)
+        screen_width, screen_height = self.capture.screen_size()
+        if (
+            cap_x + cap_width < 0
+            or cap_y + cap_height < 0
+            or cap_x > screen_width
+            or cap_y > screen_height
+            or (cap_width <= 0)
+            or (cap_height <= 0)
+        ):
+            if not allow_out_of_screen:
+                raise IllegalWindowAreaError(
+                    job=self.job,
+                    message=f"窗口区域无效: {cap}",
+                )
+            global_log_manager.log(
+                f"窗口区域无效: {cap}, 允许超出屏幕: {allow_out_of_screen}",
+                [LogLevel.WARNING],
+                debug=self.globals.debug,
+            )
+
+        screenshot = self.capture.grab_window(
+            matched,
+            cap,
+            (region_x, region_y),
+            allow_overlay=get(window, "allow_overlay", True),
+            gray=gray,
+        )
+        return WindowLocationDict(
+            left=win_left + region_x,
+            top=win_top + region_y,
+            mat=screenshot,
+        )
+
+    def _capture(
+        self,
+        region: Optional[ROI_Region],
+        window: Optional[ROI_Window],
+        gray: bool = False,
+    ) -> WindowLocationDict:
+        # 读取对象窗口参数
+        if window is None:
+            return self._capture_screen(region, gray)
+        else:
+            return self._capture_window(region, window, gray)
+
+    def _execute_debug(self, debug: ROI_Debug, *, mat: np.ndarray) -> None:
+        if debug.display_screenshot and not self.globals.debug:
+            raise DebugError(job=self.job, message="Debugging is disabled in globals.")
+
+        if debug.display_screenshot:
+            Image.fromarray(cv2.cvtColor(mat, cv2.COLOR_BGR2RGB)).show()
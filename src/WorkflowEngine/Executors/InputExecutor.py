@@ -1,4 +1,15 @@
-from typing import Any, Dict, Final, Literal, Optional, Set, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
 
 from src.WorkflowEngine.Exceptions.execs.roi_crash import (
     MultipleMatchedError,
@@ -6,12 +17,14 @@ from src.WorkflowEngine.Exceptions.execs.roi_crash import (
 )
 
 from ...Models.globals import Globals
-from ...Models.input import Input_Keyboard, Input_Mouse, Input_Text
+from ...Models.input import Input, Input_Keyboard, Input_Mouse, Input_Text
 from ...Typehints.structure import TaskReturnsDict
+from ..Capture import CaptureBackend
 from ..Controller import InputController
 from ..Exceptions.crash import ActionTypeError, MissingRequiredError
 from ..Exceptions.ignorable import MouseMovePositionError
 from ..executor import Executor, Job, JobExecutor
+from ..Input import EventBuffer, EventKind, InputBackend, global_input_dispatcher
 from ..Util.executor_works import update
 from ..Util.window_util import WindowUtil
 
@@ -24,11 +37,53 @@ AVAILABLE_MOUSE_BUTTONS: Final[Set[str]] = {
 
 @JobExecutor.register("Input")
 class InputExecutor(Executor):
+    invalidates_frames: bool = True
+
     def __init__(self, job: Job, globals: Globals) -> None:
         self.job: Job = job
         self.globals: Globals = globals
         self.use_vars: Dict[str, Any] = {}
 
+    @property
+    def backend(self) -> Optional[InputBackend]:
+        """Backend receiving compiled events, None for direct input."""
+        if self.globals.input.backend == "direct":
+            return None
+        return InputBackend.shared(self.globals.input)
+
+    def __buffer(self) -> EventBuffer:
+        return EventBuffer(self.globals.input.move_interval)
+
+    def __position(self) -> Tuple[int, int]:
+        # 光标位置取决于尚未发送完的输入
+        global_input_dispatcher.join()
+        backend = self.backend
+        if backend is None:
+            return InputController.get_mouse_position()
+        return backend.cursor()
+
+    def __key_codes(self, keys: List[str]) -> List[int]:
+        codes: List[int] = []
+        for key in keys:
+            code = InputController._key_to_vk_code(key)
+            if code is None:
+                raise ActionTypeError(f"Unsupported key: {key}", self.job)
+            codes.append(code)
+        return codes
+
+    def __run(self, fnc: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """Send now, or on the input thread for a detached job."""
+        if not cast(Input, self.job.input).detach:
+            global_input_dispatcher.join()
+            fnc(*args, **kwargs)
+            return
+        future = global_input_dispatcher.submit(self.job, fnc, *args, **kwargs)
+        # 输入完成后画面可能已变化
+        future.add_done_callback(lambda _: CaptureBackend.invalidate_shared())
+
+    def __send(self, buffer: EventBuffer, hWnd: Optional[int]) -> None:
+        self.__run(cast(InputBackend, self.backend).dispatch, buffer.events(), hWnd)
+
     def execute_TextInput(
         self,
         text: Input_Text,
@@ -38,13 +93,17 @@ class InputExecutor(Executor):
         message = text.message
         duration = text.duration
 
-        InputController.typewrite(
-            message,
-            duration=duration,
-            debug=self.globals.model_dump().get("debug", False),
-            ignore=self.globals.ignore,
-            hWnd=hWnd,
-        )
+        if self.backend is not None:
+            self.__send(self.__buffer().text(message, duration), hWnd)
+        else:
+            self.__run(
+                InputController.typewrite,
+                message,
+                duration=duration,
+                debug=self.globals.model_dump().get("debug", False),
+                ignore=self.globals.ignore,
+                hWnd=hWnd,
+            )
         return TaskReturnsDict(
             returns=cast(Dict[str, str], text.returns),
             variables={"message": message, "duration": duration},
@@ -66,13 +125,19 @@ class InputExecutor(Executor):
                 self.job,
             )
         mt = mouse.type
-        InputController.mouse_event(
-            cast(Literal["Press", "Release"], mt),
-            button=button,
-            duration=duration,
-            hWnd=hWnd,
-            debug=self.globals.debug,
-        )
+        if self.backend is not None:
+            kind = EventKind.BUTTON_DOWN if mt == "Press" else EventKind.BUTTON_UP
+            buffer = self.__buffer().wait(duration)
+            self.__send(buffer.button(kind, button, *self.__position()), hWnd)
+        else:
+            self.__run(
+                InputController.mouse_event,
+                cast(Literal["Press", "Release"], mt),
+                button=button,
+                duration=duration,
+                hWnd=hWnd,
+                debug=self.globals.debug,
+            )
         return TaskReturnsDict(
             returns=cast(Dict[str, str], mouse.returns),
             variables={"button": button, "type": mt, "duration": duration},
@@ -96,19 +161,23 @@ class InputExecutor(Executor):
                 f"Unsupported mouse button: {button}. Available: {AVAILABLE_MOUSE_BUTTONS}",
                 self.job,
             )
-        cur_pos = InputController.get_mouse_position()
+        cur_pos = self.__position()
         if relative:
             x += cur_pos[0]
             y += cur_pos[1]
 
-        InputController.mouse_move_to(
-            x,
-            y,
-            duration=duration,
-            hWnd=hWnd,
-            debug=self.globals.debug,
-            ignore=self.globals.ignore,
-        )
+        if self.backend is not None:
+            self.__send(self.__buffer().move(cur_pos, x, y, duration), hWnd)
+        else:
+            self.__run(
+                InputController.mouse_move_to,
+                x,
+                y,
+                duration=duration,
+                hWnd=hWnd,
+                debug=self.globals.debug,
+                ignore=self.globals.ignore,
+            )
 
         return TaskReturnsDict(
             returns=cast(Dict[str, str], mouse.returns),
@@ -139,20 +208,24 @@ class InputExecutor(Executor):
                 f"Unsupported mouse button: {button}. Available: {AVAILABLE_MOUSE_BUTTONS}",
                 self.job,
             )
-        cur_pos = InputController.get_mouse_position()
+        cur_pos = self.__position()
         if relative:
             x += cur_pos[0]
             y += cur_pos[1]
 
-        InputController.mouse_drag_to(
-            button=button,
-            x=x,
-            y=y,
-            duration=duration,
-            hWnd=hWnd,
-            debug=self.globals.debug,
-            ignore=self.globals.ignore,
-        )
+        if self.backend is not None:
+            self.__send(self.__buffer().drag(button, cur_pos, x, y, duration), hWnd)
+        else:
+            self.__run(
+                InputController.mouse_drag_to,
+                button=button,
+                x=x,
+                y=y,
+                duration=duration,
+                hWnd=hWnd,
+                debug=self.globals.debug,
+                ignore=self.globals.ignore,
+            )
         return TaskReturnsDict(
             returns=cast(Dict[str, str], mouse.returns),
             variables={
@@ -169,7 +242,7 @@ class InputExecutor(Executor):
         self, mouse: Input_Mouse, hWnd: Optional[int]
     ) -> TaskReturnsDict[str]:
         update(mouse, self.use_vars)
-        cur_x, cur_y = InputController.get_mouse_position()
+        cur_x, cur_y = self.__position()
         x: int = mouse.x
         y: int = mouse.y
         if not x and not y:
@@ -189,15 +262,20 @@ class InputExecutor(Executor):
                 self.job,
             )
 
-        InputController.mouse_click_at(
-            button=button,
-            x=x,
-            y=y,
-            duration=duration,
-            hWnd=hWnd,
-            debug=self.globals.debug,
-            ignore=self.globals.ignore,
-        )
+        if self.backend is not None:
+            buffer = self.__buffer().click(button, (cur_x, cur_y), x, y, duration)
+            self.__send(buffer, hWnd)
+        else:
+            self.__run(
+                InputController.mouse_click_at,
+                button=button,
+                x=x,
+                y=y,
+                duration=duration,
+                hWnd=hWnd,
+                debug=self.globals.debug,
+                ignore=self.globals.ignore,
+            )
         return TaskReturnsDict(
             returns=cast(Dict[str, str], mouse.returns),
             variables={
@@ -235,8 +313,11 @@ class InputExecutor(Executor):
             raise ActionTypeError(f"Unsupported keyboard action type: {tp}", self.job)
 
         keys = keyboard.keys
+        if self.backend is not None:
+            return self.__compile_keyboard(keyboard, hWnd)
         if tp == "Press":
-            InputController.keyboard_press(
+            self.__run(
+                InputController.keyboard_press,
                 keys,
                 hWnd=hWnd,
                 debug=self.globals.debug,
@@ -247,7 +328,8 @@ class InputExecutor(Executor):
                 result=f"Keyboard pressed: {keyboard.keys}",
             )
         elif tp == "Release":
-            InputController.keyboard_release(
+            self.__run(
+                InputController.keyboard_release,
                 keys,
                 hWnd=hWnd,
                 debug=self.globals.debug,
@@ -261,7 +343,8 @@ class InputExecutor(Executor):
         duration = keyboard.duration
         sep_time = keyboard.sep_time
 
-        InputController.keyboard_press_and_release(
+        self.__run(
+            InputController.keyboard_press_and_release,
             keys,
             duration=duration,
             sep_time=sep_time,
@@ -274,6 +357,32 @@ class InputExecutor(Executor):
             result=f"Keyboard typed: {keys} with duration {duration} ms",
         )
 
+    def __compile_keyboard(
+        self, keyboard: Input_Keyboard, hWnd: Optional[int]
+    ) -> TaskReturnsDict[str]:
+        tp = keyboard.type
+        keys = keyboard.keys
+        codes = self.__key_codes(keys)
+        buffer = self.__buffer()
+        variables: Dict[str, Any] = {"keys": keys, "type": tp}
+        if tp == "Press":
+            buffer.keys_down(codes)
+            result = f"Keyboard pressed: {keys}"
+        elif tp == "Release":
+            buffer.keys_up(codes)
+            result = f"Keyboard released: {keys}"
+        else:
+            buffer.keys_down(codes, keyboard.sep_time).wait(keyboard.duration)
+            buffer.keys_up(reversed(codes), keyboard.sep_time)
+            variables["duration"] = keyboard.duration
+            result = f"Keyboard typed: {keys} with duration {keyboard.duration} ms"
+        self.__send(buffer, hWnd)
+        return TaskReturnsDict(
+            returns=cast(Dict[str, str], keyboard.returns),
+            variables=variables,
+            result=result,
+        )
+
     def execute(self, *args: Any, **kwargs: Any) -> TaskReturnsDict[str]:
         self.use_vars.update(kwargs)
         inp = self.job.input
@@ -292,6 +401,7 @@ class InputExecutor(Executor):
                 process=inp.process,
                 exact=inp.exact_match,
                 visible_only=inp.visible_only,
+                bind=self.job.name,
             )
             if not hWnds:
                 raise WindowNotFoundError(
@@ -311,6 +421,8 @@ class InputExecutor(Executor):
                     "Window handle is required when focus is True.", self.job
                 )
 
+            # 切换焦点前先发送完之前的输入
+            global_input_dispatcher.join()
             WindowUtil.focus_window_by_handle(hWnd)
 
         hWnd = hWnd if background else None
@@ -1,20 +1,149 @@
-from typing import Any, Dict
+import re
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
 
 from ...Models.globals import Globals
+from ...Models.ocr import OCR
+from ...Typehints.roi import WindowLocationDict
 from ...Typehints.structure import TaskReturnsDict
-from ..executor import Executor, Job, JobExecutor
+from ..Capture import CaptureBackend, to_gray
+from ..Controller import (
+    GlyphSet,
+    LogLevel,
+    MatchController,
+    OCRController,
+    OCRResult,
+    global_log_manager,
+    global_ocr_cache,
+)
+from ..Exceptions.crash import MissingRequiredError, TemplateError
+from ..Exceptions.ignorable import RecognitionError
+from ..executor import Job, JobExecutor
+from ..Util.executor_works import update
+from .CaptureExecutor import CaptureExecutor
 
+NUMBER = re.compile(r"[-+]?(\d+\.?\d*|\.\d+)")
+
+
+def parse_number(text: str) -> Optional[Union[int, float]]:
+    """Number written in `text` (spaces and thousands separators ignored)."""
+    compact: str = re.sub(r"[\s,]", "", text)
+    if not NUMBER.fullmatch(compact):
+        return None
+    value = float(compact)
+    return int(value) if value.is_integer() and "." not in compact else value
 
-@JobExecutor.register("OCR")
-class OCRExecutor(Executor):
 
+@JobExecutor.register("OCR")
+class OCRExecutor(CaptureExecutor):
     def __init__(self, job: Job, globals: Globals) -> None:
         self.job: Job = job
         self.globals: Globals = globals
         self.use_vars: Dict[str, Any] = {}
+        self.capture: CaptureBackend = CaptureBackend.shared(globals.capture)
+
+    def __glyph_set(self, ocr: OCR) -> GlyphSet:
+        try:
+            return OCRController.glyph_set(ocr.glyphs)
+        except (OSError, ValueError, KeyError) as e:
+            raise TemplateError(
+                job=self.job,
+                message=f"Cannot load glyph set '{ocr.glyphs}': {e}",
+            ) from e
+
+    def __read(self, ocr: OCR, glyphs: GlyphSet, gray: np.ndarray) -> OCRResult:
+        def read() -> OCRResult:
+            try:
+                return OCRController.read(
+                    gray,
+                    glyphs,
+                    confidence=ocr.confidence,
+                    polarity=ocr.polarity,
+                    threshold=ocr.threshold,
+                    whitelist=ocr.whitelist,
+                    space=ocr.space,
+                    unknown=ocr.unknown,
+                )
+            except (OSError, ValueError) as e:
+                raise TemplateError(job=self.job, message=str(e)) from e
+
+        if not ocr.cache.ttl or not ocr.cache.size:
+            return read()
+
+        # 区域像素, 字形集与识别参数都相同时结果必然相同
+        key = (
+            MatchController.fingerprint(gray),
+            glyphs.directory,
+            glyphs.mtime_ns,
+            ocr.confidence,
+            ocr.polarity,
+            ocr.threshold,
+            ocr.whitelist,
+            ocr.space,
+            ocr.unknown,
+        )
+        cached: Optional[OCRResult] = global_ocr_cache.get(
+            self.job.name, key, ocr.cache.ttl / 1000
+        )
+        if cached is not None:
+            return cached
+        result: OCRResult = read()
+        global_ocr_cache.put(self.job.name, key, result, ocr.cache.size)
+        return result
+
+    def __variables(
+        self, result: OCRResult, offset_x: int, offset_y: int
+    ) -> Dict[str, Any]:
+        left, top, width, height = result.box
+        return {
+            "text": result.text,
+            "number": parse_number(result.text),
+            "confidence": result.confidence,
+            "count": len(result.glyphs),
+            "left": left + offset_x,
+            "top": top + offset_y,
+            "width": width,
+            "height": height,
+            "center_x": left + offset_x + width // 2,
+            "center_y": top + offset_y + height // 2,
+        }
+
+    def main(self, ocr: OCR) -> TaskReturnsDict[str]:
+        update(ocr, self.use_vars)
+        glyphs: GlyphSet = self.__glyph_set(ocr)
+
+        # 仅在需要显示截图时获取彩色图
+        color: bool = ocr.debug.display_screenshot
+        wld: WindowLocationDict = self._capture(ocr.region, ocr.window, gray=not color)
+        mat = wld["mat"]
+        self._execute_debug(ocr.debug, mat=mat)
+
+        result: OCRResult = self.__read(ocr, glyphs, to_gray(mat) if color else mat)
+
+        if not result.text:
+            raise RecognitionError(job=self.job, message="No text found in region")
+        if ocr.pattern is not None and not re.fullmatch(ocr.pattern, result.text):
+            raise RecognitionError(
+                job=self.job,
+                message=f"Text {result.text!r} does not match {ocr.pattern!r}",
+            )
+
+        var_s: Dict[str, Any] = self.__variables(result, wld["left"], wld["top"])
+        global_log_manager.log(
+            f"OCR read {result.text!r} with confidence {result.confidence:.3f}",
+            [LogLevel.DEBUG],
+            debug=self.globals.debug,
+        )
+        return TaskReturnsDict(
+            returns=dict(ocr.returns),
+            variables=var_s,
+            result=f"Read {result.text!r}",
+        )
 
     def execute(self, *args: Any, **kwargs: Any) -> TaskReturnsDict[str]:
         self.use_vars.update(kwargs)
-        # Simulate OCR processing
-        raise NotImplementedError("OCR processing is not implemented yet.")
-        return f"Processed OCR: {self.job['description']}"
+        ocr: Optional[OCR] = self.job.ocr
+        if ocr is None:
+            raise MissingRequiredError("No OCR found in the job to execute.", self.job)
+        return self.main(ocr)
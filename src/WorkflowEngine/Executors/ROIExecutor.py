@@ -1,228 +1,476 @@
-from typing import Any, Dict, List, Optional, TypeAlias, cast
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, cast
 
-import cv2
 import numpy as np
-import pyautogui
-import win32con
-import win32gui
-import win32ui
-from PIL import Image
-
-from src.WorkflowEngine.Util.window_util import WindowUtil
 
 from ...Models.globals import Globals
-from ...Models.roi import ROI, ROI_Image, ROI_Region, ROI_Window
+from ...Models.roi import (
+    ROI,
+    ROI_ColorSpace,
+    ROI_Image,
+    ROI_Template,
+    ROI_Wait,
+)
 from ...Typehints.roi import WindowLocationDict
 from ...Typehints.structure import TaskReturnsDict
-from ..Controller import InputController, LogLevel, global_log_manager
+from ..Capture import CaptureBackend, to_gray
+from ..Controller import (
+    InputController,
+    LogLevel,
+    MatchController,
+    MatchResult,
+    Template,
+    color_space,
+    global_log_manager,
+    global_stats_manager,
+    global_template_store,
+)
+from ..Controller.MatchController import Fingerprint
 from ..Exceptions.crash import (
     ActionTypeError,
-    DebugError,
-    IllegalWindowAreaError,
     MissingRequiredError,
-    MultipleMatchedError,
     RegionError,
     TemplateError,
-    WindowNotFoundError,
 )
 from ..Exceptions.ignorable import MatchingError
-from ..executor import Executor, Job, JobExecutor
-from ..Util.executor_works import get, update
-
-PILImage: TypeAlias = Image.Image
+from ..executor import Job, JobExecutor
+from ..Input import global_input_dispatcher
+from ..Util.executor_works import update
+from .CaptureExecutor import CaptureExecutor
 
 
 @JobExecutor.register("ROI")
-class ROIExecutor(Executor):
+class ROIExecutor(CaptureExecutor):
     def __init__(self, job: Job, globals: Globals) -> None:
         self.job: Job = job
         self.globals: Globals = globals
         self.use_vars: Dict[str, Any] = {}
+        self.capture: CaptureBackend = CaptureBackend.shared(globals.capture)
+        self.fingerprint: Optional[Fingerprint] = None
+        # 彩色匹配用的整帧, 以色彩空间为键
+        self.frames: Dict[str, np.ndarray] = {}
 
-    def __capture_screen(self, roi: ROI) -> WindowLocationDict:
-        region: Optional[ROI_Region] = roi.region
-        if region:
-            update(region, self.use_vars)
-        if not region:
-            return WindowLocationDict(
-                left=0,
-                top=0,
-                mat=pyautogui.screenshot(),
-            )
-        cap_x: int = int(region.x)
-        cap_y: int = int(region.y)
-        cap_width: int = int(region.width)
-        cap_height: int = int(region.height)
-
-        return WindowLocationDict(
-            left=cap_x,
-            top=cap_y,
-            mat=pyautogui.screenshot(region=(cap_x, cap_y, cap_width, cap_height)),
+    def __fingerprint(self, mat_gray: np.ndarray) -> Fingerprint:
+        if self.fingerprint is None:
+            # 彩色帧可区分灰度相同的颜色变化
+            frame: np.ndarray = self.frames.get("bgr", mat_gray)
+            self.fingerprint = MatchController.fingerprint(frame)
+        return self.fingerprint
+
+    def __accept(
+        self,
+        image: ROI_Image,
+        scaled: Template,
+        mask: Optional[np.ndarray],
+        found: MatchResult,
+    ) -> bool:
+        """Mean-colour check of a hit, see `ROI_Image.color_tolerance`."""
+        if image.color_tolerance is None:
+            return True
+        distance: float = MatchController.color_distance(
+            self.frames["bgr"],
+            global_template_store.color(scaled, "bgr"),
+            found,
+            mask,
         )
+        if distance <= image.color_tolerance:
+            return True
+        global_stats_manager.incr("match.color.rejected")
+        global_log_manager.log(
+            f"Match of {image.path} at ({found.x}, {found.y}) rejected, "
+            f"mean colour differs by {distance:.1f} > {image.color_tolerance}",
+            [LogLevel.DEBUG],
+            debug=self.globals.debug,
+        )
+        return False
+
+    def __match(
+        self,
+        image: ROI_Image,
+        mat_gray: np.ndarray,
+        template: Template,
+        origin: Tuple[int, int],
+    ) -> Tuple[MatchResult, Template]:
+        """Best match of `template`, with the (resized) template it was found with."""
+        mask: Optional[np.ndarray] = self.__load_mask(image, template)
 
-    def __capture_window(self, roi: ROI, window: ROI_Window) -> WindowLocationDict:
-        # 匹配条件
-        all_matched: List[int] = WindowUtil.find_window(
-            title=window.title,
-            class_name=window.class_name,
-            process=window.process,
+        def planes(scaled: Template) -> Tuple[np.ndarray, np.ndarray]:
+            if image.color == "gray":
+                return mat_gray, scaled.gray
+            # 彩色匹配: 三通道联合计算相关系数
+            return self.frames[image.color], global_template_store.color(
+                scaled, image.color
+            )
+
+        def search(scaled: Template) -> MatchResult:
+            scaled_mask = MatchController.resize_mask(mask, scaled.gray)
+            if image.strategy == "pyramid" and image.color == "gray":
+                found = MatchController.pyramid(
+                    mat_gray,
+                    scaled,
+                    image.confidence,
+                    levels=image.pyramid.levels,
+                    candidates=image.pyramid.candidates,
+                    mask=scaled_mask,
+                    tiles=image.tiles,
+                )
+            else:
+                frame, plane = planes(scaled)
+                found = MatchController.exact(frame, plane, scaled_mask, image.tiles)
+            if found.score >= image.confidence and not self.__accept(
+                image, scaled, scaled_mask, found
+            ):
+                return MatchResult(-1.0, found.x, found.y)
+            return found
+
+        def track(scaled: Template) -> MatchResult:
+            if not image.track:
+                return search(scaled)
+            # 优先在上次命中位置附近搜索
+            scaled_mask = MatchController.resize_mask(mask, scaled.gray)
+            frame, plane = planes(scaled)
+            return MatchController.tracked(
+                frame,
+                plane,
+                image.confidence,
+                lambda: search(scaled),
+                key=(self.job.name, template.path),
+                origin=origin,
+                padding=image.track_padding,
+                mask=scaled_mask,
+                accept=lambda hit: self.__accept(image, scaled, scaled_mask, hit),
+            )
+
+        used: List[Template] = [template]
+
+        def scan() -> MatchResult:
+            if not image.scales:
+                return track(template)
+            # 多尺度: 优先尝试上次命中的缩放比例
+            found, used[0] = MatchController.multi_scale(
+                mat_gray, template, image.confidence, image.scales, track
+            )
+            return found
+
+        if not image.gate:
+            return scan(), used[0]
+        # 画面未变化时直接沿用上次的失败结果
+        found: MatchResult = MatchController.gated(
+            self.__fingerprint(mat_gray),
+            image.confidence,
+            scan,
+            key=(self.job.name, template.path, template.mtime_ns),
         )
-        if not all_matched:
-            raise WindowNotFoundError(
+        return found, used[0]
+
+    def __load_template(self, image: ROI_Image, mat_gray: np.ndarray) -> Template:
+        update(image, self.use_vars)
+        template: Optional[Template] = global_template_store.get(image.path)
+        if template is None:
+            raise TemplateError(
                 job=self.job,
-                message=f"Window not found with title: {window.title}, "
-                f"class_name: {window.class_name}, "
-                f"process: {window.process}",
+                message=f"Template image not found at path: {image.path}",
             )
-        if len(all_matched) > 1:
-            raise MultipleMatchedError(
+        if mat_gray.shape[0] < template.height or mat_gray.shape[1] < template.width:
+            raise RegionError(
                 job=self.job,
-                message=f"Multiple windows found with title: {window.title}, "
-                f"class_name: {window.class_name}, "
-                f"process: {window.process}",
+                message="ROI region is smaller than the template image, cannot match.",
             )
-        matched: int = all_matched[0]
-        # 获取窗口坐标
-        rect = win32gui.GetWindowRect(matched)
-        win_left, win_top, win_right, win_bottom = rect
-
-        # region
-        region: Optional[ROI_Region] = roi.region
-        if region is None:
-            region = ROI_Region(
-                x=0,
-                y=0,
-                width=win_right - win_left,
-                height=win_bottom - win_top,
+        return template
+
+    def __load_mask(self, image: ROI_Image, template: Template) -> Optional[np.ndarray]:
+        if image.mask is None and not image.alpha:
+            return None
+        mask: Optional[np.ndarray] = global_template_store.mask(template, image.mask)
+        if mask is None:
+            raise TemplateError(
+                job=self.job,
+                message=(
+                    f"Mask image not found at path: {image.mask}"
+                    if image.mask is not None
+                    else f"Template image has no alpha channel: {image.path}"
+                ),
             )
-        update(region, self.use_vars)
-        region_x: int = int(max(region.x, 0))
-        region_y: int = int(max(region.y, 0))
-        cap_x = win_left + region_x
-        cap_y = win_top + region_y
-        cap_width: int = int(min(region.width, win_right - cap_x))
-        cap_height: int = int(min(region.height, win_bottom - cap_y))
-        cap = (cap_x, cap_y, cap_width, cap_height)
-
-        allow_out_of_screen: bool = get(window, "allow_out_of_screen", False)
-        screen_size = pyautogui.size()
-        if (
-            cap_x + cap_width < 0
-            or cap_y + cap_height < 0
-            or cap_x > screen_size.width
-            or cap_y > screen_size.height
-            or (cap_width <= 0)
-            or (cap_height <= 0)
-        ):
-            if not allow_out_of_screen:
-                raise IllegalWindowAreaError(
-                    job=self.job,
-                    message=f"窗口区域无效: {cap}",
-                )
-            global_log_manager.log(
-                f"窗口区域无效: {cap}, 允许超出屏幕: {allow_out_of_screen}",
-                [LogLevel.WARNING],
-                debug=self.globals.debug,
+        if mask.shape != template.gray.shape:
+            raise TemplateError(
+                job=self.job,
+                message=f"Mask size {mask.shape[::-1]} does not match "
+                f"template size {template.gray.shape[::-1]}",
             )
+        return mask
 
-        if get(window, "allow_overlay", True):
-            screenshot: Image.Image = pyautogui.screenshot(region=cap)
-        else:
-            hWndDC = win32gui.GetWindowDC(matched)
-            mfcDC = win32ui.CreateDCFromHandle(hWndDC)
-            saveDC = mfcDC.CreateCompatibleDC()
-            saveBitMap = win32ui.CreateBitmap()
-            saveBitMap.CreateCompatibleBitmap(mfcDC, cap_width, cap_height)
-            saveDC.SelectObject(saveBitMap)
-            saveDC.BitBlt(
-                (0, 0),
-                (cap_width, cap_height),
-                mfcDC,
-                (region_x, region_y),
-                win32con.SRCCOPY,
+    @staticmethod
+    def __variables(
+        matched: MatchResult, template: Template, offset_x: int, offset_y: int
+    ) -> Dict[str, Any]:
+        left: int = matched.x + offset_x
+        top: int = matched.y + offset_y
+        return {
+            "center_x": left + template.width // 2,
+            "center_y": top + template.height // 2,
+            "confidence": matched.score,
+            "left": left,
+            "top": top,
+            "right": left + template.width,
+            "bottom": top + template.height,
+            "width": template.width,
+            "height": template.height,
+            "template_height": template.height,
+            "template_width": template.width,
+            "scale": template.scale,
+        }
+
+    def __match_templates(
+        self, roi: ROI, mat_gray: np.ndarray, offset_x: int, offset_y: int
+    ) -> Dict[str, Any]:
+        """Match every `roi.templates` entry against one frame.
+
+        Variables of each template are prefixed with its name and carry a
+        `matched` flag; the first matched template (in declaration order)
+        also fills the unprefixed variables.
+        """
+        templates: List[ROI_Template] = roi.templates
+        loaded: List[Template] = [
+            self.__load_template(entry, mat_gray) for entry in templates
+        ]
+        matches: List[Tuple[MatchResult, Template]] = MatchController.map(
+            lambda i: self.__match(
+                templates[i], mat_gray, loaded[i], (offset_x, offset_y)
+            ),
+            range(len(templates)),
+            parallel=roi.parallel,
+        )
+        results: List[MatchResult] = [found for found, _ in matches]
+
+        var_s: Dict[str, Any] = {}
+        chosen: str = ""
+        count: int = 0
+        for entry, (found, template) in zip(templates, matches):
+            hit: bool = found.score >= entry.confidence
+            variables = self.__variables(found, template, offset_x, offset_y)
+            if not hit:
+                variables = {key: None for key in variables}
+                variables["confidence"] = found.score
+            variables["matched"] = hit
+            var_s.update(
+                {f"{entry.name}.{key}": value for key, value in variables.items()}
             )
+            if hit:
+                count += 1
+                if not chosen:
+                    chosen = entry.name
+                    var_s.update(variables)
 
-            bmpinfo = saveBitMap.GetInfo()  # type: ignore[reportUnknownMemberType]
-            bmpstr = saveBitMap.GetBitmapBits(True)
-            screenshot = Image.frombuffer(
-                "RGB",
-                (bmpinfo["bmWidth"], bmpinfo["bmHeight"]),  # type: ignore[reportUnknownArgumentType]
-                bmpstr,
-                "raw",
-                "BGRX",
-                0,
-                1,
+        if not chosen:
+            raise MatchingError(
+                job=self.job,
+                message="No template matched in region: "
+                + ", ".join(
+                    f"{entry.name}({found.score:.3f} < {entry.confidence})"
+                    for entry, found in zip(templates, results)
+                ),
             )
-        return WindowLocationDict(
-            left=win_left + region_x,
-            top=win_top + region_y,
-            mat=screenshot,
-        )
+        var_s.update(matched=chosen, matched_count=count)
+        return var_s
 
-    def __capture(self, roi: ROI) -> WindowLocationDict:
-        # 读取对象窗口参数
-        window: Optional[ROI_Window] = roi.window
-        if window is None:
-            return self.__capture_screen(roi)
-        else:
-            return self.__capture_window(roi, window)
+    def __find_all(
+        self,
+        roi: ROI,
+        image: ROI_Image,
+        mat_gray: np.ndarray,
+        template: Template,
+        offset_x: int,
+        offset_y: int,
+    ) -> Dict[str, Any]:
+        mask: Optional[np.ndarray] = self.__load_mask(image, template)
+        frame, plane = mat_gray, template.gray
+        if image.color != "gray":
+            frame = self.frames[image.color]
+            plane = global_template_store.color(template, image.color)
+        found: List[MatchResult] = [
+            m
+            for m in MatchController.find_all(
+                frame,
+                plane,
+                image.confidence,
+                max_results=roi.find_all.max_results,
+                overlap=roi.find_all.overlap,
+                mask=mask,
+                tiles=image.tiles,
+            )
+            if self.__accept(image, template, mask, m)
+        ]
+        if not found:
+            raise MatchingError(
+                job=self.job,
+                message=f"No match found in region with confidence >= {image.confidence}",
+            )
+        all_vars = [self.__variables(m, template, offset_x, offset_y) for m in found]
 
-    def __execute_debug(self, roi: ROI, *, mat: PILImage) -> None:
-        if roi.debug and not self.globals.debug:
-            raise DebugError(job=self.job, message="Debugging is disabled in globals.")
+        # 最优匹配填充单值变量, 列表按置信度降序
+        var_s: Dict[str, Any] = dict(all_vars[0])
+        var_s.update(
+            count=len(found),
+            lefts=[v["left"] for v in all_vars],
+            tops=[v["top"] for v in all_vars],
+            centers_x=[v["center_x"] for v in all_vars],
+            centers_y=[v["center_y"] for v in all_vars],
+            confidences=[v["confidence"] for v in all_vars],
+        )
+        return var_s
 
-        if roi.debug.display_screenshot:
-            mat.show()
+    @staticmethod
+    def __color_spaces(roi: ROI) -> Set[ROI_ColorSpace]:
+        """Colour spaces the ROI images match or verify in."""
+        images: Sequence[ROI_Image] = roi.templates or (
+            [roi.image] if roi.image else []
+        )
+        spaces: Set[ROI_ColorSpace] = {image.color for image in images} - {"gray"}
+        if any(image.color_tolerance is not None for image in images):
+            spaces.add("bgr")
+        return spaces
 
-    def main(self, roi: ROI) -> TaskReturnsDict[str]:
-        update(roi, self.use_vars)
-        wld: WindowLocationDict = self.__capture(roi)
-        mat = cv2.cvtColor(np.array(wld["mat"]), cv2.COLOR_RGB2BGR)
+    def __frame(self, roi: ROI, show: bool = True) -> Tuple[np.ndarray, int, int]:
+        """Capture the ROI, returns the grayscale image and its screen offset.
+
+        Colour matching needs the colour frame, converted once into every
+        space the ROI images use and kept in `self.frames`.
+        """
+        spaces: Set[ROI_ColorSpace] = self.__color_spaces(roi)
+        # 仅在需要显示截图或彩色匹配时获取彩色图
+        color: bool = roi.debug.display_screenshot or bool(spaces)
+        wld: WindowLocationDict = self._capture(roi.region, roi.window, gray=not color)
+        mat = wld["mat"]
 
         # debug
-        self.__execute_debug(roi, mat=wld["mat"])
+        if show:
+            self._execute_debug(roi.debug, mat=mat)
 
-        # 目标偏移量
-        offset_x: int = wld["left"]
-        offset_y: int = wld["top"]
+        self.fingerprint = None
+        self.frames = {space: color_space(mat, space) for space in spaces}
+        if spaces:
+            self.frames["bgr"] = mat
+        return (to_gray(mat) if color else mat), wld["left"], wld["top"]
 
-        # 读取模板图
-        image: ROI_Image = roi.image
-        update(image, self.use_vars)
-        template_path: str = image.path
-        confidence: float = image.confidence
-        template = cv2.imread(template_path)
-        if template is None:  # type: ignore[union-attr]
-            raise TemplateError(
-                job=self.job,
-                message=f"Template image not found at path: {template_path}",
-            )
-        if mat.shape[0] < template.shape[0] or mat.shape[1] < template.shape[1]:
-            raise RegionError(
-                job=self.job,
-                message="ROI region is smaller than the template image, cannot match.",
+    def __detect(
+        self, roi: ROI, mat_gray: np.ndarray, offset_x: int, offset_y: int
+    ) -> Dict[str, Any]:
+        # 多模板: 共用同一帧
+        if roi.templates:
+            if roi.type == "DetectAll":
+                raise ActionTypeError(
+                    job=self.job,
+                    message="DetectAll does not support `templates`, use `image`.",
+                )
+            return self.__match_templates(roi, mat_gray, offset_x, offset_y)
+
+        image: Optional[ROI_Image] = roi.image
+        if image is None:
+            raise MissingRequiredError(
+                "ROI requires either `image` or `templates`.", self.job
             )
+        template: Template = self.__load_template(image, mat_gray)
 
         # 匹配
-        mat_gray = cv2.cvtColor(mat, cv2.COLOR_BGR2GRAY)
-        template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-        res = cv2.matchTemplate(mat_gray, template_gray, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(res)
-        if max_val < confidence:
+        if roi.type == "DetectAll":
+            return self.__find_all(roi, image, mat_gray, template, offset_x, offset_y)
+        matched, template = self.__match(
+            image, mat_gray, template, (offset_x, offset_y)
+        )
+        if matched.score < image.confidence:
             raise MatchingError(
                 job=self.job,
-                message=f"No match found in region with confidence >= {confidence}",
+                message=f"No match found in region with confidence >= {image.confidence}",
             )
+        return self.__variables(matched, template, offset_x, offset_y)
 
-        # 计算匹配位置
-        matched_left_top = (
-            max_loc[0] + offset_x,
-            max_loc[1] + offset_y,
-        )
-        matched_center = (
-            matched_left_top[0] + template_gray.shape[1] // 2,
-            matched_left_top[1] + template_gray.shape[0] // 2,
-        )
+    def __wait(self, roi: ROI, wait: ROI_Wait) -> Dict[str, Any]:
+        """Poll the ROI until it matches (`appear`) or stops matching
+        (`disappear`), or `wait.timeout` expires.
+
+        The interval starts at `wait.interval` and grows by `wait.backoff`
+        up to `wait.max_interval` while nothing happens; it drops back after
+        input jobs and, if `wait.gate`, whenever the region changes. With
+        `wait.gate` an unchanged region is not matched again.
+        """
+        start: float = time.perf_counter()
+        deadline: float = start + wait.timeout / 1000
+        fast: float = wait.interval / 1000
+        slow: float = wait.max_interval / 1000
+        interval: float = fast
+        last: Optional[Fingerprint] = None
+        error: Optional[MatchingError] = None
+        polls: int = 0
+        while True:
+            if polls:
+                self.capture.invalidate()
+            mat_gray, offset_x, offset_y = self.__frame(roi, show=not polls)
+            polls += 1
+            global_stats_manager.incr("roi.wait.polls")
+
+            changed: bool = False
+            if wait.gate:
+                fingerprint: Fingerprint = self.__fingerprint(mat_gray)
+                changed = fingerprint != last
+                last = fingerprint
+            if changed or not wait.gate:
+                try:
+                    var_s: Dict[str, Any] = self.__detect(
+                        roi, mat_gray, offset_x, offset_y
+                    )
+                    if wait.until == "appear":
+                        var_s["waited"] = int((time.perf_counter() - start) * 1000)
+                        return var_s
+                except MatchingError as e:
+                    if wait.until == "disappear":
+                        return {"waited": int((time.perf_counter() - start) * 1000)}
+                    error = e
+            else:
+                global_stats_manager.incr("roi.wait.unchanged")
+
+            now: float = time.perf_counter()
+            if now >= deadline:
+                raise MatchingError(
+                    job=self.job,
+                    message=f"ROI did not {wait.until} within {wait.timeout} ms "
+                    f"({polls} polls)" + (f": {error.message}" if error else ""),
+                )
+            # 输入后或画面变化时快速轮询, 静止时逐步退避
+            if changed or now - CaptureBackend.changed_at < slow:
+                interval = fast
+            else:
+                interval = min(interval * wait.backoff, slow)
+            time.sleep(min(interval, deadline - now))
+
+    def main(self, roi: ROI) -> TaskReturnsDict[str]:
+        update(roi, self.use_vars)
+        returns: Dict[str, str] = dict(cast(Dict[str, str], roi.returns))
+        for entry in roi.templates:
+            returns.update(
+                {key: f"{entry.name}.{value}" for key, value in entry.returns.items()}
+            )
+
+        var_s: Dict[str, Any]
+        wait: Optional[ROI_Wait] = roi.wait
+        if wait is None:
+            var_s = self.__detect(roi, *self.__frame(roi))
+        elif wait.until == "disappear":
+            if roi.type == "MoveMouse":
+                raise ActionTypeError(
+                    job=self.job,
+                    message="MoveMouse cannot wait for the ROI to disappear.",
+                )
+            var_s = self.__wait(roi, wait)
+            return TaskReturnsDict(
+                returns=returns,
+                variables=var_s,
+                result=f"Disappeared after {var_s['waited']} ms",
+            )
+        else:
+            var_s = self.__wait(roi, wait)
+
+        matched_center = (var_s["center_x"], var_s["center_y"])
+        max_val: float = var_s["confidence"]
 
         # log
         global_log_manager.log(
@@ -232,40 +480,44 @@ class ROIExecutor(Executor):
         )
 
         # action Factory
-        var_s: Dict[str, Any] = {
-            "center_x": matched_center[0],
-            "center_y": matched_center[1],
-            "confidence": max_val,
-            "left": matched_left_top[0],
-            "top": matched_left_top[1],
-            "right": matched_left_top[0] + template_gray.shape[1],
-            "bottom": matched_left_top[1] + template_gray.shape[0],
-            "width": template_gray.shape[1],
-            "height": template_gray.shape[0],
-            "template_height": template_gray.shape[0],
-            "template_width": template_gray.shape[1],
-        }
+        if roi.type == "DetectAll":
+            return TaskReturnsDict(
+                returns=returns,
+                variables=var_s,
+                result=f"Detected {var_s['count']} matches, best at {matched_center} "
+                f"with confidence {max_val}",
+            )
 
-        if roi.type == "DetectOnly":
+        elif roi.type == "DetectOnly":
             return TaskReturnsDict(
-                returns=cast(Dict[str, str], roi.returns),
+                returns=returns,
                 variables=var_s,
                 result=f"Detected at {matched_center} with confidence {max_val}",
             )
 
         elif roi.type == "MoveMouse":
             # 移动鼠标
-            duration: int = roi.duration
-            InputController.mouse_move_to(
-                x=matched_center[0],
-                y=matched_center[1],
-                duration=duration,
-                debug=self.globals.debug,
-                ignore=self.globals.ignore,
-            )
+            move: Dict[str, Any] = {
+                "x": matched_center[0],
+                "y": matched_center[1],
+                "duration": roi.duration,
+                "debug": self.globals.debug,
+                "ignore": self.globals.ignore,
+            }
+            if roi.detach:
+                # 移动在输入线程中进行, 本任务结束后即可开始下一次截图
+                future = global_input_dispatcher.submit(
+                    self.job, InputController.mouse_move_to, **move
+                )
+                future.add_done_callback(lambda _: CaptureBackend.invalidate_shared())
+            else:
+                global_input_dispatcher.join()
+                InputController.mouse_move_to(**move)
+                # 悬停可能改变画面, 同时让等待中的轮询恢复快速间隔
+                CaptureBackend.invalidate_shared()
 
             return TaskReturnsDict(
-                returns=cast(Dict[str, str], roi.returns),
+                returns=returns,
                 variables=var_s,
                 result=f"Matched at {matched_center}" f", confidence: {max_val}",
             )
@@ -11,11 +11,14 @@ from ..Exceptions.crash import (
     MissingRequiredError,
 )
 from ..executor import Executor, Job, JobExecutor
+from ..Input import global_input_dispatcher
 from ..Util.executor_works import update
 
 
 @JobExecutor.register("System")
 class SystemExecutor(Executor):
+    invalidates_frames: bool = True
+
     def __init__(self, job: Job, globals: Globals) -> None:
         self.job: Job = job
         self.globals: Globals = globals
@@ -67,6 +70,8 @@ class SystemExecutor(Executor):
 
     def execute_Paste(self, system: System) -> TaskReturnsDict[str]:
         update(system, self.use_vars)
+        # 粘贴的按键须排在尚未发送完的输入之后
+        global_input_dispatcher.join()
         content = SystemController.paste()
         return TaskReturnsDict(
             returns=cast(Dict[str, str], system.returns),
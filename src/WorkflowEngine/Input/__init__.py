@@ -0,0 +1,22 @@
+from .base import InputBackend
+from .dispatcher import InputDispatcher, global_input_dispatcher
+from .events import BUTTONS, EVENT_DTYPE, EventArray, EventBuffer, EventKind, batches
+from .recording import RecordingInputBackend, SentBatch
+from .sendinput import SendInputBackend
+
+__all__ = [
+    "BUTTONS",
+    "EVENT_DTYPE",
+    "EventArray",
+    "EventBuffer",
+    "EventKind",
+    "InputBackend",
+    "InputDispatcher",
+    "batches",
+    # backends
+    "RecordingInputBackend",
+    "SendInputBackend",
+    "SentBatch",
+    # global instances
+    "global_input_dispatcher",
+]
@@ -0,0 +1,99 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from ...Models.globals import InputConfig
+from ..Controller.PacingController import Pacer, Schedule, global_pacer
+from ..Controller.StatsController import StatsManager, global_stats_manager
+from .events import EventArray, batches
+
+_BACKEND_T = TypeVar("_BACKEND_T", bound=Type["InputBackend"])
+
+
+class InputBackend(ABC):
+    """Sink of compiled input events used by Input jobs.
+
+    Backends are registered by name with `InputBackend.register` and
+    selected through `globals.input.backend`. A backend only implements
+    `send`, which delivers one batch of simultaneous events in a single
+    call; `dispatch` walks the time stamps of an event array.
+    """
+
+    STATS_PREFIX: str = "input."
+
+    backends: Dict[str, Type["InputBackend"]] = {}
+
+    _shared: Optional["InputBackend"] = None
+    _shared_key: str = ""
+    _shared_lock: threading.Lock = threading.Lock()
+
+    @abstractmethod
+    def __init__(self, config: InputConfig) -> None:
+        pass
+
+    @abstractmethod
+    def send(self, batch: EventArray, hWnd: Optional[int] = None) -> None:
+        """Deliver `batch` now, to window `hWnd` or to the desktop if None."""
+
+    @abstractmethod
+    def cursor(self) -> Tuple[int, int]:
+        """Current cursor position."""
+
+    def dispatch(
+        self,
+        events: EventArray,
+        hWnd: Optional[int] = None,
+        stats: StatsManager = global_stats_manager,
+        pacer: Pacer = global_pacer,
+    ) -> int:
+        """Send `events`, each batch at its time stamp after the start.
+
+        Deadlines are absolute, so time spent sending does not add up over
+        a long sequence. Returns the number of `send` calls.
+        """
+        schedule: Schedule = pacer.schedule()
+        calls: int = 0
+        for batch in batches(events):
+            schedule.at(float(batch["at"][0]))
+            self.send(batch, hWnd)
+            calls += 1
+        stats.incr(self.STATS_PREFIX + "events", len(events))
+        stats.incr(self.STATS_PREFIX + "calls", calls)
+        return calls
+
+    def close(self) -> None:
+        pass
+
+    @classmethod
+    def register(cls, name: str) -> Callable[[_BACKEND_T], _BACKEND_T]:
+        def decorator(backend: _BACKEND_T) -> _BACKEND_T:
+            if not issubclass(backend, InputBackend):
+                raise TypeError(f"{name} must be a subclass of InputBackend")
+
+            cls.backends[name] = backend
+            return backend
+
+        return decorator
+
+    @classmethod
+    def create(cls, config: InputConfig) -> "InputBackend":
+        if config.backend not in cls.backends:
+            raise ValueError(f"Unknown input backend: {config.backend}")
+        return cls.backends[config.backend](config)
+
+    @classmethod
+    def shared(cls, config: InputConfig) -> "InputBackend":
+        """Process-wide backend for `config`, recreated when it changes."""
+        key: str = config.model_dump_json()
+        with cls._shared_lock:
+            if cls._shared is None or cls._shared_key != key:
+                if cls._shared is not None:
+                    cls._shared.close()
+                InputBackend._shared = cls.create(config)
+                InputBackend._shared_key = key
+            return cls._shared  # type: ignore[return-value]
+
+
+__all__ = [
+    "InputBackend",
+]
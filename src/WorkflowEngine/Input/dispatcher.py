@@ -0,0 +1,126 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ...Models.main import Job
+from ..Controller.StatsController import StatsManager, global_stats_manager
+from ..Exceptions.crash import DetachedInputCrash
+
+_Pending = Tuple[Job, "Future[Any]"]
+
+
+class InputDispatcher:
+    """Input of detached jobs, sent in order on one background thread.
+
+    `submit` queues a call and returns its future at once, so the job that
+    submitted it can finish while the mouse is still moving. Futures are
+    kept per job until `join` waits for them; an exception raised while
+    sending is raised again by `join` as a `DetachedInputCrash` of the job
+    that submitted it.
+    """
+
+    STATS_PREFIX: str = "input.async."
+
+    def __init__(self, stats: StatsManager = global_stats_manager) -> None:
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, List[_Pending]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: StatsManager = stats
+
+    def submit(
+        self, job: Job, fnc: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> "Future[Any]":
+        with self._lock:
+            if self._pool is None:
+                # 单线程保证输入按提交顺序发送
+                self._pool = ThreadPoolExecutor(1, thread_name_prefix="input")
+            future: "Future[Any]" = self._pool.submit(fnc, *args, **kwargs)
+            self._pending.setdefault(job.name, []).append((job, future))
+        self.count("submitted")
+        return future
+
+    def pending(self, jobs: Optional[Iterable[str]] = None) -> int:
+        """Number of unfinished submissions of `jobs` (default all)."""
+        with self._lock:
+            names = self._pending.keys() if jobs is None else jobs
+            return sum(
+                not f.done() for name in names for _, f in self._pending.get(name, ())
+            )
+
+    def join(
+        self, jobs: Optional[Iterable[str]] = None, timeout: Optional[float] = None
+    ) -> None:
+        """Wait for the input submitted by `jobs` (default all) to be sent.
+
+        Every submission is waited for before anything is raised. The first
+        one that failed is raised as a `DetachedInputCrash` of its job; on
+        `timeout` the unfinished ones are queued again for a later `join`
+        and `TimeoutError` is raised.
+        """
+        with self._lock:
+            names = list(self._pending) if jobs is None else list(jobs)
+            entries: List[_Pending] = [
+                entry for name in names for entry in self._pending.pop(name, ())
+            ]
+        if not entries:
+            return
+        self.count("waited" if any(not f.done() for _, f in entries) else "ready")
+        _, unfinished = wait([f for _, f in entries], timeout)
+
+        if unfinished:
+            with self._lock:
+                for job, future in entries:
+                    if future in unfinished:
+                        self._pending.setdefault(job.name, []).append((job, future))
+        failed: List[_Pending] = [
+            (job, f)
+            for job, f in entries
+            if f not in unfinished and not f.cancelled() and f.exception() is not None
+        ]
+        if failed:
+            job, future = failed[0]
+            error = future.exception()
+            raise DetachedInputCrash(
+                f"{error!r} ({len(failed)} of {len(entries)} submissions failed)",
+                job=job,
+            ) from error
+        if unfinished:
+            raise TimeoutError(
+                f"{len(unfinished)} of {len(entries)} submissions "
+                f"not sent after {timeout} s"
+            )
+
+    def clear(self) -> None:
+        """Forget every submission, cancelling those not started yet."""
+        with self._lock:
+            entries = [entry for queued in self._pending.values() for entry in queued]
+            self._pending.clear()
+        for _, future in entries:
+            future.cancel()
+
+    def shutdown(self) -> None:
+        """Wait for every submission, then stop the thread."""
+        try:
+            self.join()
+        finally:
+            with self._lock:
+                pool, self._pool = self._pool, None
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+    def count(self, event: str) -> None:
+        self._stats.incr(self.STATS_PREFIX + event)
+
+
+global_input_dispatcher = InputDispatcher()
+global_stats_manager.define_ratio(
+    InputDispatcher.STATS_PREFIX + "overlap_ratio",
+    InputDispatcher.STATS_PREFIX + "ready",
+    InputDispatcher.STATS_PREFIX + "waited",
+)
+
+
+__all__ = [
+    "InputDispatcher",
+    "global_input_dispatcher",
+]
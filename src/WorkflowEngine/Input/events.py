@@ -0,0 +1,138 @@
+from enum import IntEnum
+from typing import Iterable, List, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class EventKind(IntEnum):
+    KEY_DOWN = 1  # code: virtual key code
+    KEY_UP = 2
+    CHAR = 3  # code: unicode code point
+    MOVE = 4  # x, y: screen (or window client) coordinates
+    BUTTON_DOWN = 5  # code: button index, x, y: where
+    BUTTON_UP = 6
+
+
+BUTTONS = {"LEFT": 0, "RIGHT": 1, "MIDDLE": 2}
+
+# at: milliseconds from the start of the dispatch
+EVENT_DTYPE = np.dtype(
+    [("at", "<f8"), ("kind", "u1"), ("code", "<i4"), ("x", "<i4"), ("y", "<i4")]
+)
+EventArray = NDArray[np.void]
+
+
+class EventBuffer:
+    """Builder of a flat, time-ordered input event array.
+
+    Every event is stamped with the buffer's current time `at`, which only
+    `wait` (and the interpolating helpers) advance; events sharing a time
+    stamp are sent together in one backend call.
+    """
+
+    def __init__(self, move_interval: float = 10) -> None:
+        # ms between the intermediate positions of a timed move
+        self.move_interval: float = max(move_interval, 1)
+        self.at: float = 0.0
+        self._rows: List[Tuple[float, int, int, int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(
+        self, kind: EventKind, code: int = 0, x: int = 0, y: int = 0
+    ) -> "EventBuffer":
+        self._rows.append((self.at, int(kind), code, x, y))
+        return self
+
+    def wait(self, ms: float) -> "EventBuffer":
+        self.at += max(ms, 0)
+        return self
+
+    def keys_down(self, codes: Iterable[int], sep: float = 0) -> "EventBuffer":
+        for i, code in enumerate(codes):
+            if i:
+                self.wait(sep)
+            self.add(EventKind.KEY_DOWN, code)
+        return self
+
+    def keys_up(self, codes: Iterable[int], sep: float = 0) -> "EventBuffer":
+        for i, code in enumerate(codes):
+            if i:
+                self.wait(sep)
+            self.add(EventKind.KEY_UP, code)
+        return self
+
+    def text(self, text: str, duration: float = 0) -> "EventBuffer":
+        """`text` as characters spread evenly over `duration`."""
+        step: float = duration / len(text) if len(text) > 1 else 0
+        for i, char in enumerate(text):
+            if i:
+                self.wait(step)
+            self.add(EventKind.CHAR, ord(char))
+        return self
+
+    def move(
+        self, origin: Tuple[int, int], x: int, y: int, duration: float = 0
+    ) -> "EventBuffer":
+        """Cursor from `origin` to `(x, y)`, in straight steps over `duration`."""
+        steps: int = int(duration // self.move_interval)
+        for i in range(1, steps):
+            self.wait(duration / steps)
+            self.add(
+                EventKind.MOVE,
+                x=round(origin[0] + (x - origin[0]) * i / steps),
+                y=round(origin[1] + (y - origin[1]) * i / steps),
+            )
+        if steps:
+            self.wait(duration / steps)
+        return self.add(EventKind.MOVE, x=x, y=y)
+
+    def button(self, kind: EventKind, button: str, x: int, y: int) -> "EventBuffer":
+        return self.add(kind, BUTTONS[button], x, y)
+
+    def click(
+        self,
+        button: str,
+        origin: Tuple[int, int],
+        x: int,
+        y: int,
+        duration: float = 0,
+    ) -> "EventBuffer":
+        self.move(origin, x, y, duration)
+        self.button(EventKind.BUTTON_DOWN, button, x, y)
+        return self.button(EventKind.BUTTON_UP, button, x, y)
+
+    def drag(
+        self,
+        button: str,
+        origin: Tuple[int, int],
+        x: int,
+        y: int,
+        duration: float = 0,
+    ) -> "EventBuffer":
+        self.button(EventKind.BUTTON_DOWN, button, *origin)
+        self.move(origin, x, y, duration)
+        return self.button(EventKind.BUTTON_UP, button, x, y)
+
+    def events(self) -> EventArray:
+        return np.array(self._rows, dtype=EVENT_DTYPE)
+
+
+def batches(events: EventArray) -> List[EventArray]:
+    """`events` split into runs sharing one time stamp, in order."""
+    if not len(events):
+        return []
+    cuts = np.flatnonzero(np.diff(events["at"])) + 1
+    return np.split(events, cuts)
+
+
+__all__ = [
+    "BUTTONS",
+    "EVENT_DTYPE",
+    "EventArray",
+    "EventBuffer",
+    "EventKind",
+    "batches",
+]
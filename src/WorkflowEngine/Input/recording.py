@@ -0,0 +1,62 @@
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ...Models.globals import InputConfig
+from .base import InputBackend
+from .events import EVENT_DTYPE, EventArray, EventKind
+
+_POINTER = (EventKind.MOVE, EventKind.BUTTON_DOWN, EventKind.BUTTON_UP)
+
+
+class SentBatch(NamedTuple):
+    sent_at: float  # perf_counter() when the batch was sent
+    hWnd: Optional[int]
+    events: EventArray
+
+
+@InputBackend.register("recording")
+class RecordingInputBackend(InputBackend):
+    """Keeps every batch it is sent with the time it arrived; nothing
+    reaches the desktop. The cursor follows the recorded moves."""
+
+    def __init__(self, config: InputConfig) -> None:
+        self.config: InputConfig = config
+        self.sent: List[SentBatch] = []
+        self.position: Tuple[int, int] = (0, 0)
+
+    def send(self, batch: EventArray, hWnd: Optional[int] = None) -> None:
+        self.sent.append(SentBatch(time.perf_counter(), hWnd, batch.copy()))
+        moved = batch[np.isin(batch["kind"], _POINTER)]
+        if hWnd is None and len(moved):
+            self.position = (int(moved["x"][-1]), int(moved["y"][-1]))
+
+    def cursor(self) -> Tuple[int, int]:
+        return self.position
+
+    def events(self) -> EventArray:
+        """Every event sent so far, in order."""
+        if not self.sent:
+            return np.zeros(0, dtype=EVENT_DTYPE)
+        return np.concatenate([s.events for s in self.sent])
+
+    def lateness(self) -> NDArray[np.float64]:
+        """Milliseconds each batch was sent after its time stamp, measured
+        from the first batch of the recording."""
+        if not self.sent:
+            return np.zeros(0)
+        start: float = self.sent[0].sent_at - float(self.sent[0].events["at"][0]) / 1000
+        return np.array(
+            [(s.sent_at - start) * 1000 - float(s.events["at"][0]) for s in self.sent]
+        )
+
+    def clear(self) -> None:
+        self.sent.clear()
+
+
+__all__ = [
+    "RecordingInputBackend",
+    "SentBatch",
+]
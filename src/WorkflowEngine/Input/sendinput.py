@@ -0,0 +1,173 @@
+from typing import Any, Dict, Optional, Tuple
+
+from ...Models.globals import InputConfig
+from .base import InputBackend
+from .events import EventArray, EventKind
+
+# SendInput 常量
+_INPUT_MOUSE = 0
+_INPUT_KEYBOARD = 1
+_KEYEVENTF_KEYUP = 0x0002
+_KEYEVENTF_UNICODE = 0x0004
+_MOUSEEVENTF_MOVE = 0x0001
+_MOUSEEVENTF_ABSOLUTE = 0x8000
+_MOUSEEVENTF_VIRTUALDESK = 0x4000
+# 按钮序号 -> (按下, 抬起) 标志
+_MOUSE_FLAGS = ((0x0002, 0x0004), (0x0008, 0x0010), (0x0020, 0x0040))
+
+# 后台窗口消息
+_WM_KEYDOWN = 0x0100
+_WM_KEYUP = 0x0101
+_WM_CHAR = 0x0102
+_WM_MOUSEMOVE = 0x0200
+_WM_BUTTONS = ((0x0201, 0x0202), (0x0204, 0x0205), (0x0207, 0x0208))
+_MK_BUTTONS = (0x0001, 0x0002, 0x0010)
+
+# 虚拟桌面 SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN
+_SM_VIRTUAL = (76, 77, 78, 79)
+
+
+def _structures() -> Dict[str, Any]:
+    import ctypes
+    from ctypes import wintypes
+
+    ULONG_PTR = ctypes.c_size_t
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ("dx", wintypes.LONG),
+            ("dy", wintypes.LONG),
+            ("mouseData", wintypes.DWORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ULONG_PTR),
+        ]
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [
+            ("wVk", wintypes.WORD),
+            ("wScan", wintypes.WORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ULONG_PTR),
+        ]
+
+    class HARDWAREINPUT(ctypes.Structure):
+        _fields_ = [
+            ("uMsg", wintypes.DWORD),
+            ("wParamL", wintypes.WORD),
+            ("wParamH", wintypes.WORD),
+        ]
+
+    class _UNION(ctypes.Union):
+        _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _anonymous_ = ("u",)
+        _fields_ = [("type", wintypes.DWORD), ("u", _UNION)]
+
+    return {"INPUT": INPUT, "ctypes": ctypes}
+
+
+@InputBackend.register("sendinput")
+class SendInputBackend(InputBackend):
+    """Events of one time step sent with a single `SendInput` call.
+
+    Foreground batches become one `INPUT` array, so the system queues
+    them atomically and no other input can interleave. Batches aimed at
+    a background window are posted as window messages, since SendInput
+    always targets the focused window. ctypes structures are built on
+    first use so the module imports on any platform.
+    """
+
+    def __init__(self, config: InputConfig) -> None:
+        self.config: InputConfig = config
+        self._types: Optional[Dict[str, Any]] = None
+
+    def __user32(self) -> Any:
+        if self._types is None:
+            self._types = _structures()
+        return self._types["ctypes"].windll.user32
+
+    def __inputs(self, batch: EventArray) -> Tuple[Any, int]:
+        user32 = self.__user32()
+        INPUT = self._types["INPUT"]  # type: ignore[index]
+        left, top, width, height = (user32.GetSystemMetrics(i) for i in _SM_VIRTUAL)
+
+        inputs = []
+        for at, kind, code, x, y in batch.tolist():
+            if kind in (EventKind.KEY_DOWN, EventKind.KEY_UP):
+                item = INPUT(type=_INPUT_KEYBOARD)
+                item.ki.wVk = code
+                item.ki.dwFlags = _KEYEVENTF_KEYUP if kind == EventKind.KEY_UP else 0
+                inputs.append(item)
+            elif kind == EventKind.CHAR:
+                # 超出BMP的字符需拆成UTF-16代理对
+                units = chr(code).encode("utf-16-le")
+                for i in range(0, len(units), 2):
+                    unit = int.from_bytes(units[i : i + 2], "little")
+                    for flags in (0, _KEYEVENTF_KEYUP):
+                        item = INPUT(type=_INPUT_KEYBOARD)
+                        item.ki.wScan = unit
+                        item.ki.dwFlags = _KEYEVENTF_UNICODE | flags
+                        inputs.append(item)
+            else:
+                item = INPUT(type=_INPUT_MOUSE)
+                # 绝对坐标归一化到 0..65535 的虚拟桌面
+                item.mi.dx = ((x - left) * 65535) // max(width - 1, 1)
+                item.mi.dy = ((y - top) * 65535) // max(height - 1, 1)
+                item.mi.dwFlags = (
+                    _MOUSEEVENTF_MOVE | _MOUSEEVENTF_ABSOLUTE | _MOUSEEVENTF_VIRTUALDESK
+                )
+                if kind != EventKind.MOVE:
+                    down, up = _MOUSE_FLAGS[code]
+                    item.mi.dwFlags |= down if kind == EventKind.BUTTON_DOWN else up
+                inputs.append(item)
+        return (INPUT * len(inputs))(*inputs), len(inputs)
+
+    def __post(self, batch: EventArray, hWnd: int) -> None:
+        user32 = self.__user32()
+        for at, kind, code, x, y in batch.tolist():
+            if kind == EventKind.KEY_DOWN:
+                user32.PostMessageW(hWnd, _WM_KEYDOWN, code, 0)
+            elif kind == EventKind.KEY_UP:
+                user32.PostMessageW(hWnd, _WM_KEYUP, code, 0)
+            elif kind == EventKind.CHAR:
+                user32.PostMessageW(hWnd, _WM_CHAR, code, 0)
+            else:
+                lParam = ((y & 0xFFFF) << 16) | (x & 0xFFFF)
+                if kind == EventKind.MOVE:
+                    user32.PostMessageW(hWnd, _WM_MOUSEMOVE, 0, lParam)
+                else:
+                    down, up = _WM_BUTTONS[code]
+                    pressed = kind == EventKind.BUTTON_DOWN
+                    user32.PostMessageW(
+                        hWnd,
+                        down if pressed else up,
+                        _MK_BUTTONS[code] if pressed else 0,
+                        lParam,
+                    )
+
+    def send(self, batch: EventArray, hWnd: Optional[int] = None) -> None:
+        if hWnd is not None:
+            self.__post(batch, hWnd)
+            return
+        inputs, count = self.__inputs(batch)
+        ctypes = self._types["ctypes"]  # type: ignore[index]
+        sent: int = self.__user32().SendInput(
+            count, inputs, ctypes.sizeof(inputs._type_)
+        )
+        if sent != count:
+            raise OSError(f"SendInput sent {sent} of {count} events")
+
+    def cursor(self) -> Tuple[int, int]:
+        from ctypes import wintypes
+
+        point = wintypes.POINT()
+        self.__user32().GetCursorPos(self._types["ctypes"].byref(point))  # type: ignore[index]
+        return point.x, point.y
+
+
+__all__ = [
+    "SendInputBackend",
+]
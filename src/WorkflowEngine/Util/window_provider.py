@@ -0,0 +1,211 @@
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Rect = Tuple[int, int, int, int]  # left, top, right, bottom
+
+
+class WindowProvider(ABC):
+    """Source of top-level windows and their properties.
+
+    `Win32WindowProvider` reads the live desktop; `FakeWindowProvider`
+    serves an in-memory window list for tests and benchmarks.
+    """
+
+    @abstractmethod
+    def handles(self) -> List[int]:
+        """Handles of all top-level windows, in Z order."""
+
+    @abstractmethod
+    def exists(self, hWnd: int) -> bool:
+        pass
+
+    @abstractmethod
+    def visible(self, hWnd: int) -> bool:
+        pass
+
+    @abstractmethod
+    def title(self, hWnd: int) -> str:
+        pass
+
+    @abstractmethod
+    def class_name(self, hWnd: int) -> str:
+        pass
+
+    @abstractmethod
+    def pid(self, hWnd: int) -> int:
+        pass
+
+    @abstractmethod
+    def process_name(self, pid: int) -> str:
+        """Executable file name of process `pid`, empty if unknown."""
+
+    @abstractmethod
+    def rect(self, hWnd: int) -> Rect:
+        pass
+
+    @abstractmethod
+    def foreground(self) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    def focus(self, hWnd: int) -> None:
+        pass
+
+
+class Win32WindowProvider(WindowProvider):
+    """Live desktop windows through pywin32, imported on first use."""
+
+    def handles(self) -> List[int]:
+        import win32gui
+
+        def hwnd_callback(hWnd: int, param: List[int]) -> None:
+            param.append(hWnd)
+
+        hWnd_list: List[int] = []
+        win32gui.EnumWindows(hwnd_callback, hWnd_list)
+        return hWnd_list
+
+    def exists(self, hWnd: int) -> bool:
+        import win32gui
+
+        return bool(win32gui.IsWindow(hWnd))
+
+    def visible(self, hWnd: int) -> bool:
+        import win32gui
+
+        return bool(win32gui.IsWindowVisible(hWnd))
+
+    def title(self, hWnd: int) -> str:
+        import win32gui
+
+        return win32gui.GetWindowText(hWnd)
+
+    def class_name(self, hWnd: int) -> str:
+        import win32gui
+
+        return win32gui.GetClassName(hWnd) or ""
+
+    def pid(self, hWnd: int) -> int:
+        import win32process
+
+        return win32process.GetWindowThreadProcessId(hWnd)[1]
+
+    def process_name(self, pid: int) -> str:
+        import win32api
+        import win32con
+        import win32process
+
+        h_process = win32api.OpenProcess(
+            win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ,
+            False,
+            pid,
+        )
+        try:
+            path: str = str(win32process.GetModuleFileNameEx(h_process, 0))  # type: ignore[union-attr]
+        finally:
+            win32api.CloseHandle(h_process)
+        return path.split("\\")[-1] if path else ""
+
+    def rect(self, hWnd: int) -> Rect:
+        import win32gui
+
+        return win32gui.GetWindowRect(hWnd)
+
+    def foreground(self) -> Optional[int]:
+        import win32gui
+
+        return win32gui.GetForegroundWindow() or None
+
+    def focus(self, hWnd: int) -> None:
+        import win32gui
+
+        win32gui.SetForegroundWindow(hWnd)
+
+
+@dataclass
+class FakeWindow:
+    hWnd: int
+    title: str
+    class_name: str = ""
+    pid: int = 0
+    process: str = ""
+    visible: bool = True
+    rect: Rect = (0, 0, 800, 600)
+
+
+class FakeWindowProvider(WindowProvider):
+    """In-memory windows. `calls` counts the queries per method, and every
+    `process_name` query waits `process_cost` seconds to stand in for
+    OpenProcess + GetModuleFileNameEx."""
+
+    def __init__(
+        self, windows: Iterable[FakeWindow] = (), process_cost: float = 0.0
+    ) -> None:
+        self.windows: Dict[int, FakeWindow] = {w.hWnd: w for w in windows}
+        self.process_cost: float = process_cost
+        self.focused: Optional[int] = None
+        self.calls: Counter = Counter()
+
+    def add(self, window: FakeWindow) -> None:
+        self.windows[window.hWnd] = window
+
+    def remove(self, hWnd: int) -> None:
+        self.windows.pop(hWnd, None)
+
+    def __window(self, method: str, hWnd: int) -> FakeWindow:
+        self.calls[method] += 1
+        return self.windows[hWnd]
+
+    def handles(self) -> List[int]:
+        self.calls["handles"] += 1
+        return list(self.windows)
+
+    def exists(self, hWnd: int) -> bool:
+        self.calls["exists"] += 1
+        return hWnd in self.windows
+
+    def visible(self, hWnd: int) -> bool:
+        return self.__window("visible", hWnd).visible
+
+    def title(self, hWnd: int) -> str:
+        return self.__window("title", hWnd).title
+
+    def class_name(self, hWnd: int) -> str:
+        return self.__window("class_name", hWnd).class_name
+
+    def pid(self, hWnd: int) -> int:
+        return self.__window("pid", hWnd).pid
+
+    def process_name(self, pid: int) -> str:
+        self.calls["process_name"] += 1
+        if self.process_cost:
+            end: float = time.perf_counter() + self.process_cost
+            while time.perf_counter() < end:
+                pass
+        for window in self.windows.values():
+            if window.pid == pid:
+                return window.process
+        return ""
+
+    def rect(self, hWnd: int) -> Rect:
+        return self.__window("rect", hWnd).rect
+
+    def foreground(self) -> Optional[int]:
+        self.calls["foreground"] += 1
+        return self.focused
+
+    def focus(self, hWnd: int) -> None:
+        self.__window("focus", hWnd)
+        self.focused = hWnd
+
+
+__all__ = [
+    "FakeWindow",
+    "FakeWindowProvider",
+    "Rect",
+    "Win32WindowProvider",
+    "WindowProvider",
+]
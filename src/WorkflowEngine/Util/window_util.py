@@ -1,16 +1,203 @@
-from typing import List, Optional
-
-import win32api
-import win32con
-import win32gui
-import win32process
+import threading
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
 
+from ..Controller.StatsController import StatsManager, global_stats_manager
 from ..Exceptions.crash import MissingRequiredError
+from .window_provider import Win32WindowProvider, WindowProvider
+
+
+def _matches(value: str, wanted: Optional[str], exact: bool) -> bool:
+    return not wanted or (value == wanted if exact else wanted in value)
+
+
+@dataclass
+class WindowEntry:
+    title: str
+    class_name: Optional[str] = None  # read on first use
+    pid: Optional[int] = None  # read on first use
+
+
+class WindowIndex:
+    """Cached properties of the top-level windows of a `WindowProvider`.
+
+    Only the handle list, visibility and titles are read on every lookup.
+    Class names and process ids are read the first time a predicate needs
+    them and kept until the handle disappears or its title changes;
+    process names are cached per pid until no window of that pid is left.
+    Predicates run cheapest first: title, class, then process.
+    """
+
+    STATS_PREFIX: str = "window."
+
+    def __init__(
+        self, provider: WindowProvider, stats: StatsManager = global_stats_manager
+    ) -> None:
+        self.provider: WindowProvider = provider
+        self._entries: Dict[int, WindowEntry] = {}
+        self._processes: Dict[int, str] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: StatsManager = stats
+
+    def __prune(self, handles: List[int]) -> None:
+        live = set(handles)
+        gone: List[int] = [hWnd for hWnd in self._entries if hWnd not in live]
+        if not gone:
+            return
+        for hWnd in gone:
+            del self._entries[hWnd]
+        # 进程号可能被复用, 没有窗口的进程不再缓存
+        pids = {e.pid for e in self._entries.values() if e.pid is not None}
+        for pid in [pid for pid in self._processes if pid not in pids]:
+            del self._processes[pid]
+
+    def __entry(self, hWnd: int, title: str) -> WindowEntry:
+        entry: Optional[WindowEntry] = self._entries.get(hWnd)
+        if entry is None or entry.title != title:
+            entry = self._entries[hWnd] = WindowEntry(title)
+        return entry
+
+    def __class_name(self, hWnd: int, entry: WindowEntry) -> str:
+        if entry.class_name is None:
+            entry.class_name = self.provider.class_name(hWnd)
+        return entry.class_name
+
+    def __process(self, hWnd: int, entry: WindowEntry) -> str:
+        if entry.pid is None:
+            entry.pid = self.provider.pid(hWnd)
+        name: Optional[str] = self._processes.get(entry.pid)
+        if name is None:
+            name = self._processes[entry.pid] = self.provider.process_name(entry.pid)
+            self.count("process.lookups")
+        else:
+            self.count("process.cached")
+        return name
+
+    def __check(
+        self,
+        hWnd: int,
+        title: Optional[str],
+        class_name: Optional[str],
+        process: Optional[str],
+        exact: bool,
+        visible_only: bool,
+    ) -> bool:
+        if visible_only and not self.provider.visible(hWnd):
+            return False
+        window_title: str = self.provider.title(hWnd)
+        if not window_title:
+            return False
+        entry: WindowEntry = self.__entry(hWnd, window_title)
+        if not _matches(window_title, title, exact):
+            return False
+        if class_name and not _matches(
+            self.__class_name(hWnd, entry), class_name, exact
+        ):
+            return False
+        return not process or _matches(self.__process(hWnd, entry), process, exact)
+
+    def find(
+        self,
+        title: Optional[str] = None,
+        class_name: Optional[str] = None,
+        process: Optional[str] = None,
+        exact: bool = False,
+        visible_only: bool = True,
+    ) -> List[int]:
+        """Handles of the titled windows matching every given predicate."""
+        with self._lock:
+            handles: List[int] = self.provider.handles()
+            self.__prune(handles)
+            matched: List[int] = [
+                hWnd
+                for hWnd in handles
+                if self.__check(hWnd, title, class_name, process, exact, visible_only)
+            ]
+            self.count("lookups")
+            return matched
+
+    def verify(
+        self,
+        hWnd: int,
+        title: Optional[str] = None,
+        class_name: Optional[str] = None,
+        process: Optional[str] = None,
+        exact: bool = False,
+        visible_only: bool = True,
+    ) -> bool:
+        """Whether `hWnd` still exists and matches, without enumerating."""
+        with self._lock:
+            if not self.provider.exists(hWnd):
+                self._entries.pop(hWnd, None)
+                return False
+            return self.__check(hWnd, title, class_name, process, exact, visible_only)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._processes.clear()
+
+    def count(self, event: str) -> None:
+        self._stats.incr(self.STATS_PREFIX + event)
+
+
+global_stats_manager.define_ratio(
+    WindowIndex.STATS_PREFIX + "process.hit_ratio",
+    WindowIndex.STATS_PREFIX + "process.cached",
+    WindowIndex.STATS_PREFIX + "process.lookups",
+)
+
+
+class WindowBindings:
+    """Window handle each job last resolved, per search criteria."""
+
+    STATS_PREFIX: str = "window.binding."
+
+    def __init__(self, stats: StatsManager = global_stats_manager) -> None:
+        self._bound: Dict[Hashable, int] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: StatsManager = stats
+
+    def get(self, key: Hashable) -> Optional[int]:
+        return self._bound.get(key)
+
+    def put(self, key: Hashable, hWnd: int) -> None:
+        with self._lock:
+            self._bound[key] = hWnd
+
+    def forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._bound.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bound.clear()
+
+    def count(self, event: str) -> None:
+        self._stats.incr(self.STATS_PREFIX + event)
+
+
+global_window_bindings = WindowBindings()
+global_stats_manager.define_ratio(
+    WindowBindings.STATS_PREFIX + "hit_ratio",
+    WindowBindings.STATS_PREFIX + "hits",
+    WindowBindings.STATS_PREFIX + "rebinds",
+    WindowBindings.STATS_PREFIX + "cold",
+)
 
 
 class WindowUtil:
     """窗口工具类，提供窗口查找和操作功能"""
 
+    # 默认读取实际桌面, 测试与基准可通过 use 替换
+    index: WindowIndex = WindowIndex(Win32WindowProvider())
+
+    @staticmethod
+    def use(provider: WindowProvider) -> WindowIndex:
+        """Look windows up through `provider` from now on."""
+        WindowUtil.index = WindowIndex(provider)
+        return WindowUtil.index
+
     @staticmethod
     def find_window(
         title: Optional[str] = None,
@@ -18,6 +205,8 @@ class WindowUtil:
         process: Optional[str] = None,
         exact: bool = False,
         visible_only: bool = True,
+        bind: Optional[Hashable] = None,
+        bindings: WindowBindings = global_window_bindings,
     ) -> List[int]:
         """
         根据条件查找窗口句柄
@@ -26,6 +215,8 @@ class WindowUtil:
             title: 窗口标题
             class_name: 窗口类名
             process: 进程名
+            bind: 绑定键(通常为任务名), 设置后记住唯一匹配的窗口,
+                下次仅校验该窗口仍存在且匹配, 校验失败时才重新查找
 
         Returns:
             int: 窗口句柄
@@ -40,56 +231,38 @@ class WindowUtil:
                 "At least one of title, class_name or process must be specified."
             )
 
-        # 获取所有窗口的句柄
-        def hwnd_callback(hWnd: int, param: List[int]) -> None:
-            param.append(hWnd)
-
-        hWnd_list: List[int] = []
-        matched: List[int] = []
-        win32gui.EnumWindows(hwnd_callback, hWnd_list)
-
-        for hWnd in hWnd_list:
-            # 窗口过滤
-            if not win32gui.IsWindowVisible(hWnd):
-                continue
-
-            # 获取窗口标题
-            window_title: str = win32gui.GetWindowText(hWnd)
-            if not window_title:
-                continue
-
-            # 获取窗口类名
-            window_class_name: Optional[str] = win32gui.GetClassName(hWnd)
-
-            # 获取进程信息
-            process_id = win32process.GetWindowThreadProcessId(hWnd)[1]
-            h_process = win32api.OpenProcess(
-                win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ,
-                False,
-                process_id,
-            )
-            path: str = str(win32process.GetModuleFileNameEx(h_process, 0))  # type: ignore[union-attr]
-            window_process: str = path.split("\\")[-1] if path else ""
-            win32api.CloseHandle(h_process)
+        criteria = (title, class_name, process, exact, visible_only)
+        if bind is None:
+            return WindowUtil.index.find(*criteria)
 
-            # 匹配条件检查, exact参数用于精确匹配
-            title_match = not title or (
-                window_title == title if exact else title in window_title
-            )
-            class_match = not class_name or (
-                window_class_name == class_name
-                if exact
-                else (window_class_name and class_name in window_class_name)
-            )
-            process_match = not process or (
-                window_process == process if exact else process in window_process
-            )
-            visible_match = win32gui.IsWindowVisible(hWnd) if visible_only else True
-            if title_match and class_match and process_match and visible_match:
-                matched.append(hWnd)
+        key = (bind, *criteria)
+        bound: Optional[int] = bindings.get(key)
+        if bound is not None and WindowUtil.index.verify(bound, *criteria):
+            bindings.count("hits")
+            return [bound]
+        bindings.count("cold" if bound is None else "rebinds")
 
+        matched: List[int] = WindowUtil.index.find(*criteria)
+        # 只绑定唯一匹配的窗口, 多个匹配时每次都重新查找
+        if len(matched) == 1:
+            bindings.put(key, matched[0])
+        else:
+            bindings.forget(key)
         return matched
 
+    @staticmethod
+    def get_window_rect(hWnd: int) -> Tuple[int, int, int, int]:
+        """
+        获取窗口矩形
+
+        Args:
+            hWnd: 窗口句柄
+
+        Returns:
+            Tuple[int, int, int, int]: (left, top, right, bottom)
+        """
+        return WindowUtil.index.provider.rect(hWnd)
+
     @staticmethod
     def get_focused_window() -> Optional[int]:
         """
@@ -98,7 +271,7 @@ class WindowUtil:
         Returns:
             int: 当前焦点窗口的句柄，如果没有焦点窗口则返回 None
         """
-        return win32gui.GetForegroundWindow()
+        return WindowUtil.index.provider.foreground()
 
     @staticmethod
     def focus_window_by_handle(hWnd: int) -> None:
@@ -108,4 +281,4 @@ class WindowUtil:
         Args:
             hWnd: 窗口句柄
         """
-        win32gui.SetForegroundWindow(hWnd)
+        WindowUtil.index.provider.focus(hWnd)
@@ -1,5 +1,6 @@
 from typing import List
 
+from .cache import WorkflowCache
 from .executor import Executor, ExecutorManager, JobExecutor
 from .Executors import *
 from .manager import WorkflowManager
@@ -11,4 +12,5 @@ __all__: List[str] = [
     "Executor",
     # manager
     "WorkflowManager",
+    "WorkflowCache",
 ]
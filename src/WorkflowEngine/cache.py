@@ -0,0 +1,132 @@
+import hashlib
+import os
+import pickle
+import platform
+from functools import lru_cache
+from typing import List, Optional
+
+import pydantic
+
+from ..version import __version__
+from .compiler import CompiledWorkflow
+
+_SRC_DIR: str = os.path.dirname(os.path.dirname(__file__))
+# sources defining the pickled layout: the models and the compiled workflow
+_LAYOUT_SOURCES: List[str] = [
+    os.path.join(_SRC_DIR, "Models"),
+    os.path.join(_SRC_DIR, "WorkflowEngine", "compiler.py"),
+]
+
+
+@lru_cache(maxsize=1)
+def _layout_digest() -> str:
+    """Digest of the sources in `_LAYOUT_SOURCES`, so changes to the models or
+    the compiled layout invalidate the cache without a version bump."""
+    digest = hashlib.sha256()
+    for source in _LAYOUT_SOURCES:
+        if os.path.isdir(source):
+            files = [
+                os.path.join(source, name)
+                for name in sorted(os.listdir(source))
+                if name.endswith(".py")
+            ]
+        elif os.path.isfile(source):
+            files = [source]
+        else:
+            # frozen builds ship no sources, the framework version is enough there
+            continue
+        for file in files:
+            with open(file, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+class WorkflowCache:
+    """On-disk cache of compiled workflows.
+
+    Entries are keyed by the workflow file's content hash together with the
+    framework version, the model and compiler sources, and the pydantic and
+    Python versions, so any of them changing simply results in a miss.
+    Loading an entry unpickles the already validated and overload-resolved
+    CompiledWorkflow without running pydantic validation.
+
+    Only point the cache at a directory you trust: entries are pickles.
+    """
+
+    DEFAULT_DIR: str = os.path.join(".cache", "workflows")
+    SUFFIX: str = ".wfc"
+    __PROTOCOL: int = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, directory: str = DEFAULT_DIR) -> None:
+        self.directory: str = directory
+
+    @staticmethod
+    def key(path: str) -> str:
+        digest = hashlib.sha256()
+        for part in (
+            __version__,
+            _layout_digest(),
+            pydantic.VERSION,
+            platform.python_version(),
+            str(WorkflowCache.__PROTOCOL),
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        with open(path, "rb") as f:
+            digest.update(f.read())
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def load(self, path: str) -> Optional[CompiledWorkflow]:
+        entry: str = self.entry_path(self.key(path))
+        try:
+            with open(entry, "rb") as f:
+                compiled = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # corrupt or incompatible entry, drop it and recompile
+            self._remove(entry)
+            return None
+
+        if not isinstance(compiled, CompiledWorkflow):
+            self._remove(entry)
+            return None
+        return compiled
+
+    def store(self, path: str, compiled: CompiledWorkflow) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        entry: str = self.entry_path(self.key(path))
+        tmp: str = f"{entry}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(compiled, f, protocol=self.__PROTOCOL)
+        os.replace(tmp, entry)
+        return entry
+
+    def entries(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(self.SUFFIX)
+        ]
+
+    def clean(self) -> int:
+        removed: int = 0
+        for entry in self.entries():
+            removed += self._remove(entry)
+        return removed
+
+    @staticmethod
+    def _remove(entry: str) -> bool:
+        try:
+            os.remove(entry)
+            return True
+        except OSError:
+            return False
+
+
+__all__ = ["WorkflowCache"]
@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Tuple
+
+from ..Models.globals import Globals
+from ..Models.main import Job, Next
+from .Exceptions.crash import JobNotFoundError
+
+if TYPE_CHECKING:
+    from .manager import WorkflowManager
+
+END: int = -1  # id of an unset / terminating job reference
+
+
+@dataclass(frozen=True)
+class CompiledJob:
+    """A resolved job whose references are all dense integer job ids."""
+
+    id: int
+    name: str
+    job: Job  # resolved definition (overloads applied), executor payload only
+
+    # transitions
+    success: int
+    failure: int
+    exit: int
+
+    # hooks
+    before: Tuple[int, ...]
+    before_ignore: bool
+    after_success: Tuple[int, ...]  # always + success
+    after_failure: Tuple[int, ...]  # always + failure
+    after_ignore: bool
+
+    # needs bitset & variable source
+    needs: int
+    use: int
+
+    # limits, -1 means unlimited
+    max_count: int
+    max_failure: int
+    max_success: int
+
+
+@dataclass(frozen=True)
+class CompiledWorkflow:
+    """Immutable workflow IR run by ExecutorManager."""
+
+    begin: int
+    globals: Globals
+    jobs: Tuple[CompiledJob, ...]
+    names: Tuple[str, ...]
+    index: Mapping[str, int]
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def __getitem__(self, job_id: int) -> CompiledJob:
+        return self.jobs[job_id]
+
+    def id_of(self, name: str) -> int:
+        return self.index.get(name, END)
+
+    def names_of(self, mask: int) -> List[str]:
+        return [name for i, name in enumerate(self.names) if mask >> i & 1]
+
+
+def _ref(index: Mapping[str, int], name: str, owner: Job, field: str) -> int:
+    if not name:
+        return END
+    if name not in index:
+        raise JobNotFoundError(
+            f"Job '{name}' referenced by '{owner.name}.{field}' not found in workflow.",
+            owner,
+        )
+    return index[name]
+
+
+def _refs(
+    index: Mapping[str, int], names: Iterable[str], owner: Job, field: str
+) -> Tuple[int, ...]:
+    return tuple(_ref(index, name, owner, field) for name in names)
+
+
+def _compile_job(job_id: int, job: Job, index: Mapping[str, int]) -> CompiledJob:
+    nxt = job.next
+    if isinstance(nxt, Next):
+        success_name, failure_name = nxt.success, nxt.failure
+    else:
+        success_name = failure_name = nxt
+
+    needs: int = 0
+    for need in _refs(index, job.needs, job, "needs"):
+        needs |= 1 << need
+
+    always = _refs(index, job.after.always, job, "after.always")
+    limits = job.limits
+    return CompiledJob(
+        id=job_id,
+        name=job.name,
+        job=job,
+        # an unknown next job ends the workflow, as it always has
+        success=index.get(success_name, END),
+        failure=index.get(failure_name, END),
+        exit=_ref(index, limits.exit, job, "limits.exit"),
+        before=_refs(index, job.before.tasks, job, "before.tasks"),
+        before_ignore=job.before.ignore_errors,
+        after_success=always + _refs(index, job.after.success, job, "after.success"),
+        after_failure=always + _refs(index, job.after.failure, job, "after.failure"),
+        after_ignore=job.after.ignore_errors,
+        needs=needs,
+        use=index.get(job.use, END),
+        max_count=limits.maxCount,
+        max_failure=limits.maxFailure,
+        max_success=limits.maxSuccess,
+    )
+
+
+def compile_workflow(manager: "WorkflowManager") -> CompiledWorkflow:
+    """Compile the workflow loaded by `manager` into a CompiledWorkflow.
+
+    Raises:
+        WorkflowBeginError: If the workflow has no begin job.
+        JobNotFoundError: If the begin job or any referenced hook, need or
+            exit job is not defined in the workflow.
+    """
+    names: Tuple[str, ...] = tuple(manager.names)
+    index: Dict[str, int] = {name: i for i, name in enumerate(names)}
+
+    resolved: List[Job] = []
+    for name in names:
+        job = manager.get_job(name)
+        if job is None:
+            raise JobNotFoundError(f"Job '{name}' not found in workflow.")
+        resolved.append(job)
+
+    begin_name: str = manager.get_begin()
+    if begin_name not in index:
+        raise JobNotFoundError(f"Job '{begin_name}' not found in workflow.")
+
+    return CompiledWorkflow(
+        begin=index[begin_name],
+        globals=manager.get_globals(),
+        jobs=tuple(_compile_job(i, job, index) for i, job in enumerate(resolved)),
+        names=names,
+        index=index,
+    )
+
+
+__all__ = [
+    "END",
+    "CompiledJob",
+    "CompiledWorkflow",
+    "compile_workflow",
+]
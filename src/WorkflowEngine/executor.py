@@ -8,7 +8,6 @@ from typing import (
     Dict,
     Generic,
     List,
-    Literal,
     NoReturn,
     Optional,
     Tuple,
@@ -18,23 +17,30 @@ from typing import (
 )
 
 from ..Models.globals import Globals
-from ..Models.main import After, Before, Job, Limits
+from ..Models.main import Job
 from ..Typehints.structure import TaskAttemptDict, TaskReturnsDict
-from .Controller import LogController, LogLevel, global_log_manager
-from .Exceptions.base import CrashException, CriticalException, IgnorableError
-from .Exceptions.crash import (
-    JobNotFoundError,
-    JobTypeError,
-    MissingRequiredError,
-    NeededError,
+from .Capture import CaptureBackend
+from .compiler import END, CompiledJob, CompiledWorkflow
+from .Controller import (
+    LogController,
+    LogLevel,
+    MatchController,
+    global_log_manager,
+    global_stats_manager,
+    global_template_store,
 )
+from .Exceptions.base import CrashException, CriticalException, IgnorableError
+from .Exceptions.crash import JobTypeError, MissingRequiredError, NeededError
 from .Exceptions.critical import RetryError
 from .Exceptions.ignorable import AfterJobRunError, BeforeJobRunError
+from .Input import global_input_dispatcher
 from .manager import WorkflowManager
 from .Util.executor_works import delay as task_delay
 
 
 class Executor(ABC):
+    # whether running the job may change the screen (input, commands...)
+    invalidates_frames: bool = False
 
     @abstractmethod
     def __init__(self, job: Job, globals: Globals) -> None:
@@ -97,7 +103,13 @@ class JobExecutor(Generic[_EXEC_YT, _EXEC_ST, _EXEC_RT, _EXEC_TYPE]):
         if self.job.type in self.executors:
             executor_class = self.executors[self.job.type]
             executor_instance = executor_class(self.job, self.globals)
-            ret: TaskReturnsDict[_EXEC_YT] = executor_instance.execute(*args, **kwargs)
+            try:
+                ret: TaskReturnsDict[_EXEC_YT] = executor_instance.execute(
+                    *args, **kwargs
+                )
+            finally:
+                if executor_class.invalidates_frames:
+                    CaptureBackend.invalidate_shared()
 
             returns: Dict[str, str] = ret["returns"]
             variables: Dict[str, Any] = dict(ret["variables"])
@@ -139,11 +151,11 @@ class ExecutorManager(Generic[_EXEC_YT, _EXEC_ST, _EXEC_RT, _CB_SF_V]):
         callback: Callable[..., Any] = __self_callback,
     ) -> None:
         self.workflow: WorkflowManager = workflow
-        self._tries: Dict[str, TaskAttemptDict] = {}
+        self.ir: CompiledWorkflow = workflow.compiled
         self.callback: Union[
             Callable[..., Any], Callable[[Union[_EXEC_YT, _CB_SF_V]], _CB_SF_V]
         ] = callback
-        self.globals: Globals = workflow.get_globals()
+        self.globals: Globals = self.ir.globals
 
         # logger setup
         self.global_log_manager: LogController.LogManager = global_log_manager
@@ -153,27 +165,50 @@ class ExecutorManager(Generic[_EXEC_YT, _EXEC_ST, _EXEC_RT, _CB_SF_V]):
         self.global_log_manager.set_debug(self.globals.debug)
         self.global_log_manager.set_globals(self.globals)
 
+        # template cache & matching pool setup
+        global_template_store.set_budget(self.globals.templateCache.budget * 1024**2)
+        MatchController.set_workers(self.globals.match.workers)
+
+        # counters are process-wide, a run reports what it counted since it started
+        self._stats_since: Dict[str, int] = global_stats_manager.snapshot()
+
         # global flag
         self.crashed: bool = False
         self.run_status: bool = False
         self.success: bool = False
 
-        # global job instance & variables init
-        self.cur_job_name: str = self.workflow.get_begin()
-        cur_job: Optional[Job] = self.workflow.get_job(self.cur_job_name)
-        if cur_job is None:
-            raise JobNotFoundError(f"Job '{self.cur_job_name}' not found in workflow.")
-        self.cur_job: Job = cur_job
+        # current job
+        self.cur: CompiledJob = self.ir[self.ir.begin]
+
+        # per job state, indexed by job id
+        size: int = len(self.ir)
+        self._successes: List[int] = [0] * size
+        self._failures: List[int] = [0] * size
+        self._done: int = 0  # bitset of jobs that have a result
+        self.task_vars: List[Dict[str, Any]] = [{} for _ in range(size)]
 
         # global instance & variables below
-        self.task_vars: Dict[str, Dict[str, Any]] = {}
         self.results: Dict[str, TaskReturnsDict[_EXEC_YT]] = {}
         self.work_chain: List[str] = []
-        self.load_params()
 
-    def load_params(self):
-        self.attempts: TaskAttemptDict = self._get_task_attempts(self.cur_job_name, 0)
-        self.limits: Limits = self._get_task_limits(self.cur_job)
+    @property
+    def cur_job_name(self) -> str:
+        return self.cur.name
+
+    @property
+    def cur_job(self) -> Job:
+        return self.cur.job
+
+    @property
+    def attempts(self) -> TaskAttemptDict:
+        return TaskAttemptDict(
+            success=self._successes[self.cur.id],
+            failure=self._failures[self.cur.id],
+        )
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Counters and ratios of the current run."""
+        return global_stats_manager.report(since=self._stats_since)
 
     def set_callback(self, callback: Callable[..., Any]) -> None:
         self.callback = callback
@@ -181,38 +216,32 @@ class ExecutorManager(Generic[_EXEC_YT, _EXEC_ST, _EXEC_RT, _CB_SF_V]):
     def switch_next_job(self) -> Optional[Job]:
         """Switch to the next job in the workflow.
 
-        Raises:
-            JobNotFoundError: If the next job is not found in the workflow.
-
         Returns:
-            Job: The next job in the workflow.
+            Optional[Job]: The next job, or None if the workflow ends here.
         """
+        prev: CompiledJob = self.cur
         self._log_event(
             "JobResult",
-            job_name=self.cur_job_name,
+            job_name=prev.name,
             result=ExecutorManager.__JOB_RESULT_MAP.get(self.success),
         )
-        nxt = self.workflow.get_next(self.cur_job_name, self.success)
-        nxt_job = self.workflow.get_job(nxt or "")
-        if nxt is None or nxt_job is None:
+        nxt: int = prev.success if self.success else prev.failure
+        if nxt == END:
             return None
-        self.cur_job_name = nxt
-        self.cur_job = nxt_job
-
-        self.load_params()
+        self.cur = self.ir[nxt]
 
         self._log_event(
             event="TaskStatus",
-            job_name=self.cur_job_name,
-            attempts=sum(v for v in self.attempts.values() if isinstance(v, int)) + 1,
-            limits=self.limits,
+            job_name=self.cur.name,
+            attempts=self._successes[nxt] + self._failures[nxt] + 1,
+            limits=self.cur.job.limits,
         )
         self._log_event(
             "NextJob",
-            nxt_job=nxt,
-            cur_job=self.cur_job_name,
+            nxt_job=self.cur.name,
+            cur_job=prev.name,
         )
-        return nxt_job
+        return self.cur.job
 
     def switch_exit_job(self) -> Optional[Job]:
         """Call the function means the task reached max attempts for exit.
@@ -220,65 +249,65 @@ class ExecutorManager(Generic[_EXEC_YT, _EXEC_ST, _EXEC_RT, _CB_SF_V]):
         Returns:
             Optional[Job]: The exit job if it exists, otherwise None.
         """
-        exit_job_name: Optional[str] = getattr(self.cur_job.limits, "exit", None)
-        exit_job = self.workflow.get_job(self.cur_job_name)
-        if exit_job_name is None or exit_job is None:
+        prev: CompiledJob = self.cur
+        attempts: int = self._successes[prev.id] + self._failures[prev.id]
+        if prev.exit == END:
             self.crashed = True
             self._log_event(
                 "MaxAttemptsForExit",
-                job_name=self.cur_job_name,
-                attempts=self.attempts.get("success", 0)
-                + self.attempts.get("failure", 0),
+                job_name=prev.name,
+                attempts=attempts,
             )
             return None
-        self.cur_job_name = exit_job_name
-        self.cur_job = exit_job
+        self.cur = self.ir[prev.exit]
         self._log_event(
             "MaxAttemptsForSwitch",
-            job_name=self.cur_job_name,
-            attempts=self.attempts.get("success", 0) + self.attempts.get("failure", 0),
-            exit_job=exit_job,
+            job_name=prev.name,
+            attempts=attempts,
+            exit_job=self.cur.name,
         )
 
-        return exit_job
+        return self.cur.job
 
-    def check_needed(self, job: Job) -> Union[NoReturn, None]:
-        needs: List[str] = job.needs
-        if all(name in self.results for name in needs):
+    def check_needed(self, entry: CompiledJob) -> Union[NoReturn, None]:
+        missing: int = entry.needs & ~self._done
+        if not missing:
+            # 等待所依赖任务中分离发送的输入完成
+            if entry.needs:
+                global_input_dispatcher.join(self.ir.names_of(entry.needs))
             return None
-        missing: List[str] = [name for name in needs if name not in self.results]
         raise NeededError(
-            f"Not all needed tasks are completed. Missing: {missing}. "
+            f"Not all needed tasks are completed. Missing: {self.ir.names_of(missing)}. "
             f"Available results: {list(self.results.keys())}",
-            job=job,
+            job=entry.job,
         )
 
-    def check_attempts(
-        self, job: Job, ta: TaskAttemptDict, tl: Limits
-    ) -> Union[NoReturn, None]:
-        limits: List[
-            Tuple[Literal["maxCount", "maxFailure", "maxSuccess"], int, str]
-        ] = [
-            ("maxCount", ta.get("success", 0) + ta.get("failure", 0), "attempts"),
-            ("maxFailure", ta.get("failure", 0), "failures"),
-            ("maxSuccess", ta.get("success", 0), "successes"),
-        ]
-        for key, value, label in limits:
-            max_limit: int = tl.model_dump().get(key, -1)
+    def check_attempts(self, entry: CompiledJob) -> Union[NoReturn, None]:
+        success: int = self._successes[entry.id]
+        failure: int = self._failures[entry.id]
+        limits: Tuple[Tuple[str, int, int, str], ...] = (
+            ("maxCount", entry.max_count, success + failure, "attempts"),
+            ("maxFailure", entry.max_failure, failure, "failures"),
+            ("maxSuccess", entry.max_success, success, "successes"),
+        )
+        for key, max_limit, value, label in limits:
             if max_limit != -1 and value >= max_limit:
                 raise RetryError(
-                    job=job,
-                    message=f"Task '{job.name}' exceeded {key}: {max_limit} {label}",
+                    job=entry.job,
+                    message=f"Task '{entry.name}' exceeded {key}: {max_limit} {label}",
                 )
         return None
 
-    def _get_task_attempts(self, job_name: str, start: int) -> TaskAttemptDict:
-        return self._tries.get(job_name) or TaskAttemptDict(
-            success=start, failure=start
-        )
+    def _record(self, entry: CompiledJob, result: TaskReturnsDict[_EXEC_YT]) -> None:
+        self.results[entry.name] = result
+        self._done |= 1 << entry.id
 
-    def _get_task_limits(self, job: Job) -> Limits:
-        return job.limits or Limits(maxCount=-1, maxFailure=-1, maxSuccess=-1, exit="")
+    def _execute(
+        self, entry: CompiledJob, **use_vars: Any
+    ) -> TaskReturnsDict[_EXEC_YT]:
+        return JobExecutor[_EXEC_YT, _EXEC_ST, _EXEC_RT](
+            job=entry.job, globals=self.globals
+        ).execute(**use_vars)
 
     def _log_event(self, event: str, **kwargs: Any):
         templates = {
@@ -316,6 +345,10 @@ class ExecutorManager(Generic[_EXEC_YT, _EXEC_ST, _EXEC_RT, _CB_SF_V]):
                 "All jobs completed successfully. Jobs Chain: {jobs_chain}",
                 [LogLevel.INFO, LogLevel.DEBUG],
             ),
+            "RunStats": (
+                "Run statistics: {stats}",
+                [LogLevel.INFO, LogLevel.DEBUG],
+            ),
             "BeforeJobTip": (
                 "Before '{job_name}' job run: '{bef_job}'",
                 [LogLevel.INFO, LogLevel.DEBUG],
@@ -348,153 +381,156 @@ class ExecutorManager(Generic[_EXEC_YT, _EXEC_ST, _EXEC_RT, _CB_SF_V]):
             log_config=self.globals.logConfig,
         )
 
-    def _before_run(self, job: Job) -> None:
-        before: Before = job.before
-        ignore: bool = before.ignore_errors
-        tasks: List[str] = before.tasks
-        for task in tasks:
-            bef_job = self.workflow.get_job(task)
-            if bef_job is None:
-                raise JobNotFoundError(f"Job '{task}' not found in workflow.")
+    def _before_run(self, entry: CompiledJob) -> None:
+        for task in entry.before:
+            bef: CompiledJob = self.ir[task]
 
-            self._log_event("BeforeJobTip", job_name=job.name, bef_job=bef_job.name)
+            self._log_event("BeforeJobTip", job_name=entry.name, bef_job=bef.name)
             success = False
             try:
-                self.check_needed(bef_job)
+                self.check_needed(bef)
 
-                self.__pre_works(job=bef_job)
-                self._before_run(job=bef_job)
+                self.__pre_works(bef)
+                self._before_run(bef)
 
-                self.results[task] = JobExecutor[_EXEC_YT, _EXEC_ST, _EXEC_RT](
-                    job=bef_job, globals=self.globals
-                ).execute()
+                self._record(bef, self._execute(bef))
                 success = True
             except IgnorableError as e:
-                if not ignore:
-                    raise BeforeJobRunError(job=bef_job, message=str(e)) from e
+                if not entry.before_ignore:
+                    raise BeforeJobRunError(job=bef.job, message=str(e)) from e
 
             except CrashException as e:
-                self._log_event("Error", job_name=task, error=e)
-                raise CrashException("Crash occurred", bef_job) from e
+                self._log_event("Error", job_name=bef.name, error=e)
+                raise CrashException("Crash occurred", bef.job) from e
             finally:
                 self._log_event(
                     "BeforeJobResult",
-                    job_name=task,
+                    job_name=bef.name,
                     result=ExecutorManager.__JOB_RESULT_MAP.get(success),
                 )
             if not self.crashed:
-                self._after_run(job=bef_job)
-                self.__post_works(job=bef_job)
-
-    def _after_run(self, job: Job) -> None:
-        after: After = job.after
-        ignore: bool = after.ignore_errors
-        always: List[str] = after.always
-        tasks: List[str] = always + (after.success if self.success else after.failure)
+                self._after_run(bef)
+                self.__post_works(bef)
+
+    def _after_run(self, entry: CompiledJob) -> None:
+        tasks: Tuple[int, ...] = (
+            entry.after_success if self.success else entry.after_failure
+        )
         for task in tasks:
-            aft_job = self.workflow.get_job(task)
-            if aft_job is None:
-                raise JobNotFoundError(f"Job '{task}' not found in workflow.")
+            aft: CompiledJob = self.ir[task]
 
-            self._log_event("AfterJobTip", job_name=job.name, aft_job=aft_job.name)
+            self._log_event("AfterJobTip", job_name=entry.name, aft_job=aft.name)
             success = False
             try:
-                self.check_needed(aft_job)
+                self.check_needed(aft)
 
-                self.__pre_works(job=aft_job)
-                self._before_run(job=aft_job)
+                self.__pre_works(aft)
+                self._before_run(aft)
 
-                self.results[task] = JobExecutor[_EXEC_YT, _EXEC_ST, _EXEC_RT](
-                    job=aft_job, globals=self.globals
-                ).execute()
+                self._record(aft, self._execute(aft))
                 success = True
             except IgnorableError as e:
-                if not ignore:
-                    raise AfterJobRunError(job=aft_job, message=str(e)) from e
+                if not entry.after_ignore:
+                    raise AfterJobRunError(job=aft.job, message=str(e)) from e
             except CrashException as e:
-                self._log_event("Error", job_name=task, error=e)
-                raise CrashException("Crash occurred", aft_job) from e
+                self._log_event("Error", job_name=aft.name, error=e)
+                raise CrashException("Crash occurred", aft.job) from e
             finally:
                 self._log_event(
                     "AfterJobResult",
-                    job_name=task,
+                    job_name=aft.name,
                     result=ExecutorManager.__JOB_RESULT_MAP.get(success),
                 )
             if not self.crashed:
-                self._after_run(job=aft_job)
-                self.__post_works(job=aft_job)
+                self._after_run(aft)
+                self.__post_works(aft)
 
-    def __pre_works(self, *_: Any, job: Job) -> None:
-        jn = job.name
-        self.work_chain.append(jn)
+    def __pre_works(self, entry: CompiledJob) -> None:
+        job: Job = entry.job
+        self.work_chain.append(entry.name)
 
         # delay
         task_delay(job.delay, mode="pre", globals=self.globals, prefix=job.type)
 
-    def __post_works(self, *_: Any, job: Job) -> None:
+    def __post_works(self, entry: CompiledJob) -> None:
+        job: Job = entry.job
         # delay
         task_delay(job.delay, mode="post", globals=self.globals, prefix=job.type)
 
+    def __crash(self, job_name: str, error: CrashException) -> None:
+        self._log_event("Crash", job_name=job_name, error=error)
+        self._log_event("RunStats", stats=self.stats())
+        self.crashed = True
+        self.run_status = False
+        # 崩溃后不再发送尚未完成的分离输入
+        global_input_dispatcher.clear()
+
     def run(self) -> Generator[_EXEC_YT, _EXEC_ST, List[_CB_SF_V]]:
+        self._stats_since = global_stats_manager.snapshot()
         self.run_status = True
         while self.run_status:
             self.success = False
-            use_vars: Dict[str, Any] = self.task_vars.get(self.cur_job.use, {})
+            entry: CompiledJob = self.cur
+            use_vars: Dict[str, Any] = (
+                self.task_vars[entry.use] if entry.use != END else {}
+            )
 
             try:
                 # legal check
-                self.check_attempts(job=self.cur_job, ta=self.attempts, tl=self.limits)
-                self.check_needed(job=self.cur_job)
+                self.check_attempts(entry)
+                self.check_needed(entry)
 
                 # exec
-                self.__pre_works(job=self.cur_job)
-                self._before_run(job=self.cur_job)
+                self.__pre_works(entry)
+                self._before_run(entry)
 
-                result: TaskReturnsDict[_EXEC_YT] = JobExecutor[
-                    _EXEC_YT, _EXEC_ST, _EXEC_RT
-                ](job=self.cur_job, globals=self.workflow.get_globals()).execute(
-                    **use_vars
-                )
+                result: TaskReturnsDict[_EXEC_YT] = self._execute(entry, **use_vars)
                 # record results
                 self.success = True
-                self.results[self.cur_job_name] = result
-                self.task_vars[self.cur_job_name] = result["returns"]
-                self.attempts["success"] += 1
-                self._tries[self.cur_job_name] = self.attempts
+                self._record(entry, result)
+                self.task_vars[entry.id] = result["returns"]
+                self._successes[entry.id] += 1
                 yield result["result"]
 
             except IgnorableError as e:
                 # handle error
-                self.attempts["failure"] += 1
-                self._tries[self.cur_job_name] = self.attempts
-                self._log_event("Warn", job_name=self.cur_job_name, error=e)
+                self._failures[entry.id] += 1
+                self._log_event("Warn", job_name=entry.name, error=e)
 
             except CriticalException as e:
                 if self.switch_exit_job() is None:
+                    global_input_dispatcher.clear()
                     raise CrashException(
-                        f"Critical exception in job '{self.cur_job_name}': {e.message}",
-                        job=self.cur_job,
+                        f"Critical exception in job '{entry.name}': {e.message}",
+                        job=entry.job,
                     ) from e
                 continue
 
             except CrashException as e:
-                self._log_event("Crash", job_name=self.cur_job_name, error=e)
-                self.crashed = True
-                self.run_status = False
+                self.__crash(entry.name, e)
                 raise CrashException(
-                    f"Crash occurred in job '{self.cur_job_name}': {e.message}",
-                    job=self.cur_job,
+                    f"Crash occurred in job '{entry.name}': {e.message}",
+                    job=entry.job,
                 ) from e
 
             finally:
                 if not self.crashed:
-                    self._after_run(job=self.cur_job)
-                    self.__post_works(job=self.cur_job)
+                    self._after_run(entry)
+                    self.__post_works(entry)
 
             if self.switch_next_job() is None:
                 break
 
+        try:
+            # 结束前等待分离发送的输入
+            global_input_dispatcher.join()
+        except CrashException as e:
+            name: str = e.job.name if e.job is not None else self.cur.name
+            self.__crash(name, e)
+            raise
+
         self._log_event("JobsCompletion", jobs_chain=" -> ".join(self.work_chain))
+        self._log_event("RunStats", stats=self.stats())
         return [self.callback(result["result"]) for result in self.results.values()]
 
     def await_run_all(self) -> List[_CB_SF_V]:
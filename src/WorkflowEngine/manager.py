@@ -6,6 +6,8 @@ from typing import Any, Dict, Iterable, List, Optional, Self, Set, Tuple, TypeVa
 from ..Models.globals import Globals
 from ..Models.main import Job, Next, Workflow
 from ..Util.util import to_indent_str
+from .cache import WorkflowCache
+from .compiler import CompiledWorkflow, compile_workflow
 from .Exceptions.crash import OverloadError, RecursiveError, WorkflowBeginError
 
 _DEFAULT_T = TypeVar("_DEFAULT_T", bound=Any)
@@ -16,18 +18,41 @@ class WorkflowManager:
         "type",
         "overload",
     }
-    __RelativedOverloadMap: Dict[str, str] = {}
-
-    def __init__(self, path: str) -> None:
+    __CACHED_PROPERTIES: Tuple[str, ...] = (
+        "workflow",
+        "names",
+        "jobs",
+        "compiled",
+    )
+
+    def __init__(self, path: str, cache: Optional[WorkflowCache] = None) -> None:
         self.path: str = path
+        self.cache: Optional[WorkflowCache] = cache
         self.__current_job: Optional[str] = None
         self.iter_status: bool = True
 
-    @cached_property
-    def workflow(self) -> Workflow:
+        # overload relations & resolved jobs, valid until the next reload
+        self.__RelativedOverloadMap: Dict[str, str] = {}
+        self.__resolved_jobs: Dict[str, Job] = {}
+
+    def reload(self) -> None:
+        """Drop the loaded workflow and every job resolved from it.
+
+        The workflow file is read again on the next access.
+        """
+        for prop in self.__CACHED_PROPERTIES:
+            self.__dict__.pop(prop, None)
+        self.__RelativedOverloadMap.clear()
+        self.__resolved_jobs.clear()
+        self.__current_job = None
+
+    def _check_path(self) -> None:
         if not self.path or not self.path.endswith(".json"):
             raise ValueError("Invalid workflow file path. Must be a .json file.")
 
+    @cached_property
+    def workflow(self) -> Workflow:
+        self._check_path()
         with open(self.path, "r", encoding="utf-8") as f:
             data = json.load(f)
             return Workflow(**data)
@@ -45,6 +70,19 @@ class WorkflowManager:
                 jobs.append(job)
         return jobs
 
+    @cached_property
+    def compiled(self) -> CompiledWorkflow:
+        if self.cache is None:
+            return compile_workflow(self)
+
+        # fast path: reuse the validated & resolved workflow from disk
+        self._check_path()
+        compiled: Optional[CompiledWorkflow] = self.cache.load(self.path)
+        if compiled is None:
+            compiled = compile_workflow(self)
+            self.cache.store(self.path, compiled)
+        return compiled
+
     def get_globals(
         self, default: Optional[_DEFAULT_T] = None
     ) -> Union[_DEFAULT_T, Globals, Any]:
@@ -143,6 +181,10 @@ class WorkflowManager:
         return None
 
     def get_job(self, name: str) -> Optional[Job]:
+        resolved: Optional[Job] = self.__resolved_jobs.get(name)
+        if resolved is not None:
+            return resolved
+
         jobs: Dict[str, Job] = self.workflow.jobs
         if name in jobs:
             origin: Job = jobs[name]
@@ -151,6 +193,7 @@ class WorkflowManager:
             while job is not None:
                 origin = job
                 job = self.special_case(origin)
+            self.__resolved_jobs[name] = origin
             return origin
 
         return None
@@ -1,9 +1,12 @@
 from .CLI import cli
 from .main import run
+from .version import __version__
 
 __all__ = [
     # modules
     "cli",
     # functions
     "run",
+    # metadata
+    "__version__",
 ]
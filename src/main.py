@@ -1,4 +1,6 @@
-from .WorkflowEngine import ExecutorManager, WorkflowManager
+from typing import Optional
+
+from .WorkflowEngine import ExecutorManager, WorkflowCache, WorkflowManager
 
 
 def execute_workflow(
@@ -13,6 +15,12 @@ def execute_workflow(
         tuple(result for result in results)  # Ensure results are processed
 
 
-def run(path: str, await_all: bool = False, verbose: bool = True) -> None:
-    workflow = WorkflowManager(path)
+def run(
+    path: str,
+    await_all: bool = False,
+    verbose: bool = True,
+    cache_dir: Optional[str] = None,
+) -> None:
+    cache = WorkflowCache(cache_dir) if cache_dir else None
+    workflow = WorkflowManager(path, cache=cache)
     execute_workflow(workflow, await_all=await_all, verbose=verbose)
@@ -0,0 +1,3 @@
+__version__: str = "0.1.0"
+
+__all__ = ["__version__"]
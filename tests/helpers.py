@@ -0,0 +1,15 @@
+"""
+Shared fixtures of the tests.
+"""
+
+from typing import Any
+
+from src.Models.main import Job
+
+
+def make_job(name: str, type: str, **fields: Any) -> Job:
+    """Job `name` of `type`, its other `fields` (`roi={...}`...) validated
+    into their models the way a workflow file is loaded."""
+    return Job.model_validate(
+        {"name": name, "type": type, "description": name, **fields}
+    )
@@ -0,0 +1,36 @@
+"""
+This file is mainly tests for the file `src/WorkflowEngine/cache.py`.
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.WorkflowEngine import WorkflowCache, WorkflowManager
+
+
+class TestWorkflowCache(unittest.TestCase):
+    def setUp(self):
+        self.target_file = "tests/workflow/2025-07-25T11.06/calculate.json"
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = WorkflowCache(os.path.join(self.tmp.name, "workflows"))
+
+    def test_cold_then_warm(self):
+        self.assertIsNone(self.cache.load(self.target_file))
+
+        cold = WorkflowManager(self.target_file, cache=self.cache).compiled
+        self.assertEqual(len(self.cache.entries()), 1)
+
+        warm = WorkflowManager(self.target_file, cache=self.cache).compiled
+        self.assertIsNot(cold, warm)
+        self.assertEqual(cold.names, warm.names)
+        self.assertEqual(
+            [job.job.model_dump() for job in cold.jobs],
+            [job.job.model_dump() for job in warm.jobs],
+        )
+
+        self.assertEqual(self.cache.clean(), 1)
+        self.assertEqual(self.cache.entries(), [])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
@@ -5,8 +5,11 @@ This file is mainly tests for the file `src/WorkflowEngine/manager.py`.
 import os
 import sys
 import unittest
+from typing import Any, Dict, List, Union
 
 from src.main import run
+from src.WorkflowEngine import ExecutorManager, WorkflowManager
+from src.WorkflowEngine.Controller import global_stats_manager
 
 
 class TestWorkflowManager(unittest.TestCase):
@@ -42,6 +45,32 @@ class TestWorkflowManager(unittest.TestCase):
 
         self.assertEqual(reply, ans)
 
+    def test_run_stats(self):
+        reports: List[Dict[str, Union[int, float]]] = []
+
+        class Recorder(ExecutorManager):
+            def _log_event(self, event: str, **kwargs: Any):
+                if event == "RunStats":
+                    reports.append(kwargs["stats"])
+                super()._log_event(event, **kwargs)
+
+        def count(result: Any) -> Any:
+            global_stats_manager.incr("test.results")
+            return result
+
+        with open(os.devnull, "w", encoding="utf-8") as f:
+            sys.stdout = f
+            try:
+                for _ in range(2):
+                    workflow = WorkflowManager(self.target_file)
+                    Recorder(workflow, callback=count).await_run_all()
+            finally:
+                sys.stdout = sys.__stdout__
+
+        # counters are process-wide, each run reports only its own
+        self.assertEqual([report["test.results"] for report in reports], [3, 3])
+        global_stats_manager.reset("test.")
+
     def tearDown(self) -> None:
         if os.path.exists("./TEST-CALCULATE.tmp"):
             os.remove("./TEST-CALCULATE.tmp")
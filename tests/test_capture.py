@@ -0,0 +1,194 @@
+"""
+This file is mainly tests for the package `src/WorkflowEngine/Capture`.
+"""
+
+import os
+import tempfile
+import unittest
+from typing import Any
+
+import cv2
+import numpy as np
+
+from src.Models.globals import CaptureConfig, CapturePlant, Globals
+from src.Typehints.structure import TaskReturnsDict
+from src.WorkflowEngine.Capture import CaptureBackend, FrameCache, SessionRecorder
+from src.WorkflowEngine.Controller import StatsManager, global_stats_manager
+from src.WorkflowEngine.Exceptions.ignorable import MatchingError
+from src.WorkflowEngine.executor import JobExecutor
+from tests.helpers import make_job
+
+
+class TestCapture(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.button = rng.integers(0, 256, (24, 40, 3), dtype=np.uint8)
+        self.button_path = os.path.join(self.tmp.name, "button.png")
+        cv2.imwrite(self.button_path, self.button)
+
+    def synthetic(self) -> CaptureConfig:
+        return CaptureConfig(
+            backend="synthetic",
+            width=320,
+            height=200,
+            plant=[CapturePlant(path=self.button_path, x=150, y=90)],
+        )
+
+    def test_synthetic(self):
+        backend = CaptureBackend.create(self.synthetic())
+        self.assertEqual(backend.screen_size(), (320, 200))
+        self.assertEqual(backend.grab().shape, (200, 320, 3))
+        np.testing.assert_array_equal(backend.grab((150, 90, 40, 24)), self.button)
+        # clipped to the screen
+        self.assertEqual(backend.grab((300, 190, 50, 50)).shape, (10, 20, 3))
+
+    def test_directory(self):
+        frames = self.frames(3)
+        looped = CaptureBackend.create(CaptureConfig(backend="directory", path=frames))
+        self.assertEqual([looped.grab()[0, 0, 0] for _ in range(4)], [0, 1, 2, 0])
+        held = CaptureBackend.create(
+            CaptureConfig(backend="directory", path=frames, loop=False)
+        )
+        self.assertEqual([held.grab()[0, 0, 0] for _ in range(4)], [0, 1, 2, 2])
+
+    def test_record_and_replay(self):
+        session = os.path.join(self.tmp.name, "session")
+        config = self.synthetic()
+        config.record = session
+        recorder = CaptureBackend.create(config)
+        self.assertIsInstance(recorder, SessionRecorder)
+        full = recorder.grab()
+        part = recorder.grab((140, 80, 60, 40))
+
+        replay = CaptureBackend.create(
+            CaptureConfig(backend="recorded", path=session, loop=False)
+        )
+        self.assertEqual(replay.screen_size(), (320, 200))
+        np.testing.assert_array_equal(replay.grab(), full)
+        # the second frame was recorded at (140, 80), crop the button out of it
+        np.testing.assert_array_equal(replay.grab((150, 90, 40, 24)), self.button)
+        np.testing.assert_array_equal(replay.grab((140, 80, 60, 40)), part)
+
+    def frames(self, count: int) -> str:
+        frames = os.path.join(self.tmp.name, "frames")
+        os.makedirs(frames, exist_ok=True)
+        for i in range(count):
+            cv2.imwrite(
+                os.path.join(frames, f"{i}.png"), np.full((10, 10, 3), i, np.uint8)
+            )
+        return frames
+
+    def test_frame_cache(self):
+        stats = StatsManager()
+        backend = CaptureBackend.create(
+            CaptureConfig(backend="directory", path=self.frames(3))
+        )
+        cache = FrameCache(backend, reuse=60_000, stats=stats)
+        first = cache.grab()
+        part = cache.grab((2, 2, 4, 4), gray=True)
+        self.assertEqual(part.shape, (4, 4))
+        self.assertTrue(np.shares_memory(cache.grab(gray=True), part))
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual(stats.snapshot(), {"capture.grabs": 1, "capture.reused": 2})
+
+        cache.invalidate()
+        self.assertEqual(cache.grab()[0, 0, 0], 1)
+        cache.reuse = 0
+        self.assertEqual(cache.grab()[0, 0, 0], 2)
+
+        # grayscale only: no colour frame is grabbed or converted
+        cache.reuse = 60
+        cache.invalidate()
+        self.assertEqual(cache.stamp, 0.0)
+        self.assertEqual(cache.grab(gray=True)[0, 0], 0)
+        self.assertIsNone(cache.frame)
+        self.assertEqual(cache.grab().ndim, 3)
+        # the colour grab replaced the older grayscale frame
+        self.assertEqual(cache.grab(gray=True)[0, 0], 1)
+        self.assertTrue(cache.mixed)
+
+        # once both are asked for, grayscale grabs keep the colour frame
+        cache.invalidate()
+        grabs = stats.get("capture.grabs")
+        self.assertEqual(cache.grab(gray=True)[0, 0], 2)
+        self.assertEqual(cache.grab()[0, 0, 0], 2)
+        self.assertEqual(stats.get("capture.grabs"), grabs + 1)
+
+    def test_input_invalidates(self):
+        config = CaptureConfig(backend="directory", path=self.frames(2), reuse=60_000)
+        shared = CaptureBackend.shared(config)
+        self.assertEqual(shared.grab()[0, 0, 0], 0)
+        self.assertEqual(shared.grab()[0, 0, 0], 0)
+        job = make_job(
+            "Log",
+            "System",
+            system={"type": "Log", "log": {"message": "-", "levels": ["DEBUG"]}},
+        )
+        JobExecutor(job, Globals(capture=config)).execute()
+        self.assertEqual(shared.grab()[0, 0, 0], 1)
+
+    def test_roi_job(self):
+        job = make_job(
+            "Find",
+            "ROI",
+            roi={
+                "type": "DetectOnly",
+                "image": {"path": self.button_path, "confidence": 0.95},
+                "returns": {"x": "center_x", "y": "center_y"},
+            },
+        )
+        ret: TaskReturnsDict[Any] = JobExecutor(
+            job, Globals(capture=self.synthetic())
+        ).execute()
+        self.assertEqual(ret["returns"], {"x": 170, "y": 102})
+
+    def test_roi_wait(self):
+        blank = np.full((200, 320, 3), 60, np.uint8)
+        shown = blank.copy()
+        shown[90:114, 150:190] = self.button
+
+        def wait(frames, until, timeout=10000):
+            folder = tempfile.mkdtemp(dir=self.tmp.name)
+            for i, frame in enumerate(frames):
+                cv2.imwrite(os.path.join(folder, f"{i:03}.png"), frame)
+            job = make_job(
+                "Wait",
+                "ROI",
+                roi={
+                    "type": "DetectOnly",
+                    "image": {"path": self.button_path, "confidence": 0.95},
+                    "wait": {
+                        "until": until,
+                        "timeout": timeout,
+                        "interval": 1,
+                        "max_interval": 4,
+                    },
+                    "returns": {"waited": "waited"},
+                },
+            )
+            config = CaptureConfig(backend="directory", path=folder)
+            global_stats_manager.reset("roi.wait.")
+            return JobExecutor(job, Globals(capture=config)).execute()
+
+        # unchanged frames are not matched again
+        ret = wait([blank, blank, blank, shown], "appear")
+        self.assertEqual(ret["variables"]["center_x"], 170)
+        self.assertGreaterEqual(ret["returns"]["waited"], 0)
+        self.assertEqual(
+            global_stats_manager.snapshot("roi.wait."),
+            {"roi.wait.polls": 4, "roi.wait.unchanged": 2},
+        )
+
+        ret = wait([shown, shown, blank], "disappear")
+        self.assertEqual(list(ret["variables"]), ["waited"])
+        self.assertEqual(global_stats_manager.get("roi.wait.polls"), 3)
+
+        with self.assertRaises(MatchingError):
+            wait([blank], "appear", timeout=30)
+        self.assertGreater(global_stats_manager.get("roi.wait.unchanged"), 0)
+
+    def tearDown(self) -> None:
+        # the shared backend may read from the directory removed below
+        CaptureBackend.close_shared()
+        self.tmp.cleanup()
@@ -0,0 +1,31 @@
+"""
+This file is mainly tests for the file `src/WorkflowEngine/compiler.py`.
+"""
+
+import unittest
+
+from src.WorkflowEngine import WorkflowManager
+from src.WorkflowEngine.compiler import END
+from src.WorkflowEngine.Exceptions.crash import WorkflowBeginError
+
+
+class TestCompiler(unittest.TestCase):
+    def setUp(self):
+        self.target_file = "tests/workflow/2025-07-25T11.06/calculate.json"
+        self.manager = WorkflowManager(self.target_file)
+
+    def test_compile_workflow(self):
+        ir = self.manager.compiled
+        self.assertEqual(ir.names, ("GET-POS", "TEST", "END"))
+        self.assertEqual(ir.begin, ir.id_of("GET-POS"))
+
+        get_pos, test, end = ir.jobs
+        self.assertEqual((get_pos.success, get_pos.failure), (test.id, test.id))
+        self.assertEqual((end.success, end.failure), (END, END))
+        self.assertEqual(test.use, get_pos.id)
+        self.assertIs(test.job, self.manager.get_job("TEST"))
+
+    def test_compile_without_begin(self):
+        manager = WorkflowManager("tests/workflow/2025-07-23T06.47/test_read.json")
+        with self.assertRaises(WorkflowBeginError):
+            manager.compiled
@@ -0,0 +1,179 @@
+"""
+This file is mainly tests for the package `src/WorkflowEngine/Input`.
+"""
+
+import threading
+import time
+import unittest
+from typing import Any, List
+
+import numpy as np
+
+from src.Models.globals import Globals, InputConfig
+from src.Typehints.structure import TaskReturnsDict
+from src.WorkflowEngine.Controller import StatsManager
+from src.WorkflowEngine.Exceptions.crash import DetachedInputCrash
+from src.WorkflowEngine.executor import JobExecutor
+from src.WorkflowEngine.Input import (
+    EventBuffer,
+    EventKind,
+    InputBackend,
+    InputDispatcher,
+    RecordingInputBackend,
+    batches,
+    global_input_dispatcher,
+)
+from tests.helpers import make_job
+
+
+class TestInput(unittest.TestCase):
+    def setUp(self):
+        self.globals = Globals(input=InputConfig(backend="recording"))
+        backend = InputBackend.shared(self.globals.input)
+        assert isinstance(backend, RecordingInputBackend)
+        self.backend: RecordingInputBackend = backend
+        self.backend.clear()
+        self.backend.position = (100, 100)
+
+    def test_compile(self):
+        events = (
+            EventBuffer(move_interval=10)
+            .click("LEFT", (0, 0), 100, 50, duration=40)
+            .wait(5)
+            .text("hi", duration=20)
+            .events()
+        )
+        self.assertEqual(
+            events["kind"].tolist(),
+            [4, 4, 4, 4, 5, 6, 3, 3],
+        )
+        self.assertEqual(events["at"].tolist(), [10, 20, 30, 40, 40, 40, 45, 55])
+        # straight steps between the origin and the target
+        self.assertEqual(events["x"][:4].tolist(), [25, 50, 75, 100])
+        self.assertEqual(events["y"][:4].tolist(), [12, 25, 38, 50])
+        self.assertEqual(events["code"][-2:].tolist(), [ord("h"), ord("i")])
+
+        # the final move, press and release share one backend call
+        self.assertEqual([len(b) for b in batches(events)], [1, 1, 1, 3, 1, 1])
+        self.assertEqual(batches(events[:0]), [])
+
+    def test_dispatch(self):
+        backend = RecordingInputBackend(InputConfig(backend="recording"))
+        stats = StatsManager()
+        events = EventBuffer().keys_down([0x11, 0x56]).wait(30).keys_up([0x56, 0x11])
+        start = time.perf_counter()
+        calls = backend.dispatch(events.events(), stats=stats)
+        self.assertEqual(calls, 2)
+        self.assertEqual(stats.get("input.events"), 4)
+        self.assertEqual(stats.get("input.calls"), 2)
+        # the second batch waits for its time stamp after the start
+        self.assertGreaterEqual((backend.sent[1].sent_at - start) * 1000, 30)
+        self.assertLess(np.abs(backend.lateness()).max(), 10)
+
+    def test_mouse_job(self):
+        job = make_job(
+            "Drag",
+            "Input",
+            input={
+                "type": "Mouse",
+                "mouse": {"type": "Drag", "x": 50, "y": -20, "duration": 30},
+            },
+        )
+        ret: TaskReturnsDict[Any] = JobExecutor(job, self.globals).execute()
+        self.assertEqual(ret["variables"]["x"], 150)
+        self.assertEqual(self.backend.cursor(), (150, 80))
+
+        events = self.backend.events()
+        self.assertEqual(events["kind"][0], EventKind.BUTTON_DOWN)
+        self.assertEqual(events["kind"][-1], EventKind.BUTTON_UP)
+        self.assertEqual(len(self.backend.sent), 4)
+
+    def test_keyboard_job(self):
+        job = make_job(
+            "Chord",
+            "Input",
+            input={
+                "type": "Keyboard",
+                "keyboard": {"type": "Type", "keys": ["a", "v"], "duration": 10},
+            },
+        )
+        JobExecutor(job, self.globals).execute()
+        events = self.backend.events()
+        self.assertEqual(
+            events["kind"].tolist(),
+            [EventKind.KEY_DOWN] * 2 + [EventKind.KEY_UP] * 2,
+        )
+        # released in reverse order
+        self.assertEqual(events["code"].tolist(), [0x41, 0x56, 0x56, 0x41])
+        self.assertEqual(len(self.backend.sent), 2)
+
+    def test_dispatcher(self):
+        dispatcher = InputDispatcher(stats=StatsManager())
+        slow, fast = make_job("slow", "Input"), make_job("fast", "Input")
+        release = threading.Event()
+        order: List[str] = []
+        dispatcher.submit(slow, release.wait, 5)
+        dispatcher.submit(slow, order.append, "slow")
+        dispatcher.submit(fast, order.append, "fast")
+        self.assertEqual(dispatcher.pending(), 3)
+        self.assertEqual(dispatcher.pending(["fast"]), 1)
+        release.set()
+        # one thread, sent in submission order
+        dispatcher.join(["fast"])
+        self.assertEqual(order, ["slow", "fast"])
+        dispatcher.join()
+        self.assertEqual(dispatcher.pending(), 0)
+
+        bad = make_job("bad", "Input")
+        dispatcher.submit(bad, int, "x")
+        dispatcher.submit(bad, order.append, "after")
+        with self.assertRaises(DetachedInputCrash) as caught:
+            dispatcher.join(["bad"])
+        self.assertIs(caught.exception.job, bad)
+        self.assertIsInstance(caught.exception.__cause__, ValueError)
+        # every submission waited for, then forgotten
+        self.assertEqual(order[-1], "after")
+        dispatcher.join(["bad"])
+        dispatcher.shutdown()
+
+    def test_dispatcher_timeout(self):
+        dispatcher = InputDispatcher(stats=StatsManager())
+        job = make_job("slow", "Input")
+        release = threading.Event()
+        dispatcher.submit(job, int, "1").result(5)
+        dispatcher.submit(job, release.wait, 5)
+        with self.assertRaises(TimeoutError):
+            dispatcher.join(timeout=0.01)
+        # the unfinished one is queued again
+        self.assertEqual(dispatcher.pending(["slow"]), 1)
+        release.set()
+        dispatcher.join()
+        self.assertEqual(dispatcher.pending(), 0)
+
+        dispatcher.submit(job, release.wait, 5)
+        dispatcher.clear()
+        self.assertEqual(dispatcher.pending(), 0)
+        dispatcher.shutdown()
+
+    def test_detached_job(self):
+        job = make_job(
+            "Swipe",
+            "Input",
+            input={
+                "type": "Mouse",
+                "detach": True,
+                "mouse": {"type": "Drag", "x": 200, "duration": 60},
+            },
+        )
+        start = time.perf_counter()
+        ret: TaskReturnsDict[Any] = JobExecutor(job, self.globals).execute()
+        self.assertEqual(ret["variables"]["x"], 300)
+        self.assertGreater(global_input_dispatcher.pending(["Swipe"]), 0)
+
+        global_input_dispatcher.join(["Swipe"])
+        self.assertGreaterEqual((time.perf_counter() - start) * 1000, 60)
+        self.assertEqual(self.backend.cursor(), (300, 100))
+
+
+if __name__ == "__main__":
+    unittest.main()
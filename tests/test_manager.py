@@ -33,3 +33,13 @@ class TestWorkflowManager(unittest.TestCase):
             ans = f.read()
 
         self.assertEqual(repred, ans)
+
+    def test_resolved_job_cache(self):
+        job = self.manager.get_job("Overload")
+        self.assertIsNotNone(job)
+        self.assertIs(job, self.manager.get_job("Overload"))
+
+        self.manager.reload()
+        reloaded = self.manager.get_job("Overload")
+        self.assertIsNot(job, reloaded)
+        self.assertEqual(repr(job), repr(reloaded))
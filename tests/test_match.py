@@ -0,0 +1,358 @@
+"""
+This file is mainly tests for the file `src/WorkflowEngine/Controller/MatchController.py`.
+"""
+
+import os
+import tempfile
+import unittest
+from typing import Optional, cast
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from src.WorkflowEngine.Controller import (
+    AtlasMatch,
+    MatchController,
+    MatchGate,
+    MatchResult,
+    MatchTracker,
+    ScaleMemory,
+    StatsManager,
+    Template,
+    TemplateStore,
+    color_space,
+)
+
+
+class TestMatchController(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.image = cast(
+            NDArray[np.uint8],
+            cv2.GaussianBlur(
+                rng.integers(0, 256, (480, 640), dtype=np.uint8), (5, 5), 0
+            ),
+        )
+        self.loc = (301, 157)
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "template.png")
+        x, y = self.loc
+        cv2.imwrite(path, self.image[y : y + 64, x : x + 96])
+        self.store = TemplateStore(stats=StatsManager())
+        template: Optional[Template] = self.store.get(path)
+        assert template is not None
+        self.template: Template = template
+
+    def test_pyramid_matches_exact(self):
+        exact = MatchController.exact(self.image, self.template.gray)
+        self.assertEqual((exact.x, exact.y), self.loc)
+        for levels in (1, 2, 3):
+            found = MatchController.pyramid(
+                self.image, self.template, 0.9, levels=levels, store=self.store
+            )
+            self.assertEqual((found.x, found.y), self.loc)
+            self.assertAlmostEqual(found.score, exact.score, places=4)
+
+    def test_pyramid_levels_clamped(self):
+        self.assertEqual(MatchController.pyramid_levels(self.template.gray, 5), 3)
+        self.assertEqual(
+            MatchController.pyramid_levels(np.zeros((10, 10), np.uint8), 2), 0
+        )
+
+    def test_pyramid_fallback(self):
+        # unreachable confidence, must return the exhaustive result
+        found = MatchController.pyramid(
+            self.image, self.template, 1.1, levels=2, store=self.store
+        )
+        self.assertEqual(found, MatchController.exact(self.image, self.template.gray))
+
+    def test_find_all(self):
+        tile = self.image[
+            self.loc[1] : self.loc[1] + 32, self.loc[0] : self.loc[0] + 32
+        ]
+        image = np.zeros((200, 300), np.uint8)
+        spots = [(10, 20), (150, 40), (60, 120), (180, 150)]
+        for x, y in spots:
+            image[y : y + 32, x : x + 32] = tile
+
+        found = MatchController.find_all(image, tile, 0.95)
+        self.assertEqual(sorted((m.x, m.y) for m in found), sorted(spots))
+        self.assertEqual(len(MatchController.find_all(image, tile, 0.95, 2)), 2)
+
+        # a 16px periodic pattern matches every 16px, boxes overlap by 1/3 IoU
+        periodic = np.tile(tile[:16, :16], (6, 6))
+        cell = periodic[:32, :32]
+        self.assertEqual(
+            len(MatchController.find_all(periodic, cell, 0.95, overlap=0.5)), 25
+        )
+        self.assertLess(len(MatchController.find_all(periodic, cell, 0.95)), 25)
+
+    def test_tracked(self):
+        stats = StatsManager()
+        stats.define_ratio(
+            "match.track.hit_ratio",
+            "match.track.hits",
+            "match.track.misses",
+            "match.track.cold",
+        )
+        tracker = MatchTracker(stats)
+        template = self.template.gray
+        searches = []
+
+        def track(image, origin=(0, 0)):
+            def search():
+                searches.append(origin)
+                return MatchController.exact(image, template)
+
+            return MatchController.tracked(
+                image, template, 0.9, search, "job", origin, 8, tracker
+            )
+
+        self.assertEqual(track(self.image)[1:], self.loc)
+        self.assertEqual(track(self.image)[1:], self.loc)
+        # same screen position seen through a shifted region
+        shifted = track(self.image[100:, 200:], origin=(200, 100))
+        self.assertEqual(shifted[1:], (self.loc[0] - 200, self.loc[1] - 100))
+        self.assertEqual(len(searches), 1)
+
+        # moved further than the padding: full search, then tracked again
+        moved = np.roll(self.image, (40, 60), axis=(0, 1))
+        self.assertEqual(track(moved)[1:], (self.loc[0] + 60, self.loc[1] + 40))
+        self.assertEqual(track(moved)[1:], (self.loc[0] + 60, self.loc[1] + 40))
+        self.assertEqual(len(searches), 2)
+        self.assertEqual(
+            stats.report(),
+            {
+                "match.track.cold": 1,
+                "match.track.hit_ratio": 0.6,
+                "match.track.hits": 3,
+                "match.track.misses": 1,
+            },
+        )
+
+    def test_masked(self):
+        # the template's corners differ from the screen, the mask ignores them
+        x, y = self.loc
+        patch = self.image[y : y + 64, x : x + 96].copy()
+        patch[:16, :16] = 255
+        path = os.path.join(self.tmp.name, "masked.png")
+        cv2.imwrite(path, patch)
+        template = self.store.get(path)
+        assert template is not None
+        mask = np.full(patch.shape, 255, dtype=np.uint8)
+        mask[:16, :16] = 0
+
+        self.assertLess(MatchController.exact(self.image, template.gray).score, 0.95)
+        found = MatchController.exact(self.image, template.gray, mask)
+        self.assertGreater(found.score, 0.99)
+        self.assertEqual(found[1:], self.loc)
+        found = MatchController.pyramid(
+            self.image, template, 0.95, store=self.store, mask=mask
+        )
+        self.assertEqual(found[1:], self.loc)
+        # flat areas under the mask score -1 instead of nan
+        flat = np.zeros_like(self.image)
+        self.assertEqual(MatchController.exact(flat, template.gray, mask).score, -1)
+
+    def test_color(self):
+        # red and green icons of the same shape and (nearly) the same gray level
+        def icon(color):
+            patch = np.full((40, 40, 3), 255, dtype=np.uint8)
+            cv2.circle(patch, (20, 20), 16, color, -1)
+            cv2.putText(patch, "A", (12, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 0, 2)
+            return patch
+
+        red, green = icon((0, 0, 200)), icon((0, 102, 0))
+        screen = cast(NDArray[np.uint8], cv2.cvtColor(self.image, cv2.COLOR_GRAY2BGR))
+        screen[100:140, 50:90] = green
+        screen[300:340, 400:440] = red
+        path = os.path.join(self.tmp.name, "red.png")
+        cv2.imwrite(path, red)
+        template = self.store.get(path)
+        assert template is not None
+
+        gray = MatchController.exact(
+            cast(NDArray[np.uint8], cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)),
+            template.gray,
+        )
+        self.assertGreater(gray.score, 0.99)
+        found = MatchController.exact(screen, self.store.color(template, "bgr"))
+        self.assertGreater(found.score, 0.99)
+        self.assertEqual(found[1:], (400, 300))
+        for space in ("hsv", "lab"):
+            found = MatchController.exact(
+                color_space(screen, space), self.store.color(template, space)
+            )
+            self.assertEqual(found[1:], (400, 300))
+        # the cached channels are reused
+        self.assertIs(
+            self.store.color(template, "bgr"), self.store.color(template, "bgr")
+        )
+
+        # mean-colour verification of the matched patch
+        bgr = self.store.color(template, "bgr")
+        near = MatchResult(1.0, 400, 300)
+        self.assertLess(MatchController.color_distance(screen, bgr, near), 1)
+        wrong = MatchResult(1.0, 50, 100)
+        self.assertGreater(MatchController.color_distance(screen, bgr, wrong), 50)
+
+    def test_atlas(self):
+        # the atlas picks the same template as matching each one separately
+        paths = {}
+        for i, (x, y) in enumerate([(40, 30), (301, 157), (500, 400), (120, 260)]):
+            paths[f"t{i}"] = os.path.join(self.tmp.name, f"atlas-{i}.png")
+            cv2.imwrite(paths[f"t{i}"], self.image[y : y + 12, x : x + 8])
+        atlas = self.store.atlas(paths)
+        assert atlas is not None
+        scores, labels = MatchController.atlas_response(self.image, atlas)
+        templates = [self.store.get(p) for p in paths.values()]
+        expected = np.stack(
+            [
+                cv2.matchTemplate(self.image, t.gray, cv2.TM_CCOEFF_NORMED)
+                for t in templates
+                if t is not None
+            ]
+        )
+        np.testing.assert_allclose(scores, expected.max(axis=0), atol=1e-3)
+        confident = expected.max(axis=0) > 0.5
+        np.testing.assert_array_equal(
+            labels[confident], expected.argmax(axis=0)[confident]
+        )
+
+        found = MatchController.find_labels(self.image, atlas, 0.99)
+        self.assertTrue(all(isinstance(m, AtlasMatch) for m in found))
+        self.assertEqual(
+            sorted((m.label, m.x, m.y) for m in found),
+            [("t0", 40, 30), ("t1", 301, 157), ("t2", 500, 400), ("t3", 120, 260)],
+        )
+        # flat regions match nothing
+        flat, _ = MatchController.atlas_response(np.zeros_like(self.image), atlas)
+        self.assertTrue((flat == -1).all())
+
+    def test_multi_scale(self):
+        # the screen shows the template at 125%
+        x, y = self.loc
+        path = os.path.join(self.tmp.name, "small.png")
+        cv2.imwrite(
+            path,
+            cv2.resize(
+                self.image[y : y + 80, x : x + 120],
+                (96, 64),
+                interpolation=cv2.INTER_AREA,
+            ),
+        )
+        template = self.store.get(path)
+        assert template is not None
+        memory = ScaleMemory(StatsManager())
+        tried = []
+
+        def search(scaled):
+            tried.append(scaled.scale)
+            return MatchController.exact(self.image, scaled.gray)
+
+        def run():
+            return MatchController.multi_scale(
+                self.image, template, 0.9, [1.0, 1.25, 1.5], search, self.store, memory
+            )
+
+        found, scaled = run()
+        self.assertEqual((found.x, found.y), self.loc)
+        self.assertEqual((scaled.scale, scaled.width, scaled.height), (1.25, 120, 80))
+        self.assertEqual(tried, [1.0, 1.25])  # stops at the first match
+
+        found, again = run()
+        self.assertIs(again, scaled)
+        self.assertEqual(tried, [1.0, 1.25, 1.25])
+        self.assertEqual(memory.get(template.path), 1.25)
+
+    def test_tiled(self):
+        template = self.template.gray
+        expected = MatchController.exact(self.image, template)
+        try:
+            MatchController.set_workers(1)
+            serial = MatchController.response(self.image, template, tiles=5)
+            MatchController.set_workers(3)
+            parallel = MatchController.response(self.image, template, tiles=5)
+            np.testing.assert_array_equal(serial, parallel)
+            self.assertEqual(serial.shape, (480 - 64 + 1, 640 - 96 + 1))
+            # strips change the FFT sizes: close to the untiled map, not equal
+            untiled = MatchController.response(self.image, template)
+            np.testing.assert_allclose(serial, untiled, rtol=0, atol=1e-4)
+
+            found = MatchController.exact(self.image, template, tiles=5)
+            self.assertEqual(found[1:], expected[1:])
+            self.assertAlmostEqual(found.score, expected.score, places=4)
+            # more tiles than result rows, and tiles inside parallel work
+            self.assertEqual(
+                MatchController.exact(self.image[100:230], template, tiles=500)[1:],
+                (self.loc[0], self.loc[1] - 100),
+            )
+            nested = MatchController.map(
+                lambda _: MatchController.exact(self.image, template, tiles=4),
+                range(6),
+                parallel=True,
+            )
+            self.assertEqual({m[1:] for m in nested}, {self.loc})
+        finally:
+            MatchController.set_workers(0)
+
+    def test_gated(self):
+        stats = StatsManager()
+        stats.define_ratio(
+            "match.gate.skip_ratio", "match.gate.skipped", "match.gate.searched"
+        )
+        gate = MatchGate(stats)
+        template = self.template.gray
+        searches = []
+
+        def gated(image, confidence=0.9):
+            def search():
+                searches.append(image)
+                return MatchController.exact(image, template)
+
+            fingerprint = MatchController.fingerprint(image)
+            return MatchController.gated(fingerprint, confidence, search, "job", gate)
+
+        # template absent: the failure is reused while the region is unchanged
+        absent = self.image.copy()
+        x, y = self.loc
+        absent[y : y + 64, x : x + 96] = 0
+        miss = gated(absent)
+        self.assertLess(miss.score, 0.9)
+        self.assertEqual(gated(absent.copy()), miss)
+        self.assertEqual(gated(absent[:, :]), miss)
+        self.assertEqual(len(searches), 1)
+
+        # one changed pixel, or a lower confidence, searches again
+        absent[0, 0] ^= 1
+        gated(absent)
+        gated(absent, confidence=-1.0)
+        self.assertEqual(len(searches), 3)
+
+        # a hit is never cached
+        self.assertEqual(gated(self.image)[1:], self.loc)
+        self.assertEqual(gated(self.image)[1:], self.loc)
+        self.assertEqual(len(searches), 5)
+        self.assertEqual(
+            stats.report(),
+            {
+                "match.gate.searched": 5,
+                "match.gate.skip_ratio": round(2 / 7, 4),
+                "match.gate.skipped": 2,
+            },
+        )
+
+    def test_map_parallel(self):
+        templates = [self.template.gray, self.template.gray[8:40, 8:72]]
+        serial = MatchController.map(
+            lambda t: MatchController.exact(self.image, t), templates
+        )
+        parallel = MatchController.map(
+            lambda t: MatchController.exact(self.image, t), templates, parallel=True
+        )
+        self.assertEqual(serial, parallel)
+        self.assertEqual((serial[1].x, serial[1].y), (309, 165))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
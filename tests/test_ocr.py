@@ -0,0 +1,206 @@
+"""
+This file is mainly tests for the file `src/WorkflowEngine/Controller/OCRController.py`.
+"""
+
+import os
+import tempfile
+import unittest
+from typing import Any
+
+import cv2
+import numpy as np
+
+from src.Models.globals import CaptureConfig, Globals
+from src.Typehints.structure import TaskReturnsDict
+from src.WorkflowEngine.Capture import CaptureBackend
+from src.WorkflowEngine.Controller import (
+    OCRCache,
+    OCRController,
+    StatsManager,
+    TemplateStore,
+    global_ocr_cache,
+    global_stats_manager,
+)
+from src.WorkflowEngine.Exceptions.ignorable import RecognitionError
+from src.WorkflowEngine.executor import JobExecutor
+from src.WorkflowEngine.Executors.OCRExecutor import parse_number
+from tests.helpers import make_job
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+SAMPLE = "0123456789 ABCDEFGHIJKLM NOPQRSTUVWXYZ .,:-+%/ I1.1I,:"
+
+
+def render(text: str, spacing: int = 1) -> np.ndarray:
+    (_, height), base = cv2.getTextSize("0", FONT, 0.6, 1)
+    lines = text.split("\n")
+    line_height = height + base + 8
+    widths = [
+        sum(cv2.getTextSize(c, FONT, 0.6, 1)[0][0] + spacing for c in line)
+        for line in lines
+    ]
+    image = np.full((line_height * len(lines) + 8, max(widths) + 12), 225, np.uint8)
+    for row, line in enumerate(lines):
+        x = 6
+        for char in line:
+            if not char.isspace():
+                y = 4 + row * line_height + height
+                cv2.putText(image, char, (x, y), FONT, 0.6, 30, 1, cv2.LINE_AA)
+            x += cv2.getTextSize(char, FONT, 0.6, 1)[0][0] + spacing
+    return image
+
+
+class TestOCR(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "glyphs")
+        self.store = TemplateStore(stats=StatsManager())
+        self.glyphs = OCRController.build_glyphs(
+            [(render(SAMPLE), SAMPLE)], self.directory
+        )
+
+    def tearDown(self):
+        CaptureBackend.close_shared()
+        self.tmp.cleanup()
+
+    def read(self, text: str, **kwargs):
+        return OCRController.read(render(text), self.glyphs, store=self.store, **kwargs)
+
+    def test_build(self):
+        self.assertEqual(set(self.glyphs.chars.values()), set(SAMPLE.replace(" ", "")))
+        # the space threshold is learned from the spaced and unspaced gaps
+        self.assertGreater(self.glyphs.space, 0)
+        loaded = OCRController.glyph_set(self.directory)
+        self.assertEqual(loaded.chars, self.glyphs.chars)
+        self.assertEqual(loaded.space, self.glyphs.space)
+        with self.assertRaises(ValueError):
+            OCRController.build_glyphs(
+                [(render("AB"), "ABC")], os.path.join(self.tmp.name, "bad")
+            )
+
+    def test_read(self):
+        result = self.read("HP 1250/3000")
+        self.assertEqual(result.text, "HP 1250/3000")
+        self.assertEqual(len(result.glyphs), 11)
+        self.assertGreaterEqual(result.confidence, 0.8)
+        left, top, width, height = result.box
+        self.assertEqual(left, result.glyphs[0].left)
+        self.assertGreater(width, height)
+
+        self.assertEqual(self.read("LV.42\nEXP 75%").text, "LV.42\nEXP 75%")
+
+    def test_polarity(self):
+        inverted = 255 - render("GOLD 880")
+        for polarity in ("auto", "light"):
+            result = OCRController.read(
+                inverted, self.glyphs, polarity=polarity, store=self.store
+            )
+            self.assertEqual(result.text, "GOLD 880")
+        self.assertEqual(
+            OCRController.read(np.full((20, 40), 90, np.uint8), self.glyphs).text, ""
+        )
+
+    def test_whitelist(self):
+        self.assertEqual(self.read("42", whitelist="0123456789").text, "42")
+        # characters outside the whitelist fall below the confidence
+        self.assertEqual(self.read("A4", whitelist="0123456789").text[1], "4")
+        self.assertEqual(self.read("A4", whitelist="4", unknown="_").text, "_4")
+        with self.assertRaises(ValueError):
+            self.read("A4", whitelist="#")
+
+    def test_job(self):
+        frames = os.path.join(self.tmp.name, "frames")
+        os.makedirs(frames)
+        screen = np.full((120, 240), 225, np.uint8)
+        text = render("SCORE 9015")
+        screen[40 : 40 + text.shape[0], 30 : 30 + text.shape[1]] = text
+        cv2.imwrite(os.path.join(frames, "000.png"), screen)
+        globals = Globals(capture=CaptureConfig(backend="directory", path=frames))
+
+        job = make_job(
+            "Read",
+            "OCR",
+            ocr={
+                "glyphs": self.directory,
+                "region": {"x": 20, "y": 30, "width": 200, "height": 60},
+                "pattern": r"SCORE \d+",
+                "returns": {"score": "number", "label": "text", "x": "left"},
+            },
+        )
+        ret: TaskReturnsDict[Any] = JobExecutor(job, globals).execute()
+        self.assertEqual(ret["returns"]["label"], "SCORE 9015")
+        self.assertIsNone(ret["returns"]["score"])
+        self.assertGreater(int(ret["returns"]["x"]), 30)
+
+        assert job.ocr is not None
+        job.ocr.pattern = r"\d+"
+        with self.assertRaises(RecognitionError):
+            JobExecutor(job, globals).execute()
+
+    def test_cache(self):
+        stats = StatsManager()
+        cache = OCRCache(stats=stats)
+        result = self.read("42")
+        self.assertIsNone(cache.get("job", "a", 60))
+        cache.put("job", "a", result, size=2)
+        self.assertIs(cache.get("job", "a", 60), result)
+        # per job
+        self.assertIsNone(cache.get("other", "a", 60))
+        # least recently used dropped first
+        cache.put("job", "b", result, size=2)
+        cache.get("job", "a", 60)
+        cache.put("job", "c", result, size=2)
+        self.assertIsNone(cache.get("job", "b", 60))
+        self.assertIsNotNone(cache.get("job", "a", 60))
+        # expired entries are dropped
+        self.assertIsNone(cache.get("job", "a", 0))
+        self.assertIsNone(cache.get("job", "a", 60))
+        self.assertEqual(stats.get("ocr.cache.hits"), 3)
+        self.assertEqual(stats.get("ocr.cache.misses"), 4)
+        self.assertEqual(stats.get("ocr.cache.expired"), 1)
+        self.assertEqual(stats.get("ocr.cache.evicted"), 1)
+
+    def test_cached_job(self):
+        frames = os.path.join(self.tmp.name, "frames")
+        os.makedirs(frames)
+        cv2.imwrite(os.path.join(frames, "000.png"), render("HP 80"))
+        cv2.imwrite(os.path.join(frames, "001.png"), render("HP 80"))
+        cv2.imwrite(os.path.join(frames, "002.png"), render("HP 75"))
+        globals = Globals(capture=CaptureConfig(backend="directory", path=frames))
+        job = make_job(
+            "Cached",
+            "OCR",
+            ocr={"glyphs": self.directory, "returns": {"hp": "text"}},
+        )
+        global_ocr_cache.clear()
+        global_stats_manager.reset("ocr.cache.")
+        texts = [JobExecutor(job, globals).execute()["returns"]["hp"] for _ in range(3)]
+        self.assertEqual(texts, ["HP 80", "HP 80", "HP 75"])
+        self.assertEqual(global_stats_manager.get("ocr.cache.hits"), 1)
+        self.assertEqual(global_stats_manager.get("ocr.cache.misses"), 2)
+
+        # a different parameter is a different entry
+        assert job.ocr is not None
+        job.ocr.whitelist = "HP0123456789"
+        JobExecutor(job, globals).execute()
+        self.assertEqual(global_stats_manager.get("ocr.cache.misses"), 3)
+        self.assertIn("ocr.cache.hit_ratio", global_stats_manager.report("ocr."))
+
+        # a retrained glyph image reloads the set and misses the cache
+        glyph = os.path.join(self.directory, next(iter(self.glyphs.chars)))
+        os.utime(glyph, ns=(0, self.glyphs.mtime_ns + 10**9))
+        JobExecutor(job, globals).execute()
+        self.assertEqual(global_stats_manager.get("ocr.cache.misses"), 4)
+        reloaded = OCRController.glyph_set(self.directory)
+        self.assertIsNot(reloaded, self.glyphs)
+        self.assertEqual(reloaded.mtime_ns, self.glyphs.mtime_ns + 10**9)
+
+    def test_parse_number(self):
+        self.assertEqual(parse_number("1,250"), 1250)
+        self.assertEqual(parse_number("-3.5"), -3.5)
+        self.assertEqual(parse_number("7."), 7.0)
+        self.assertIsNone(parse_number("1250/3000"))
+        self.assertIsNone(parse_number(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+This file is mainly tests for the file `src/WorkflowEngine/Controller/PacingController.py`.
+"""
+
+import threading
+import time
+import unittest
+
+from src.WorkflowEngine.Controller import Pacer, StatsManager
+
+
+class TestPacing(unittest.TestCase):
+    def setUp(self):
+        self.stats = StatsManager()
+        self.pacer = Pacer(stats=self.stats)
+
+    def test_sleep(self):
+        for ms in (0.3, 2, 5):
+            start = time.perf_counter()
+            late = self.pacer.sleep(ms)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.assertGreaterEqual(elapsed, ms)
+            self.assertGreaterEqual(late, 0)
+            self.assertLess(late, 0.015)
+        self.assertEqual(self.stats.get("pacing.waits"), 3)
+        self.assertEqual(
+            self.stats.get("pacing.on_time") + self.stats.get("pacing.late"), 3
+        )
+        # a deadline already passed returns at once
+        self.assertGreater(self.pacer.wait_until(time.perf_counter() - 1), 0.9)
+
+    def test_margin(self):
+        pacer = Pacer(min_spin=0.0001, max_spin=0.004, stats=self.stats)
+        for _ in range(5):
+            pacer.sleep(2)
+            self.assertGreaterEqual(pacer.margin, pacer.min_spin)
+            self.assertLessEqual(pacer.margin, pacer.max_spin)
+
+    def test_threads(self):
+        # the executor and the input thread share one pacer
+        pacer = Pacer(min_spin=0.0001, max_spin=0.004, stats=self.stats)
+        threads = [
+            threading.Thread(target=lambda: [pacer.sleep(1) for _ in range(20)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.stats.get("pacing.waits"), 80)
+        self.assertGreaterEqual(pacer.margin, pacer.min_spin)
+        self.assertLessEqual(pacer.margin, pacer.max_spin)
+
+    def test_schedule(self):
+        schedule = self.pacer.schedule()
+        for i in range(1, 21):
+            schedule.at(i * 2)
+            # work between the waits is absorbed by the next deadline
+            end = time.perf_counter() + 0.001
+            while time.perf_counter() < end:
+                pass
+        # relative sleeps would end at least 20 ms late
+        self.assertLess(schedule.elapsed() - 40, 15)
+        self.assertGreaterEqual(schedule.elapsed(), 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
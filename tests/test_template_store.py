@@ -0,0 +1,123 @@
+"""
+This file is mainly tests for the file `src/WorkflowEngine/Controller/TemplateController.py`.
+"""
+
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from src.WorkflowEngine.Controller import StatsManager, TemplateStore
+
+
+class TestTemplateStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.tmp.name, f"template-{i}.png")
+            cv2.imwrite(path, np.full((32, 32, 3), i * 40, dtype=np.uint8))
+            self.paths.append(path)
+        self.store = TemplateStore(budget=10**6, stats=StatsManager())
+
+    def test_hit_and_invalidate(self):
+        first = self.store.get(self.paths[0])
+        self.assertIsNotNone(first)
+        self.assertIs(first, self.store.get(self.paths[0]))
+
+        cv2.imwrite(self.paths[0], np.zeros((16, 16, 3), dtype=np.uint8))
+        os.utime(self.paths[0], ns=(0, 10**9))
+        second = self.store.get(self.paths[0])
+        self.assertIsNot(first, second)
+        assert second is not None
+        self.assertEqual(second.gray.shape, (16, 16))
+
+        stats = self.store.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertEqual(stats["invalidations"], 1)
+
+    def test_evict_by_budget(self):
+        self.store.set_budget(32 * 32 * 2)
+        for path in self.paths:
+            self.store.get(path)
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.stats()["evictions"], 1)
+
+        template = self.store.get(self.paths[2])
+        assert template is not None
+        pyramid = self.store.derive(template, "half", lambda t: t.gray[::2, ::2].copy())
+        self.assertEqual(pyramid.shape, (16, 16))
+        self.assertLessEqual(self.store.nbytes, self.store.budget)
+
+    def test_scaled_budget(self):
+        template = self.store.get(self.paths[0])
+        assert template is not None
+        scaled = self.store.scaled(template, 2.0)
+        self.assertEqual(self.store.nbytes, 32 * 32 + 64 * 64)
+
+        # forms derived from the scaled template are counted on its entry
+        self.store.derive(scaled, "half", lambda t: t.gray[::2, ::2].copy())
+        self.store.color(scaled, "bgr")
+        self.assertEqual(self.store.nbytes, 32 * 32 * 2 + 64 * 64 * 4)
+        self.assertEqual(self.store.nbytes, template.nbytes)
+
+        # and evicted with it
+        self.store.set_budget(0)
+        self.assertEqual((len(self.store), self.store.nbytes), (0, 0))
+
+    def test_mask(self):
+        icon = np.zeros((8, 8, 4), dtype=np.uint8)
+        icon[2:6, 2:6, 3] = 200
+        icon[0, 0, 3] = 100
+        path = os.path.join(self.tmp.name, "icon.png")
+        cv2.imwrite(path, icon)
+        template = self.store.get(path)
+        plain = self.store.get(self.paths[0])
+        assert template is not None and plain is not None
+
+        alpha = self.store.mask(template)
+        assert alpha is not None
+        self.assertEqual(sorted(np.unique(alpha)), [0, 255])
+        self.assertEqual(int(np.count_nonzero(alpha)), 16)
+        self.assertIs(alpha, self.store.mask(template))
+        self.assertIsNone(self.store.mask(plain))
+
+        # a mask file takes its own cache entry
+        mask_path = os.path.join(self.tmp.name, "mask.png")
+        cv2.imwrite(mask_path, np.full((8, 8), 255, dtype=np.uint8))
+        mask = self.store.mask(template, mask_path)
+        assert mask is not None
+        self.assertEqual(int(np.count_nonzero(mask)), 64)
+        self.assertIsNone(
+            self.store.mask(template, os.path.join(self.tmp.name, "no.png"))
+        )
+        self.assertEqual(len(self.store), 3)
+
+    def test_atlas(self):
+        paths = {str(i): path for i, path in enumerate(self.paths)}
+        atlas = self.store.atlas(paths)
+        assert atlas is not None
+        self.assertEqual(atlas.labels, ["0", "1", "2"])
+        self.assertEqual(atlas.kernels.shape, (3, 32 * 32))
+        self.assertIs(atlas, self.store.atlas(paths))
+
+        # rebuilt when a template changes
+        cv2.imwrite(self.paths[1], np.zeros((32, 32, 3), dtype=np.uint8))
+        os.utime(self.paths[1], ns=(0, 10**9))
+        self.assertIsNot(atlas, self.store.atlas(paths))
+        stats = self.store.stats()
+        self.assertEqual((stats["atlas_hits"], stats["atlas_builds"]), (1, 2))
+
+        cv2.imwrite(self.paths[2], np.zeros((16, 32, 3), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            self.store.atlas(paths)
+        paths["3"] = os.path.join(self.tmp.name, "none.png")
+        self.assertIsNone(self.store.atlas(paths))
+
+    def test_missing(self):
+        self.assertIsNone(self.store.get(os.path.join(self.tmp.name, "none.png")))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
@@ -0,0 +1,127 @@
+"""
+This file is mainly tests for the file `src/WorkflowEngine/Util/window_util.py`.
+"""
+
+import unittest
+
+from src.WorkflowEngine.Controller import StatsManager
+from src.WorkflowEngine.Exceptions.crash import MissingRequiredError
+from src.WorkflowEngine.Util.window_provider import FakeWindow, FakeWindowProvider
+from src.WorkflowEngine.Util.window_util import WindowBindings, WindowIndex, WindowUtil
+
+
+class TestWindowIndex(unittest.TestCase):
+    def setUp(self):
+        self.provider = FakeWindowProvider(
+            [
+                FakeWindow(1, "Notepad - a.txt", "Notepad", 10, "notepad.exe"),
+                FakeWindow(2, "Notepad - b.txt", "Notepad", 11, "notepad.exe"),
+                FakeWindow(3, "Game", "UnityWndClass", 20, "game.exe"),
+                FakeWindow(4, "Game Launcher", "Qt5QWindow", 20, "game.exe"),
+                FakeWindow(5, "Hidden Game", "Hidden", 20, "game.exe", visible=False),
+                FakeWindow(6, "", "Tray", 30, "tray.exe"),
+            ]
+        )
+        self.stats = StatsManager()
+        self.index = WindowIndex(self.provider, stats=self.stats)
+
+    def test_find(self):
+        self.assertEqual(self.index.find(title="Notepad"), [1, 2])
+        self.assertEqual(self.index.find(title="Game", exact=True), [3])
+        self.assertEqual(self.index.find(class_name="Qt5"), [4])
+        self.assertEqual(self.index.find(title="Game", process="game.exe"), [3, 4])
+        self.assertEqual(
+            self.index.find(title="Game", process="game.exe", visible_only=False),
+            [3, 4, 5],
+        )
+        # untitled windows are never matched
+        self.assertEqual(self.index.find(process="tray.exe"), [])
+
+    def test_lazy(self):
+        self.index.find(title="Game", exact=True)
+        # the title rules the others out before their class or process is read
+        self.assertEqual(self.provider.calls["class_name"], 0)
+        self.assertEqual(self.provider.calls["process_name"], 0)
+
+        self.index.find(title="Game", process="game")
+        self.index.find(title="Game", process="game")
+        self.index.find(process="notepad")
+        # one query per process (10, 11, 20), not per window or lookup
+        self.assertEqual(self.provider.calls["process_name"], 3)
+        self.assertEqual(self.provider.calls["pid"], 4)
+        self.assertEqual(self.stats.get("window.process.lookups"), 3)
+        self.assertEqual(self.stats.get("window.process.cached"), 5)
+
+        # clear() forgets the process names along with the windows
+        self.index.clear()
+        self.index.find(process="notepad")
+        self.assertEqual(self.provider.calls["process_name"], 6)
+
+    def test_revalidate(self):
+        self.assertEqual(self.index.find(class_name="Unity"), [3])
+        self.provider.windows[3].title = "Game - Loading"
+        self.provider.windows[3].class_name = "Changed"
+        # a new title drops what was cached for the handle
+        self.assertEqual(self.index.find(class_name="Unity"), [])
+        self.assertEqual(self.index.find(class_name="Changed"), [3])
+
+        self.index.find(process="notepad")
+        self.provider.remove(1)
+        self.provider.remove(2)
+        self.provider.add(FakeWindow(7, "Editor", "Edit", 10, "editor.exe"))
+        # the pid of a process without windows may be reused
+        self.assertEqual(self.index.find(process="editor"), [7])
+        self.assertEqual(self.index.find(process="notepad"), [])
+
+    def test_binding(self):
+        index = WindowUtil.index
+        bindings = WindowBindings(stats=self.stats)
+        try:
+            WindowUtil.use(self.provider)
+
+            def find(title="Game", **kwargs):
+                return WindowUtil.find_window(
+                    title=title, bind="job", bindings=bindings, exact=True, **kwargs
+                )
+
+            self.assertEqual(find(), [3])
+            self.provider.calls.clear()
+            self.assertEqual(find(), [3])
+            # verified without enumerating the windows
+            self.assertEqual(self.provider.calls["handles"], 0)
+            self.assertEqual(self.provider.calls["title"], 1)
+
+            # other criteria are bound separately
+            self.assertEqual(find("Game Launcher"), [4])
+
+            self.provider.windows[3].title = "Game - Paused"
+            self.assertEqual(find(), [])
+            self.provider.windows[3].title = "Game"
+            self.assertEqual(find(), [3])
+            self.provider.remove(3)
+            self.provider.add(FakeWindow(8, "Game", "UnityWndClass", 21, "game.exe"))
+            self.assertEqual(find(), [8])
+            self.assertEqual(find(), [8])
+
+            self.assertEqual(self.stats.get("window.binding.hits"), 2)
+            self.assertEqual(self.stats.get("window.binding.cold"), 3)
+            self.assertEqual(self.stats.get("window.binding.rebinds"), 2)
+        finally:
+            WindowUtil.index = index
+
+    def test_window_util(self):
+        index = WindowUtil.index
+        try:
+            WindowUtil.use(self.provider)
+            self.assertEqual(WindowUtil.find_window(title="Game Launcher"), [4])
+            WindowUtil.focus_window_by_handle(4)
+            self.assertEqual(WindowUtil.get_focused_window(), 4)
+            self.assertEqual(WindowUtil.get_window_rect(4), (0, 0, 800, 600))
+            with self.assertRaises(MissingRequiredError):
+                WindowUtil.find_window()
+        finally:
+            WindowUtil.index = index
+
+
+if __name__ == "__main__":
+    unittest.main()
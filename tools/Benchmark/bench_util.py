@@ -0,0 +1,29 @@
+import statistics
+import time
+from typing import Callable, List
+
+
+def measure(fnc: Callable[[], object], repeat: int, warmup: int = 1) -> List[float]:
+    """Run `fnc` `repeat` times and return each duration in milliseconds."""
+    for _ in range(warmup):
+        fnc()
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fnc()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summary(label: str, samples: List[float]) -> str:
+    return (
+        f"{label:<32} "
+        f"median {statistics.median(samples):9.3f} ms  "
+        f"mean {statistics.fmean(samples):9.3f} ms  "
+        f"min {min(samples):9.3f} ms  "
+        f"max {max(samples):9.3f} ms"
+    )
+
+
+def speedup(base: List[float], other: List[float]) -> float:
+    return statistics.median(base) / max(statistics.median(other), 1e-9)
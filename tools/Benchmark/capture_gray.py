@@ -0,0 +1,98 @@
+"""
+Capture conversion benchmark: allocations and time to turn one full-screen
+GDI bitmap (BGRX bytes, as returned by GetBitmapBits) into the grayscale
+frame ROI matching uses.
+
+  pil, bgr, gray   the original ROIExecutor path: PIL image (pyautogui),
+                   np.array, RGB->BGR, BGR->GRAY
+  pil, gray        PIL image, np.asarray, RGB->GRAY
+  buffer, gray     np.frombuffer view of the bytes, BGRA->GRAY (current)
+
+`peak` is the tracemalloc peak above the input buffer, which covers NumPy
+and OpenCV arrays and Python bytes. PIL keeps its pixels outside the
+Python allocator, so that memory is listed separately as `pil`.
+
+Usage: python tools/Benchmark/capture_gray.py [--width 3840] [--height 2160]
+       [--repeat 10]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+from typing import Callable, Dict, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.WorkflowEngine.Capture import synthetic_screen
+from tools.Benchmark.bench_util import measure, speedup, summary
+
+
+def pil_image(bits: bytes, size: Tuple[int, int]) -> Image.Image:
+    # what PIL.ImageGrab.grab (used by pyautogui.screenshot) builds
+    return Image.frombuffer("RGB", size, bits, "raw", "BGRX", 0, 1)
+
+
+def peak_bytes(fnc: Callable[[], object]) -> int:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    result = fnc()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak - base
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    size = (args.width, args.height)
+    bgra = cv2.cvtColor(
+        synthetic_screen(args.width, args.height, seed=5), cv2.COLOR_BGR2BGRA
+    )
+    bits: bytes = bgra.tobytes()
+
+    def pil_bgr_gray() -> np.ndarray:
+        rgb = np.array(pil_image(bits, size))
+        bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+
+    def pil_gray() -> np.ndarray:
+        return cv2.cvtColor(np.asarray(pil_image(bits, size)), cv2.COLOR_RGB2GRAY)
+
+    def buffer_gray() -> np.ndarray:
+        view = np.frombuffer(bits, dtype=np.uint8).reshape(args.height, args.width, 4)
+        return cv2.cvtColor(view, cv2.COLOR_BGRA2GRAY)
+
+    pipelines: Dict[str, Tuple[Callable[[], np.ndarray], int]] = {
+        "pil, bgr, gray": (pil_bgr_gray, args.width * args.height * 4),
+        "pil, gray": (pil_gray, args.width * args.height * 4),
+        "buffer, gray": (buffer_gray, 0),
+    }
+
+    expected = buffer_gray()
+    print(f"{args.width}x{args.height} frame, {len(bits) / 2**20:.1f} MiB input")
+    baseline = None
+    for name, (fnc, untraced) in pipelines.items():
+        assert np.array_equal(fnc(), expected), name
+        samples = measure(fnc, args.repeat)
+        baseline = baseline or samples
+        print(
+            summary(name, samples),
+            f" peak {peak_bytes(fnc) / 2**20:6.1f} MiB",
+            f" pil {untraced / 2**20:5.1f} MiB",
+            f" speedup {speedup(baseline, samples):.1f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
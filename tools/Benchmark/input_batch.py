@@ -0,0 +1,115 @@
+"""
+Input dispatch benchmark on the recording backend.
+
+`per-event` is the previous InputController path: one backend call per
+event, followed by a relative sleep for the gap to the next event, so
+the time spent in each call adds to every later deadline. `batched` is
+`InputBackend.dispatch`: events sharing a time stamp go out in one call
+and every batch waits for its absolute deadline. `--call-cost` simulates
+the time of one SendInput / PostMessage call (busy wait), so the numbers
+hold on any platform.
+
+`burst` sends untimed text and key chords (throughput); `timed` sends a
+dragged path with `--steps` moves (drift of the last event and jitter of
+every batch against its schedule).
+
+Usage: python tools/Benchmark/input_batch.py [--chars 200] [--steps 50]
+       [--interval 10] [--call-cost 30] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.Models.globals import InputConfig
+from src.WorkflowEngine.Controller import StatsManager
+from src.WorkflowEngine.Input import (
+    EventArray,
+    EventBuffer,
+    RecordingInputBackend,
+    batches,
+)
+from tools.Benchmark.bench_util import measure, speedup, summary
+
+
+class CostlyBackend(RecordingInputBackend):
+    """Recording backend whose every call takes `cost` seconds."""
+
+    def __init__(self, cost: float) -> None:
+        super().__init__(InputConfig(backend="recording"))
+        self.cost: float = cost
+
+    def send(self, batch: EventArray, hWnd: Optional[int] = None) -> None:
+        end = time.perf_counter() + self.cost
+        while time.perf_counter() < end:
+            pass
+        super().send(batch, hWnd)
+
+
+def per_event(backend: RecordingInputBackend, events: EventArray) -> None:
+    """One call per event, relative sleeps between them."""
+    for i in range(len(events)):
+        backend.send(events[i : i + 1])
+        if i + 1 < len(events):
+            gap = float(events["at"][i + 1] - events["at"][i])
+            if gap > 0:
+                time.sleep(gap / 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chars", type=int, default=200)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=10, help="ms per step")
+    parser.add_argument(
+        "--call-cost", type=float, default=30, help="microseconds per backend call"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    backend = CostlyBackend(args.call_cost / 1e6)
+    stats = StatsManager()
+
+    burst = EventBuffer().text("x" * args.chars)
+    for _ in range(args.chars // 4):
+        burst.keys_down([0x11, 0x10, 0x41]).keys_up([0x41, 0x10, 0x11])
+    events = burst.events()
+    serial = measure(lambda: per_event(backend, events), args.repeat)
+    batched = measure(lambda: backend.dispatch(events, stats=stats), args.repeat)
+    print(f"burst: {len(events)} events")
+    print(summary("  per-event", serial), f" calls {len(events)}")
+    print(
+        summary("  batched", batched),
+        f" calls {len(batches(events))}",
+        f" speedup {speedup(serial, batched):.1f}x",
+    )
+
+    duration = args.steps * args.interval
+    path = EventBuffer(args.interval).drag("LEFT", (0, 0), 800, 600, duration)
+    events = path.events()
+    print(f"timed: {len(events)} events over {duration:.0f} ms")
+    for name, run in (
+        ("per-event", lambda: per_event(backend, events)),
+        ("batched", lambda: backend.dispatch(events, stats=stats)),
+    ):
+        drift, jitter = [], []
+        for _ in range(args.repeat):
+            backend.clear()
+            run()
+            late = backend.lateness()
+            drift.append(float(late[-1]))
+            jitter.append(float(late.std()))
+        print(
+            f"  {name:<30} "
+            f"drift {statistics.median(drift):7.3f} ms  "
+            f"jitter {statistics.median(jitter):7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
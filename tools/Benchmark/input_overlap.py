@@ -0,0 +1,87 @@
+"""
+Click-then-detect cycle time, blocking vs detached input.
+
+Each cycle moves the mouse for `--move` ms (a timed drag sent through the
+recording backend) and matches a template on a full-screen synthetic
+frame. `blocking` is the previous order: the match starts once the move
+has finished. `detached` submits the move to `InputDispatcher` and
+matches while it is being sent, joining before the next cycle's input,
+as a job with `detach` followed by one that does not list it in `needs`.
+
+Usage: python tools/Benchmark/input_overlap.py [--move 20 50 100]
+       [--cycles 10] [--width 1920] [--height 1080]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.Models.globals import InputConfig
+from src.Models.main import Job
+from src.WorkflowEngine.Controller import StatsManager
+from src.WorkflowEngine.Input import (
+    EventBuffer,
+    InputDispatcher,
+    RecordingInputBackend,
+)
+from tools.Benchmark.bench_util import measure, speedup, summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--move", type=int, nargs="+", default=[20, 50, 100])
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    screen = rng.integers(0, 255, (args.height, args.width), dtype=np.uint8)
+    template = screen[500:540, 900:940].copy()
+    backend = RecordingInputBackend(InputConfig(backend="recording"))
+    dispatcher = InputDispatcher(stats=StatsManager())
+    job = Job(name="move", type="Input", description="move")
+
+    def detect() -> None:
+        scores = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+        cv2.minMaxLoc(scores)
+
+    start = time.perf_counter()
+    detect()
+    print(f"detect {(time.perf_counter() - start) * 1000:.1f} ms per frame")
+
+    for move in args.move:
+        events = EventBuffer().drag("LEFT", (0, 0), 900, 500, move).events()
+
+        def blocking() -> None:
+            for _ in range(args.cycles):
+                backend.dispatch(events, stats=StatsManager())
+                detect()
+
+        def detached() -> None:
+            for _ in range(args.cycles):
+                dispatcher.join()
+                dispatcher.submit(job, backend.dispatch, events, stats=StatsManager())
+                detect()
+            dispatcher.join()
+
+        serial = measure(blocking, args.repeat)
+        overlapped = measure(detached, args.repeat)
+        print(f"move {move} ms, {args.cycles} cycles")
+        print(summary("  blocking", serial))
+        print(
+            summary("  detached", overlapped),
+            f" speedup {speedup(serial, overlapped):.2f}x",
+        )
+    dispatcher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Glyph-template OCR benchmark on synthetic rendered text.
+
+A glyph set is trained from one rendered sample line, then random strings
+(digits, capitals, punctuation and spaces) are rendered with the same font
+and read back. Reported per string length: read latency, `exact` (whole
+string right) and `chars` (characters right, compared position by position
+when the lengths agree).
+
+`classify` compares scoring every segmented character against every glyph
+with one matchTemplate call per pair (loop) with the single matrix product
+OCR uses (batched).
+
+Usage: python tools/Benchmark/ocr_glyphs.py [--lengths 4 8 16] [--cases 50]
+       [--scale 0.6] [--spacing 1] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import List
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.WorkflowEngine.Controller import (
+    MatchController,
+    OCRController,
+    StatsManager,
+    TemplateStore,
+)
+from tools.Benchmark.bench_util import measure, speedup, summary
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ.,:-+%/"
+SAMPLE = "0123456789 ABCDEFGHIJKLM NOPQRSTUVWXYZ .,:-+%/ I1.1I,:"
+
+
+def render(
+    text: str, scale: float, spacing: int, rng: np.random.Generator
+) -> np.ndarray:
+    """`text` drawn character by character, `spacing` px apart, dark on a
+    light noisy background."""
+    (_, height), base = cv2.getTextSize("0", FONT, scale, 1)
+    advances = [cv2.getTextSize(c, FONT, scale, 1)[0][0] + spacing for c in text]
+    image = np.full((height + base + 12, sum(advances) + 12), 225, np.uint8)
+    x = 6
+    for char, advance in zip(text, advances):
+        if not char.isspace():
+            cv2.putText(image, char, (x, 6 + height), FONT, scale, 30, 1, cv2.LINE_AA)
+        x += advance
+    noise = rng.normal(0, 6, image.shape)
+    return np.clip(image + noise, 0, 255).astype(np.uint8)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--cases", type=int, default=50)
+    parser.add_argument("--scale", type=float, default=0.6)
+    parser.add_argument("--spacing", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    store = TemplateStore(stats=StatsManager())
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = render(SAMPLE, args.scale, args.spacing, rng)
+        glyphs = OCRController.build_glyphs([(sample, SAMPLE)], tmp)
+        atlas = glyphs.atlas(store=store)
+        print(
+            f"{len(glyphs.chars)} glyphs {glyphs.width}x{glyphs.height}, "
+            f"space threshold {glyphs.space:.2f}"
+        )
+
+        for length in args.lengths:
+            texts: List[str] = []
+            for _ in range(args.cases):
+                chars = list(rng.choice(list(ALPHABET), length))
+                # a space between two characters, now and then
+                if length > 2 and rng.random() < 0.5:
+                    chars[int(rng.integers(1, length - 1))] = " "
+                texts.append("".join(chars))
+            images = [render(t, args.scale, args.spacing, rng) for t in texts]
+
+            exact = right = total = 0
+            for text, image in zip(texts, images):
+                read = OCRController.read(image, glyphs, store=store).text
+                exact += read == text
+                total += len(text)
+                if len(read) == len(text):
+                    right += sum(a == b for a, b in zip(read, text))
+            samples = measure(
+                lambda: [
+                    OCRController.read(image, glyphs, store=store) for image in images
+                ],
+                args.repeat,
+            )
+            per_read = [s / len(images) for s in samples]
+            print(
+                summary(f"read {length:2} chars", per_read),
+                f" exact {exact / len(texts):.0%}",
+                f" chars {right / total:.1%}",
+            )
+
+        # classification of all characters of the longest strings
+        ink = [OCRController.binarize(image) for image in images]
+        patches = np.stack(
+            [
+                patch
+                for mask in ink
+                for patch in OCRController.patches(
+                    mask,
+                    OCRController.segment(mask),
+                    (glyphs.width, glyphs.height),
+                )
+            ]
+        )
+        templates = [store.get(os.path.join(tmp, name)) for name in atlas.labels]
+        kernels = [t.gray for t in templates if t is not None]
+
+        def loop() -> np.ndarray:
+            return np.array(
+                [
+                    int(
+                        np.argmax(
+                            [
+                                cv2.matchTemplate(p, k, cv2.TM_CCOEFF_NORMED)[0, 0]
+                                for k in kernels
+                            ]
+                        )
+                    )
+                    for p in patches
+                ]
+            )
+
+        serial = measure(loop, args.repeat)
+        batched = measure(lambda: MatchController.classify(patches, atlas), args.repeat)
+        same = float(np.mean(loop() == MatchController.classify(patches, atlas)[1]))
+        print(summary(f"classify {len(patches)} loop", serial))
+        print(
+            summary(f"classify {len(patches)} batched", batched),
+            f" speedup {speedup(serial, batched):.1f}x",
+            f" same {same:.1%}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Delay accuracy benchmark, `time.sleep` vs the sleep-then-spin `Pacer`.
+
+`single` waits each target once per sample and reports how late it
+returned (error against the target, in microseconds). `sequence` replays
+the previous `typewrite` pacing: `--steps` relative sleeps of
+`duration // steps` ms with `--work` microseconds of sending between
+them, against one `Schedule` of absolute deadlines; `drift` is how far
+the last step ends from `duration`. `cpu` is the process CPU time spent
+per wait, the price of spinning.
+
+Usage: python tools/Benchmark/pacing.py [--targets 0.5 1 2 5 10 16]
+       [--samples 50] [--steps 40] [--duration 500] [--work 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.WorkflowEngine.Controller import Pacer, StatsManager
+
+
+def busy(us: float) -> None:
+    end = time.perf_counter() + us / 1e6
+    while time.perf_counter() < end:
+        pass
+
+
+def errors(wait: Callable[[float], object], ms: float, samples: int) -> List[float]:
+    """Microseconds each `wait(ms)` returned after `ms`."""
+    late: List[float] = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        wait(ms)
+        late.append(((time.perf_counter() - start) * 1000 - ms) * 1000)
+    return late
+
+
+def report(label: str, late: List[float], cpu: float) -> str:
+    ordered = sorted(late)
+    return (
+        f"{label:<24} "
+        f"mean {statistics.fmean(late):8.1f} us  "
+        f"p50 {ordered[len(ordered) // 2]:8.1f} us  "
+        f"p99 {ordered[int(len(ordered) * 0.99)]:8.1f} us  "
+        f"max {ordered[-1]:8.1f} us  "
+        f"cpu {cpu:7.1f} us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--targets", type=float, nargs="+", default=[0.5, 1, 2, 5, 10, 16]
+    )
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=40)
+    parser.add_argument("--duration", type=int, default=500, help="ms")
+    parser.add_argument(
+        "--work", type=float, default=200, help="microseconds of work per step"
+    )
+    args = parser.parse_args()
+
+    pacer = Pacer(stats=StatsManager())
+    sleepers = {
+        "time.sleep": lambda ms: time.sleep(ms / 1000),
+        "pacer": pacer.sleep,
+    }
+    print("single")
+    for ms in args.targets:
+        for name, wait in sleepers.items():
+            cpu = time.process_time()
+            late = errors(wait, ms, args.samples)
+            cpu = (time.process_time() - cpu) / args.samples * 1e6
+            print(report(f"  {ms:g} ms {name}", late, cpu))
+        print(f"  {'':<22} margin {pacer.margin * 1e6:.0f} us")
+
+    print(f"sequence: {args.steps} steps over {args.duration} ms")
+    drifts: Dict[str, List[float]] = {"relative sleep": [], "schedule": []}
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            time.sleep(args.duration // args.steps / 1000)
+            busy(args.work)
+        drifts["relative sleep"].append((time.perf_counter() - start) * 1000)
+
+        schedule = pacer.schedule()
+        for i in range(1, args.steps + 1):
+            schedule.at(args.duration * i / args.steps)
+            busy(args.work)
+        drifts["schedule"].append(schedule.elapsed())
+    for name, ends in drifts.items():
+        drift = [end - args.duration for end in ends]
+        print(
+            f"  {name:<22} drift median {statistics.median(drift):8.3f} ms"
+            f"  max {max(drift, key=abs):8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
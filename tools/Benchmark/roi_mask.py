@@ -0,0 +1,133 @@
+"""
+Masked ROI matching benchmark: cost and accuracy of matching a round,
+partly transparent icon over varying backgrounds with and without its
+alpha mask.
+
+The icon's transparent corners are stored white in the template, as most
+exported icons are, while on screen they show whatever lies underneath.
+Accuracy is the fraction of cases where the planted icon is found within
+`--tolerance` pixels and scores at least `--confidence`.
+
+Usage: python tools/Benchmark/roi_mask.py [--width 1920] [--height 1080]
+       [--cases 5] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.WorkflowEngine.Capture import synthetic_screen
+from src.WorkflowEngine.Controller import (
+    MatchController,
+    MatchResult,
+    Template,
+    TemplateStore,
+)
+from tools.Benchmark.bench_util import measure, speedup, summary
+
+
+def round_icon(size: int, rng: np.random.Generator) -> np.ndarray:
+    """BGRA icon: a filled disc with a glyph, transparent outside the disc."""
+    icon = np.full((size, size, 4), 255, dtype=np.uint8)
+    icon[..., 3] = 0
+    center = (size // 2, size // 2)
+    color = tuple(int(c) for c in rng.integers(40, 200, 3)) + (255,)
+    cv2.circle(icon, center, size // 2 - 1, color, -1)
+    cv2.putText(
+        icon,
+        chr(int(rng.integers(65, 91))),
+        (size // 4, size * 3 // 4),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        size / 40,
+        (255, 255, 255, 255),
+        2,
+    )
+    return icon
+
+
+def planted_case(
+    screen: np.ndarray, icon: np.ndarray, rng: np.random.Generator
+) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """Composite `icon` onto the BGR `screen` at a random spot, return gray."""
+    size = icon.shape[0]
+    x = int(rng.integers(0, screen.shape[1] - size))
+    y = int(rng.integers(0, screen.shape[0] - size))
+    frame = screen.copy()
+    target = frame[y : y + size, x : x + size]
+    opaque = icon[..., 3:] >= 128
+    target[...] = np.where(opaque, icon[..., :3], target)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (x, y)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--icon", type=int, default=48)
+    parser.add_argument("--cases", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=int, default=1)
+    parser.add_argument("--confidence", type=float, default=0.9)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    store = TemplateStore()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases: List[Tuple[np.ndarray, Template, Tuple[int, int]]] = []
+        for i in range(args.cases):
+            screen = synthetic_screen(args.width, args.height, seed=i)
+            icon = round_icon(args.icon, rng)
+            frame, loc = planted_case(screen, icon, rng)
+            path = os.path.join(tmp, f"icon-{i}.png")
+            cv2.imwrite(path, icon)
+            template = store.get(path)
+            assert template is not None
+            cases.append((frame, template, loc))
+
+        print(
+            f"{args.cases} cases, {args.width}x{args.height} frame, "
+            f"{args.icon}x{args.icon} icon"
+        )
+        runs: Dict[
+            str,
+            Callable[[np.ndarray, Template, Optional[np.ndarray]], MatchResult],
+        ] = {
+            "exact": lambda frame, t, mask: MatchController.exact(frame, t.gray, mask),
+            "pyramid": lambda frame, t, mask: MatchController.pyramid(
+                frame, t, args.confidence, levels=1, store=store, mask=mask
+            ),
+        }
+        baseline: List[float] = []
+        for name, run in runs.items():
+            for masked in (False, True):
+                samples: List[float] = []
+                hits = 0
+                for frame, template, loc in cases:
+                    mask = store.mask(template) if masked else None
+                    samples += measure(lambda: run(frame, template, mask), args.repeat)
+                    found = run(frame, template, mask)
+                    hits += (
+                        found.score >= args.confidence
+                        and abs(found.x - loc[0]) <= args.tolerance
+                        and abs(found.y - loc[1]) <= args.tolerance
+                    )
+                if not baseline:
+                    baseline = samples
+                label = f"{name} {'masked' if masked else 'unmasked'}"
+                print(
+                    summary(label, samples),
+                    f" accuracy {hits / args.cases:.0%}",
+                    f" cost {1 / speedup(baseline, samples):.1f}x",
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+ROI matching benchmark: exhaustive full-resolution search against the
+coarse-to-fine pyramid strategy on synthetic UI screenshots.
+
+Accuracy is the fraction of cases where the strategy finds the planted
+template within `--tolerance` pixels.
+
+Usage: python tools/Benchmark/roi_pyramid.py [--width 3840] [--height 2160]
+       [--cases 10] [--repeat 5] [--levels 1 2 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.WorkflowEngine.Capture import synthetic_screen
+from src.WorkflowEngine.Controller import (
+    MatchController,
+    MatchResult,
+    Template,
+    TemplateStore,
+)
+from tools.Benchmark.bench_util import measure, speedup, summary
+
+
+def synthetic_button(size: Tuple[int, int], rng: np.random.Generator) -> np.ndarray:
+    """A bordered button with an icon and a random label."""
+    tw, th = size
+    button = np.full((th, tw), int(rng.integers(150, 230)), dtype=np.uint8)
+    cv2.rectangle(button, (0, 0), (tw - 1, th - 1), 30, 2)
+    cv2.circle(button, (th // 2, th // 2), th // 3, 60, -1)
+    label = "".join(chr(c) for c in rng.integers(65, 91, 5))
+    cv2.putText(
+        button, label, (th, th * 2 // 3), cv2.FONT_HERSHEY_SIMPLEX, th / 60, 20, 2
+    )
+    return button
+
+
+def planted_case(
+    screen: np.ndarray, size: Tuple[int, int], rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int]]:
+    """Plant a button in a noisy copy of the frame, return (frame, template, loc)."""
+    template = synthetic_button(size, rng)
+    th, tw = template.shape
+    x = int(rng.integers(0, screen.shape[1] - tw))
+    y = int(rng.integers(0, screen.shape[0] - th))
+    frame = screen.copy()
+    frame[y : y + th, x : x + tw] = template
+    noise = rng.normal(0, 3, screen.shape).astype(np.int16)
+    frame = np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    return frame, template, (x, y)
+
+
+def hit(found: MatchResult, loc: Tuple[int, int], tolerance: int) -> bool:
+    return abs(found.x - loc[0]) <= tolerance and abs(found.y - loc[1]) <= tolerance
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--template", type=int, nargs=2, default=(240, 96))
+    parser.add_argument("--cases", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--tolerance", type=int, default=1)
+    parser.add_argument("--confidence", type=float, default=0.9)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    screen = cv2.cvtColor(
+        synthetic_screen(args.width, args.height, seed=7), cv2.COLOR_BGR2GRAY
+    )
+    store = TemplateStore()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases: List[Tuple[np.ndarray, Template, Tuple[int, int]]] = []
+        for i in range(args.cases):
+            frame, button, loc = planted_case(screen, tuple(args.template), rng)
+            path = os.path.join(tmp, f"template-{i}.png")
+            cv2.imwrite(path, button)
+            stored = store.get(path)
+            assert stored is not None
+            cases.append((frame, stored, loc))
+
+        print(
+            f"{args.cases} cases, {args.width}x{args.height} frame, "
+            f"{args.template[0]}x{args.template[1]} template"
+        )
+        exact: List[float] = []
+        exact_hits = 0
+        for frame, template, loc in cases:
+            exact += measure(
+                lambda: MatchController.exact(frame, template.gray), args.repeat
+            )
+            exact_hits += hit(MatchController.exact(frame, template.gray), loc, 0)
+        print(summary("exact", exact), f" accuracy {exact_hits / args.cases:.0%}")
+
+        for levels in args.levels:
+            samples: List[float] = []
+            hits = 0
+            for frame, template, loc in cases:
+
+                def run() -> MatchResult:
+                    return MatchController.pyramid(
+                        frame, template, args.confidence, levels=levels, store=store
+                    )
+
+                samples += measure(run, args.repeat)
+                hits += hit(run(), loc, args.tolerance)
+            print(
+                summary(f"pyramid levels={levels}", samples),
+                f" accuracy {hits / args.cases:.0%}",
+                f" speedup {speedup(exact, samples):.1f}x",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Tiled ROI matching benchmark: the untiled exhaustive search against the
+same search cut into overlapping strips matched on the matching pool, for
+growing region sizes.
+
+`crossover` is the smallest region where some tile count is faster than
+the untiled search by at least `--margin`, only reported with several
+workers (a single worker only shows the strip overhead). `same` checks that
+the tiled map computed on the pool equals the one computed with a single
+worker, `peak` that the best match is where the untiled search puts it,
+and `diff` is the largest score difference from the untiled map. Strip
+boundaries change FFT sizes, so scores differ in the last digits (more in
+flat areas, where the normalisation is unstable).
+
+Usage: python tools/Benchmark/roi_tiles.py [--sizes 640x360 1920x1080 ...]
+       [--tiles 2 4 8] [--workers 0] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.WorkflowEngine.Capture import synthetic_screen, to_gray
+from src.WorkflowEngine.Controller import MatchController
+from tools.Benchmark.bench_util import measure, speedup, summary
+
+
+def size(text: str) -> Tuple[int, int]:
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=size,
+        nargs="+",
+        default=[(320, 180), (640, 360), (1280, 720), (1920, 1080), (3840, 2160)],
+    )
+    parser.add_argument("--template", type=int, nargs=2, default=(120, 48))
+    parser.add_argument("--tiles", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--margin", type=float, default=1.05)
+    args = parser.parse_args()
+
+    MatchController.set_workers(args.workers)
+    workers = args.workers or os.cpu_count() or 1
+    tw, th = args.template
+    print(f"{workers} workers, {tw}x{th} template")
+    if workers < 2:
+        print("single worker: tiles cannot run concurrently, only overhead is shown")
+
+    crossover: Optional[Tuple[int, int]] = None
+    for width, height in args.sizes:
+        image = to_gray(synthetic_screen(width, height, seed=3))
+        x, y = width // 3, height // 2
+        template = image[y : y + th, x : x + tw].copy()
+
+        serial: List[float] = measure(
+            lambda: MatchController.exact(image, template), args.repeat
+        )
+        print(summary(f"{width}x{height} untiled", serial))
+        expected = MatchController.exact(image, template)
+        untiled = MatchController.response(image, template)
+        for tiles in args.tiles:
+            samples = measure(
+                lambda: MatchController.exact(image, template, tiles=tiles), args.repeat
+            )
+            tiled = MatchController.response(image, template, tiles=tiles)
+            MatchController.set_workers(1)
+            same = np.array_equal(
+                tiled, MatchController.response(image, template, tiles=tiles)
+            )
+            MatchController.set_workers(args.workers)
+            peak = MatchController.exact(image, template, tiles=tiles)[1:]
+            diff = float(np.abs(tiled - untiled).max())
+            gain = speedup(serial, samples)
+            print(
+                summary(f"{width}x{height} tiles={tiles}", samples),
+                f" speedup {gain:.2f}x",
+                f" same {same}",
+                f" peak {peak == expected[1:]}",
+                f" diff {diff:.1e}",
+            )
+            if crossover is None and gain >= args.margin:
+                crossover = (width, height)
+
+    if workers < 2:
+        print("crossover: not measured with a single worker")
+        return
+    print(
+        "crossover: "
+        + (f"{crossover[0]}x{crossover[1]}" if crossover else "none in tested sizes")
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Template atlas benchmark: classifying every location of a region against a
+growing set of same-sized glyph templates, one matchTemplate per template
+(as a chain of ROI jobs does) against one batched atlas pass.
+
+`agree` is the fraction of confident locations (best score >= 0.5) where
+both pick the same template; `planted` checks that every planted glyph is
+found with its label by `find_labels`.
+
+Usage: python tools/Benchmark/template_atlas.py [--region 240x40 640x360]
+       [--counts 10 40 100] [--glyph 10 16] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.WorkflowEngine.Capture import synthetic_screen, to_gray
+from src.WorkflowEngine.Controller import MatchController, StatsManager, TemplateStore
+from tools.Benchmark.bench_util import measure, speedup, summary
+
+
+def size(text: str) -> Tuple[int, int]:
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def glyphs(count: int, width: int, height: int) -> List[np.ndarray]:
+    """`count` distinct glyph-like templates: two characters over a bar."""
+    alphabet = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    result: List[np.ndarray] = []
+    for i in range(count):
+        glyph = np.full((height, width), 30, np.uint8)
+        text = alphabet[i % len(alphabet)] + alphabet[i // len(alphabet)]
+        cv2.putText(glyph, text, (0, height - 3), cv2.FONT_HERSHEY_PLAIN, 0.6, 230, 1)
+        glyph[-1, : 1 + i % width] = 230
+        result.append(glyph)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--region", type=size, nargs="+", default=[(240, 40), (640, 360)]
+    )
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 40, 100])
+    parser.add_argument("--glyph", type=int, nargs=2, default=(10, 16))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    gw, gh = args.glyph
+    with tempfile.TemporaryDirectory() as tmp:
+        for width, height in args.region:
+            for count in args.counts:
+                store = TemplateStore(stats=StatsManager())
+                paths: Dict[str, str] = {}
+                for i, glyph in enumerate(glyphs(count, gw, gh)):
+                    paths[f"g{i}"] = os.path.join(tmp, f"g{i}.png")
+                    cv2.imwrite(paths[f"g{i}"], glyph)
+                atlas = store.atlas(paths)
+                assert atlas is not None
+                grays = [
+                    t.gray for t in map(store.get, paths.values()) if t is not None
+                ]
+
+                image = to_gray(synthetic_screen(width, height, seed=count))
+                planted: List[Tuple[str, int, int]] = []
+                for i in range(0, count, max(count // 5, 1)):
+                    x = (len(planted) * (gw + 4)) % (width - gw)
+                    image[2 : 2 + gh, x : x + gw] = grays[i]
+                    planted.append((atlas.labels[i], x, 2))
+
+                def loop() -> Tuple[np.ndarray, np.ndarray]:
+                    maps = np.stack(
+                        [
+                            cv2.matchTemplate(image, gray, cv2.TM_CCOEFF_NORMED)
+                            for gray in grays
+                        ]
+                    )
+                    return maps.max(axis=0), maps.argmax(axis=0)
+
+                serial = measure(loop, args.repeat)
+                batched = measure(
+                    lambda: MatchController.atlas_response(image, atlas), args.repeat
+                )
+                expected, labels = loop()
+                _, found = MatchController.atlas_response(image, atlas)
+                confident = np.isfinite(expected) & (expected >= 0.5)
+                agree = float((labels == found)[confident].mean())
+                hits = {
+                    (m.label, m.x, m.y)
+                    for m in MatchController.find_labels(image, atlas, 0.95)
+                }
+                label = f"{width}x{height} {count:3} templates"
+                print(summary(f"{label} loop", serial))
+                print(
+                    summary(f"{label} atlas", batched),
+                    f" speedup {speedup(serial, batched):.2f}x",
+                    f" agree {agree:.1%}",
+                    f" planted {set(planted) <= hits}",
+                )
+
+
+if __name__ == "__main__":
+    main()
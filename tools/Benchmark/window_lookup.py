@@ -0,0 +1,143 @@
+"""
+Window lookup benchmark on thousands of synthetic windows.
+
+`scan` is the previous `find_window`: every visible titled window has its
+class and process name read (one OpenProcess + GetModuleFileNameEx each)
+before any predicate is checked. `index` is `WindowIndex.find`, which
+checks the title first and caches class names, pids and process names.
+Windows come from `FakeWindowProvider`; `--process-cost` simulates the
+time of one process name query (the only costly call), so the numbers
+hold on any platform. `calls` is the number of provider queries per
+lookup. `bound` is `WindowUtil.find_window` with a job binding: after
+the first lookup only the bound handle is verified.
+
+Usage: python tools/Benchmark/window_lookup.py [--windows 100 1000 5000]
+       [--processes 40] [--process-cost 20] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional, TypedDict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.WorkflowEngine.Controller import StatsManager
+from src.WorkflowEngine.Util.window_provider import (
+    FakeWindow,
+    FakeWindowProvider,
+    WindowProvider,
+)
+from src.WorkflowEngine.Util.window_util import WindowBindings, WindowIndex, WindowUtil
+from tools.Benchmark.bench_util import measure, speedup, summary
+
+
+class Query(TypedDict, total=False):
+    title: str
+    process: str
+
+
+def scan(
+    provider: WindowProvider,
+    title: Optional[str] = None,
+    class_name: Optional[str] = None,
+    process: Optional[str] = None,
+) -> List[int]:
+    """The uncached lookup, every property read for every window."""
+    matched: List[int] = []
+    for hWnd in provider.handles():
+        if not provider.visible(hWnd):
+            continue
+        window_title = provider.title(hWnd)
+        if not window_title:
+            continue
+        window_class = provider.class_name(hWnd)
+        window_process = provider.process_name(provider.pid(hWnd))
+        if (
+            (not title or title in window_title)
+            and (not class_name or class_name in window_class)
+            and (not process or process in window_process)
+        ):
+            matched.append(hWnd)
+    return matched
+
+
+def desktop(count: int, processes: int, cost: float) -> FakeWindowProvider:
+    """`count` windows spread over `processes` processes, a fifth hidden and
+    a tenth untitled, plus the one window the queries look for."""
+    windows = [
+        FakeWindow(
+            hWnd=0x10000 + i * 4,
+            title="" if i % 10 == 9 else f"Window {i}",
+            class_name=f"Class{i % 25}",
+            pid=1000 + i % processes,
+            process=f"app{i % processes}.exe",
+            visible=i % 5 != 4,
+        )
+        for i in range(count - 1)
+    ]
+    windows.insert(
+        count // 2,
+        FakeWindow(0xFFFF0, "Game Client", "UnityWndClass", 999, "game.exe"),
+    )
+    return FakeWindowProvider(windows, process_cost=cost)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--windows", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--processes", type=int, default=40)
+    parser.add_argument(
+        "--process-cost",
+        type=float,
+        default=20,
+        help="microseconds per process name query",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    queries: Dict[str, Query] = {
+        "title": {"title": "Game Client"},
+        "title+process": {"title": "Game", "process": "game.exe"},
+        "process": {"process": "game.exe"},
+    }
+    for count in args.windows:
+        provider = desktop(count, args.processes, args.process_cost / 1e6)
+        index = WindowIndex(provider, stats=StatsManager())
+        WindowUtil.index = index
+        bindings = WindowBindings(stats=StatsManager())
+        print(f"{count} windows, {args.processes} processes")
+        for name, query in queries.items():
+            assert scan(provider, **query) == index.find(**query) == [0xFFFF0]
+
+            provider.calls.clear()
+            serial = measure(lambda: scan(provider, **query), args.repeat)
+            scan_calls = sum(provider.calls.values()) / (args.repeat + 1)
+            provider.calls.clear()
+            indexed = measure(lambda: index.find(**query), args.repeat)
+            index_calls = sum(provider.calls.values()) / (args.repeat + 1)
+
+            provider.calls.clear()
+            bound = measure(
+                lambda: WindowUtil.find_window(
+                    **query, bind="bench", bindings=bindings
+                ),
+                args.repeat,
+            )
+            bound_calls = sum(provider.calls.values()) / (args.repeat + 1)
+
+            print(summary(f"  {name} scan", serial), f" calls {scan_calls:.0f}")
+            print(
+                summary(f"  {name} index", indexed),
+                f" calls {index_calls:.0f}",
+                f" speedup {speedup(serial, indexed):.1f}x",
+            )
+            print(
+                summary(f"  {name} bound", bound),
+                f" calls {bound_calls:.0f}",
+                f" speedup {speedup(serial, bound):.1f}x",
+            )
+
+
+if __name__ == "__main__":
+    main()
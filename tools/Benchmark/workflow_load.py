@@ -0,0 +1,75 @@
+"""
+Startup benchmark: cold workflow load (json + pydantic validation + overload
+resolution + compile) against a warm load from the compiled workflow cache.
+
+Usage: python tools/Benchmark/workflow_load.py [--jobs 300] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.WorkflowEngine import WorkflowCache, WorkflowManager
+from tools.Benchmark.bench_util import measure, speedup, summary
+
+
+def synthetic_workflow(jobs: int, chain: int) -> Dict[str, Any]:
+    definitions: Dict[str, Any] = {}
+    for i in range(jobs):
+        name = f"Job-{i}"
+        nxt = f"Job-{i + 1}" if i + 1 < jobs else ""
+        if i % (chain + 1) == 0:
+            definitions[name] = {
+                "type": "ROI",
+                "roi": {
+                    "type": "DetectOnly",
+                    "image": {"path": f"images/button-{i}.png", "confidence": 0.9},
+                    "region": {"x": 0, "y": 0, "width": 800, "height": 600},
+                    "returns": {"x": "center_x", "y": "center_y"},
+                },
+                "limits": {"maxCount": 10},
+                "delay": {"pre": 10, "post": 10},
+            }
+        else:
+            # overload chain on top of the previous job
+            definitions[name] = {
+                "type": "Overload",
+                "overload": f"Job-{i - 1}",
+                "description": f"overload of Job-{i - 1}",
+                "delay": {"post": i % 50},
+            }
+        definitions[name]["next"] = {"success": nxt, "failure": name}
+    return {"begin": "Job-0", "jobs": definitions}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--chain", type=int, default=3, help="Overload chain depth")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "workflow.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(synthetic_workflow(args.jobs, args.chain), f)
+
+        cache = WorkflowCache(os.path.join(tmp, "cache"))
+        cache.store(path, WorkflowManager(path).compiled)
+
+        cold = measure(lambda: WorkflowManager(path).compiled, args.repeat)
+        warm = measure(lambda: WorkflowManager(path, cache=cache).compiled, args.repeat)
+
+    print(f"{args.jobs} jobs, overload chain depth {args.chain}")
+    print(summary("cold (json + validate)", cold))
+    print(summary("warm (compiled cache)", warm))
+    print(f"speedup: {speedup(cold, warm):.1f}x")
+
+
+if __name__ == "__main__":
+    main()